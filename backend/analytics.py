@@ -0,0 +1,249 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One rollup document per (country, day, restaurant, status). restaurant_id "*"
+# holds whole-order totals for the country/day, since one order can include
+# items from several restaurants.
+ALL_RESTAURANTS = "*"
+ROLLUP_COLLECTION = "sales_rollups"
+
+def _rollup_id(country: str, day: str, restaurant_id: str, status: str) -> str:
+    return f"{country}|{day}|{restaurant_id}|{status}"
+
+def _order_buckets(order: dict) -> Dict[str, float]:
+    """Revenue of `order` per rollup restaurant key ("*" = whole order)."""
+    buckets = {ALL_RESTAURANTS: order["total_amount"]}
+    for item in order["items"]:
+        restaurant_id = item.get("restaurant_id")
+        if restaurant_id:
+            buckets[restaurant_id] = buckets.get(restaurant_id, 0) + item["price"] * item["quantity"]
+    return buckets
+
+def _add_deltas(deltas: Dict[tuple, list], order: dict, status: str, sign: int):
+    """Accumulate the [orders, revenue] change of adding (sign=1) or removing (sign=-1) `order`."""
+    day = order["order_date"][:10]
+    for restaurant_id, revenue in _order_buckets(order).items():
+        delta = deltas.setdefault((order["country"], day, restaurant_id, status), [0, 0.0])
+        delta[0] += sign
+        delta[1] += sign * revenue
+
+def _rollup_ops(deltas: Dict[tuple, list]) -> List[UpdateOne]:
+    """One upserting $inc per touched rollup document."""
+    return [
+        UpdateOne(
+            {"_id": _rollup_id(country, day, restaurant_id, status)},
+            {
+                "$inc": {"orders": orders, "revenue": round(revenue, 2)},
+                "$setOnInsert": {
+                    "country": country,
+                    "day": day,
+                    "restaurant_id": restaurant_id,
+                    "status": status,
+                },
+            },
+            upsert=True
+        )
+        for (country, day, restaurant_id, status), (orders, revenue) in deltas.items()
+    ]
+
+async def record_order(db: AsyncIOMotorDatabase, order: dict):
+    """Count a newly created order in the rollups."""
+    await record_orders(db, [order])
+
+async def record_orders(db: AsyncIOMotorDatabase, orders: List[dict]):
+    """Count newly created orders in the rollups with one bulk write."""
+    deltas: Dict[tuple, list] = {}
+    for order in orders:
+        _add_deltas(deltas, order, order["status"], 1)
+    await db[ROLLUP_COLLECTION].bulk_write(_rollup_ops(deltas), ordered=False)
+
+async def record_status_change(db: AsyncIOMotorDatabase, order: dict, old_status: str, new_status: str):
+    """Move an order's contribution from `old_status` to `new_status`."""
+    deltas: Dict[tuple, list] = {}
+    _add_deltas(deltas, order, old_status, -1)
+    _add_deltas(deltas, order, new_status, 1)
+    await db[ROLLUP_COLLECTION].bulk_write(_rollup_ops(deltas), ordered=False)
+
+def _empty_bucket() -> dict:
+    return {"orders": 0, "revenue": 0.0, "status": {}}
+
+def _add(bucket: dict, doc: dict):
+    bucket["orders"] += doc["orders"]
+    bucket["revenue"] += doc["revenue"]
+    by_status = bucket["status"].setdefault(doc["status"], {"orders": 0, "revenue": 0.0})
+    by_status["orders"] += doc["orders"]
+    by_status["revenue"] += doc["revenue"]
+
+def _rounded(bucket: dict) -> dict:
+    bucket["revenue"] = round(bucket["revenue"], 2)
+    for by_status in bucket["status"].values():
+        by_status["revenue"] = round(by_status["revenue"], 2)
+    return bucket
+
+async def sales_summary(
+    db: AsyncIOMotorDatabase,
+    start_day: str,
+    end_day: str,
+    country: Optional[str] = None,
+    restaurant_names: Optional[Dict[str, dict]] = None
+) -> dict:
+    """Aggregate rollups for [start_day, end_day] per country, per day and per restaurant.
+
+    Cost depends on the number of days and restaurants in range, not on order volume.
+    """
+    query = {"day": {"$gte": start_day, "$lte": end_day}}
+    if country:
+        query["country"] = country
+
+    countries: Dict[str, dict] = {}
+    days: Dict[tuple, dict] = {}
+    restaurants: Dict[str, dict] = {}
+    async for doc in db[ROLLUP_COLLECTION].find(query, {"_id": 0}):
+        # Buckets emptied by status changes stay behind with zero counts
+        if not doc["orders"]:
+            continue
+        if doc["restaurant_id"] == ALL_RESTAURANTS:
+            _add(countries.setdefault(doc["country"], _empty_bucket()), doc)
+            _add(days.setdefault((doc["day"], doc["country"]), _empty_bucket()), doc)
+        else:
+            bucket = restaurants.setdefault(doc["restaurant_id"], {**_empty_bucket(), "country": doc["country"]})
+            _add(bucket, doc)
+
+    restaurant_names = restaurant_names or {}
+    return {
+        "start_day": start_day,
+        "end_day": end_day,
+        "countries": [
+            {"country": c, **_rounded(bucket)} for c, bucket in sorted(countries.items())
+        ],
+        "days": [
+            {"day": day, "country": c, **_rounded(bucket)} for (day, c), bucket in sorted(days.items())
+        ],
+        "restaurants": sorted(
+            (
+                {
+                    "restaurant_id": restaurant_id,
+                    "restaurant_name": restaurant_names.get(restaurant_id, {}).get("name"),
+                    **_rounded(bucket),
+                }
+                for restaurant_id, bucket in restaurants.items()
+            ),
+            key=lambda row: row["revenue"],
+            reverse=True
+        ),
+    }
+
+# Rebuild pipelines. Older orders may lack items.restaurant_id, so it is
+# looked up from menu_items when missing.
+_REBUILD_TARGET = f"{ROLLUP_COLLECTION}_rebuild"
+
+def _rollup_projection(restaurant_id) -> dict:
+    return {
+        "_id": {"$concat": [
+            "$_id.country", "|", "$_id.day", "|",
+            restaurant_id if isinstance(restaurant_id, str) else "$_id.restaurant_id",
+            "|", "$_id.status",
+        ]},
+        "country": "$_id.country",
+        "day": "$_id.day",
+        "restaurant_id": restaurant_id,
+        "status": "$_id.status",
+        "orders": 1,
+        "revenue": {"$round": ["$revenue", 2]},
+    }
+
+ORDER_LEVEL_PIPELINE = [
+    {"$group": {
+        "_id": {"country": "$country", "day": {"$substrBytes": ["$order_date", 0, 10]}, "status": "$status"},
+        "orders": {"$sum": 1},
+        "revenue": {"$sum": "$total_amount"},
+    }},
+    {"$project": _rollup_projection(ALL_RESTAURANTS)},
+    {"$out": _REBUILD_TARGET},
+]
+
+RESTAURANT_LEVEL_PIPELINE = [
+    {"$unwind": "$items"},
+    {"$lookup": {
+        "from": "menu_items",
+        "localField": "items.menu_item_id",
+        "foreignField": "id",
+        "as": "menu_item",
+    }},
+    {"$set": {"restaurant_id": {"$ifNull": ["$items.restaurant_id", {"$first": "$menu_item.restaurant_id"}]}}},
+    {"$match": {"restaurant_id": {"$ne": None}}},
+    # First per (order, restaurant) so an order counts once per restaurant
+    {"$group": {
+        "_id": {
+            "order": "$id",
+            "restaurant_id": "$restaurant_id",
+            "country": "$country",
+            "day": {"$substrBytes": ["$order_date", 0, 10]},
+            "status": "$status",
+        },
+        "revenue": {"$sum": {"$multiply": ["$items.price", "$items.quantity"]}},
+    }},
+    {"$group": {
+        "_id": {
+            "restaurant_id": "$_id.restaurant_id",
+            "country": "$_id.country",
+            "day": "$_id.day",
+            "status": "$_id.status",
+        },
+        "orders": {"$sum": 1},
+        "revenue": {"$sum": "$revenue"},
+    }},
+    {"$project": _rollup_projection("$_id.restaurant_id")},
+    {"$merge": {"into": _REBUILD_TARGET, "whenMatched": "replace"}},
+]
+
+async def rebuild_rollups(db: AsyncIOMotorDatabase) -> int:
+    """Recompute all rollups from `orders` and swap them in.
+
+    Increments applied by live requests while this runs are lost, so run it
+    during a quiet period (or re-run it).
+    """
+    await db[_REBUILD_TARGET].drop()
+    await db.orders.aggregate(ORDER_LEVEL_PIPELINE).to_list(None)
+    await db.orders.aggregate(RESTAURANT_LEVEL_PIPELINE, allowDiskUse=True).to_list(None)
+    count = await db[_REBUILD_TARGET].count_documents({})
+    if count:
+        await db[_REBUILD_TARGET].rename(ROLLUP_COLLECTION, dropTarget=True)
+    else:
+        await db[ROLLUP_COLLECTION].delete_many({})
+    logger.info(f"Rebuilt {count} sales rollup documents")
+    return count
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pathlib import Path
+    import asyncio
+    import os
+    import typer
+
+    load_dotenv(Path(__file__).parent / '.env')
+    cli = typer.Typer(help="Sales rollup maintenance.")
+
+    @cli.callback()
+    def main():
+        """Run from the backend directory: python analytics.py rebuild"""
+
+    @cli.command()
+    def rebuild():
+        """Recompute sales_rollups from the orders collection."""
+        async def run():
+            client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+            try:
+                count = await rebuild_rollups(client[os.environ['DB_NAME']])
+            finally:
+                client.close()
+            typer.echo(f"Rebuilt {count} rollup documents")
+
+        asyncio.run(run())
+
+    cli()
@@ -1,5 +1,7 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Optional
+import asyncio
 import jwt
 from passlib.context import CryptContext
 import os
@@ -11,6 +13,18 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+# Tickets for GET /api/orders/events, the only place a token may go in the URL
+STREAM_TICKET_EXPIRE_SECONDS = 60
+STREAM_TICKET_SCOPE = "order_events"
+
+# Password hashing pool settings
+PASSWORD_POOL_KIND = os.environ.get("PASSWORD_POOL_KIND", "thread")  # thread | process
+PASSWORD_POOL_SIZE = int(os.environ.get("PASSWORD_POOL_SIZE", os.cpu_count() or 1))
+PASSWORD_POOL_QUEUE_SIZE = int(os.environ.get("PASSWORD_POOL_QUEUE_SIZE", PASSWORD_POOL_SIZE * 4))
+PASSWORD_POOL_RETRY_AFTER = 1  # seconds
+
+class PasswordPoolBusy(Exception):
+    """Raised when every hashing worker is busy and the wait queue is full."""
 
 def hash_password(password: str) -> str:
     """Hash a password for storing."""
@@ -36,8 +50,105 @@ def decode_access_token(token: str) -> Optional[dict]:
     """Decode JWT access token."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    # Scoped tokens (stream tickets) are not access tokens
+    if "scope" in payload:
+        return None
+    return payload
+
+def create_stream_ticket(user: dict) -> str:
+    """Short-lived token that only authenticates the order event stream."""
+    claims = {key: user[key] for key in ("user_id", "username", "role", "country")}
+    claims["scope"] = STREAM_TICKET_SCOPE
+    return create_access_token(claims, timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS))
+
+def decode_stream_ticket(token: str) -> Optional[dict]:
+    """Decode a stream ticket; None for anything else, access tokens included."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
+        return None
+    if payload.get("scope") != STREAM_TICKET_SCOPE:
+        return None
+    return payload
+
+class PasswordHashPool:
+    """Bounded worker pool that keeps bcrypt off the event loop.
+
+    At most `size` hashes run at once and at most `queue_size` more wait for a
+    worker; anything beyond that is rejected with PasswordPoolBusy.
+    """
+
+    def __init__(self, size: int, queue_size: int, kind: str = "thread"):
+        self.size = size
+        self.queue_size = queue_size
+        self.kind = kind
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.size)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, fn: Callable, *args):
+        if self.in_flight >= self.size + self.queue_size:
+            self.rejected += 1
+            raise PasswordPoolBusy("Password hashing pool is saturated")
+
+        loop = asyncio.get_running_loop()
+        job = self._get_executor().submit(fn, *args)
+        self.in_flight += 1
+        # The slot is held until the job itself finishes: a cancelled caller
+        # (client disconnect) stops waiting, but bcrypt keeps running
+        job.add_done_callback(lambda job: self._release_threadsafe(loop, job))
+        return await asyncio.wrap_future(job)
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop, job: Future):
+        try:
+            loop.call_soon_threadsafe(self._release, job)
+        except RuntimeError:
+            pass  # Loop already closed during shutdown
+
+    def _release(self, job: Future):
+        self.in_flight -= 1
+        if job.cancelled() or job.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "pool_size": self.size,
+            "queue_limit": self.queue_size,
+            "active": min(self.in_flight, self.size),
+            "queue_depth": max(self.in_flight - self.size, 0),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_pool = PasswordHashPool(PASSWORD_POOL_SIZE, PASSWORD_POOL_QUEUE_SIZE, PASSWORD_POOL_KIND)
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the worker pool."""
+    return await password_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the worker pool."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
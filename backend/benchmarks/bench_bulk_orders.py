@@ -0,0 +1,75 @@
+"""Compare order throughput of looping POST /api/orders against POST /api/orders/bulk.
+
+Run from the backend directory:
+    python -m benchmarks.bench_bulk_orders
+    python -m benchmarks.bench_bulk_orders --backend mongod --batch 500
+"""
+from typing import Optional
+import asyncio
+import httpx
+import time
+import typer
+
+from benchmarks.load import running_app
+
+DATASET = {"restaurants_per_country": 20, "items_per_restaurant": 20, "users_per_country": 20, "orders": 0}
+
+def commands(counter) -> int:
+    return sum(sum(c.values()) for c in counter.by_endpoint.values())
+
+async def order_payloads(client: httpx.AsyncClient, headers: dict, count: int, lines: int) -> list:
+    restaurants = [r for r in (await client.get("/api/restaurants", headers=headers)).json() if r["country"] == "INDIA"]
+    menu = [
+        item for item in (await client.get(f"/api/restaurants/{restaurants[0]['id']}/menu", headers=headers)).json()
+        if item["is_available"]
+    ]
+    return [
+        {"items": [
+            {"menu_item_id": item["id"], "quantity": 1, "price": item["price"]}
+            for item in (menu[(i + j) % len(menu)] for j in range(lines))
+        ]}
+        for i in range(count)
+    ]
+
+async def run(backend: str, mongod_bin: Optional[str], batch: int, lines: int) -> dict:
+    async with running_app(backend, mongod_bin, DATASET, seed=42) as (app, counter, accounts):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            login = await client.post("/api/auth/login", json={"username": "thanos", "password": "member123"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            payloads = await order_payloads(client, headers, batch, lines)
+
+            counter.reset()
+            start = time.perf_counter()
+            for payload in payloads:
+                (await client.post("/api/orders", json=payload, headers=headers)).raise_for_status()
+            single = time.perf_counter() - start
+            single_commands = commands(counter)
+
+            counter.reset()
+            start = time.perf_counter()
+            response = await client.post("/api/orders/bulk", json=payloads, headers=headers)
+            response.raise_for_status()
+            bulk = time.perf_counter() - start
+            bulk_commands = commands(counter)
+            assert response.json()["created"] == batch
+
+    return {
+        "single": (batch / single, single_commands),
+        "bulk": (batch / bulk, bulk_commands),
+    }
+
+def main(
+    batch: int = typer.Option(200, help="Orders per run"),
+    lines: int = typer.Option(3, help="Line items per order"),
+    backend: str = typer.Option("mongomock", help="mongomock (in-memory) or mongod (temporary server)"),
+    mongod_bin: Optional[str] = typer.Option(None, help="mongod binary (defaults to PATH lookup)"),
+):
+    results = asyncio.run(run(backend, mongod_bin, batch, lines))
+    print(f"{'path':>8} {'orders/s':>10} {'mongo cmds':>11}")
+    for path, (throughput, commands) in results.items():
+        print(f"{path:>8} {throughput:>10.1f} {commands:>11}")
+    print(f"speedup {results['bulk'][0] / results['single'][0]:.1f}x")
+
+if __name__ == "__main__":
+    typer.run(main)
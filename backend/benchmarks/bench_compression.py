@@ -0,0 +1,69 @@
+"""Payload size and latency of catalog responses per Accept-Encoding.
+
+Latency includes httpx decoding the body on the client side. Also times
+compressing the same body on every request, which is what the catalog
+routes would pay without the per-ETag precompressed bodies.
+
+Run from the backend directory:
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --restaurants 200 --items 50
+"""
+from typing import Optional
+import asyncio
+import httpx
+import time
+import typer
+
+from benchmarks.load import percentile, running_app
+from compression import SUPPORTED_ENCODINGS, compress
+
+async def measure(client: httpx.AsyncClient, url: str, headers: dict, repeat: int) -> tuple:
+    """(wire bytes, p50 ms) for `repeat` sequential GETs."""
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+        size = int(response.headers["content-length"])
+    samples.sort()
+    return size, percentile(samples, 50) * 1000
+
+def compress_cost(body: bytes, encoding: str, repeat: int) -> float:
+    """Mean ms to compress `body` once."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compress(body, encoding)
+    return (time.perf_counter() - start) / repeat * 1000
+
+async def run(backend: str, mongod_bin: Optional[str], restaurants: int, items: int, repeat: int) -> list:
+    dataset = {"restaurants_per_country": restaurants, "items_per_restaurant": items, "users_per_country": 0, "orders": 0}
+    async with running_app(backend, mongod_bin, dataset, seed=42) as (app, counter, accounts):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            login = await client.post("/api/auth/login", json={"username": "nickfury", "password": "admin123"})
+            auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            url = "/api/restaurants?limit=1000"
+            body = (await client.get(url, headers={**auth, "Accept-Encoding": "identity"})).content
+            rows = []
+            for encoding in ("identity",) + SUPPORTED_ENCODINGS:
+                size, p50 = await measure(client, url, {**auth, "Accept-Encoding": encoding}, repeat)
+                per_request = compress_cost(body, encoding, repeat) if encoding != "identity" else 0.0
+                rows.append((encoding, size, p50, per_request))
+            return rows
+
+def main(
+    restaurants: int = typer.Option(100, help="Synthetic restaurants per country"),
+    items: int = typer.Option(20, help="Menu items per restaurant"),
+    repeat: int = typer.Option(50, help="Requests per encoding"),
+    backend: str = typer.Option("mongomock", help="mongomock (in-memory) or mongod (temporary server)"),
+    mongod_bin: Optional[str] = typer.Option(None, help="mongod binary (defaults to PATH lookup)"),
+):
+    rows = asyncio.run(run(backend, mongod_bin, restaurants, items, repeat))
+    print(f"{'encoding':>9} {'bytes':>9} {'p50 ms':>8} {'compress ms/request':>20}")
+    for encoding, size, p50, per_request in rows:
+        print(f"{encoding:>9} {size:>9} {p50:>8.3f} {per_request:>20.3f}")
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,153 @@
+"""Peak memory of GET /api/orders/export over a large order history.
+
+Fills a database with --orders synthetic orders, then streams the whole
+export as an admin and checks how far the process's peak RSS
+(resource.getrusage ru_maxrss) grew while doing so. A streaming export
+holds one cursor batch at a time, so the growth should stay flat however
+many orders there are; the run fails when it exceeds --max-rss-growth-mb.
+
+The ASGI app is called directly with a byte-counting `send`, because
+httpx's ASGITransport buffers whole response bodies.
+
+With --backend mongod (the default) the dataset is generated by a
+`datagen.py` subprocess, so this process never holds it. mongomock keeps
+the data in this process and sorts every result in memory, so its numbers
+measure mongomock rather than the endpoint; use it with small --orders only.
+
+Run from the backend directory:
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --orders 100000 --format csv
+    python -m benchmarks.bench_export --backend mongomock --orders 20000
+"""
+from pathlib import Path
+from typing import Optional
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+import typer
+
+from benchmarks.mongo import mongo_backend
+
+DATAGEN = Path(__file__).resolve().parent.parent / "datagen.py"
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def seed_orders(client, backend: str, orders: int):
+    """Fill DB_NAME with the demo data and `orders` synthetic orders."""
+    if backend == "mongod":
+        host, port = client.address
+        env = {**os.environ, "MONGO_URL": f"mongodb://{host}:{port}"}
+        await asyncio.to_thread(subprocess.run, [
+            sys.executable, str(DATAGEN), "--orders", str(orders), "--restaurants-per-country", "50",
+            "--users-per-country", "500", "--no-rollups",
+        ], env=env, check=True, stdout=subprocess.DEVNULL)
+        return
+
+    from catalog import bump_catalog_version
+    from database import seed_database
+    from datagen import generate_dataset
+    db = client[os.environ["DB_NAME"]]
+    await seed_database(db)
+    await generate_dataset(db, 50, 20, 500, orders, seed=42, password="synthetic123")
+    await bump_catalog_version(db)
+
+async def stream_export(app, token: str, format: str) -> tuple:
+    """(bytes, lines) of one export, discarding the body as it arrives."""
+    received = {"bytes": 0, "lines": 0, "status": None}
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "server": ("bench", 80), "client": ("127.0.0.1", 1), "root_path": "",
+        "path": "/api/orders/export", "raw_path": b"/api/orders/export",
+        "query_string": f"format={format}".encode(),
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+    }
+    request_sent = False
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            received["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            received["bytes"] += len(body)
+            received["lines"] += body.count(b"\n")
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    if received["status"] != 200:
+        raise RuntimeError(f"export returned {received['status']}")
+    return received["bytes"], received["lines"]
+
+async def run(backend: str, mongod_bin: Optional[str], orders: int, format: str) -> dict:
+    os.environ.setdefault("MONGO_URL", "mongodb://127.0.0.1:1")
+    os.environ.setdefault("DB_NAME", "bench")
+    os.environ.setdefault("CATALOG_WATCH", "off")
+    os.environ.setdefault("STARTUP_SEED", "blocking")
+    if backend == "mongomock":
+        # mongomock implements neither explain nor change streams
+        os.environ["INDEX_SELF_CHECK"] = "off"
+    import httpx
+    import server
+
+    async with mongo_backend(backend, mongod_bin) as client:
+        start = time.perf_counter()
+        await seed_orders(client, backend, orders)
+        seeded_in = time.perf_counter() - start
+
+        server.client = client
+        server.db = client[os.environ["DB_NAME"]]
+        await server.app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+                login = await http.post("/api/auth/login", json={"username": "nickfury", "password": "admin123"})
+            token = login.json()["access_token"]
+
+            before = peak_rss_mb()
+            start = time.perf_counter()
+            size, lines = await stream_export(server.app, token, format)
+            elapsed = time.perf_counter() - start
+            after = peak_rss_mb()
+        finally:
+            await server.app.router.shutdown()
+
+    return {
+        "seeded_in": seeded_in, "bytes": size, "lines": lines, "seconds": elapsed,
+        "rss_before_mb": before, "rss_after_mb": after,
+    }
+
+def main(
+    orders: int = typer.Option(1_000_000, help="Synthetic orders to export"),
+    format: str = typer.Option("ndjson", help="ndjson or csv"),
+    max_rss_growth_mb: float = typer.Option(64.0, help="Fail when peak RSS grows more than this during the export"),
+    backend: str = typer.Option("mongod", help="mongod (temporary server) or mongomock (in-memory)"),
+    mongod_bin: Optional[str] = typer.Option(None, help="mongod binary (defaults to PATH lookup)"),
+):
+    result = asyncio.run(run(backend, mongod_bin, orders, format))
+    growth = result["rss_after_mb"] - result["rss_before_mb"]
+    print(f"seeded {orders} orders in {result['seeded_in']:.1f}s")
+    print(
+        f"exported {result['lines']} {format} lines, {result['bytes'] / 2**20:.1f} MiB in {result['seconds']:.1f}s "
+        f"({result['bytes'] / 2**20 / result['seconds']:.1f} MiB/s)"
+    )
+    print(f"peak RSS {result['rss_before_mb']:.0f} MiB -> {result['rss_after_mb']:.0f} MiB (+{growth:.1f} MiB)")
+    if growth > max_rss_growth_mb:
+        print(f"FAIL: peak RSS grew by more than {max_rss_growth_mb:.0f} MiB")
+        raise typer.Exit(1)
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,129 @@
+"""Compare POST /api/orders with and without the group-commit insert batcher.
+
+Runs the same number of orders at several concurrency levels, once with a
+plain insert_one per order and once with WRITE_BATCH_* batching, and
+reports throughput, latency and how many insert commands reached Mongo.
+
+mongomock answers instantly, so --insert-cost-ms charges every insert
+command a simulated fixed cost, serialized as on a busy primary; use
+--backend mongod --insert-cost-ms 0 for real numbers.
+
+Run from the backend directory:
+    python -m benchmarks.bench_group_commit
+    python -m benchmarks.bench_group_commit --backend mongod --levels 1,16,64,256 --max-delay-ms 2
+"""
+from typing import List, Optional
+import asyncio
+import httpx
+import time
+import typer
+
+from benchmarks.bench_bulk_orders import DATASET, order_payloads
+from benchmarks.load import percentile, running_app
+from write_batcher import order_inserts
+
+INSERT_COMMANDS = ("orders.insert_one", "orders.insert_many")
+
+class SlowInsertCollection:
+    """Collection proxy charging `cost` seconds per insert command, one command at a time.
+
+    Models a busy primary where each write command pays a fixed overhead
+    (round trip, parsing, journal commit) regardless of how many documents
+    it carries.
+    """
+
+    def __init__(self, collection, cost: float):
+        self._collection = collection
+        self._cost = cost
+        self._server = asyncio.Lock()
+
+    def __getattr__(self, name: str):
+        return getattr(self._collection, name)
+
+    async def insert_one(self, *args, **kwargs):
+        async with self._server:
+            await asyncio.sleep(self._cost)
+        return await self._collection.insert_one(*args, **kwargs)
+
+    async def insert_many(self, *args, **kwargs):
+        async with self._server:
+            await asyncio.sleep(self._cost)
+        return await self._collection.insert_many(*args, **kwargs)
+
+class SlowInserts:
+    """Database proxy whose orders collection is a SlowInsertCollection."""
+
+    def __init__(self, db, cost: float):
+        self._db = db
+        self.orders = SlowInsertCollection(db.orders, cost)
+
+    def __getattr__(self, name: str):
+        return getattr(self._db, name)
+
+    def __getitem__(self, name: str):
+        return self._db[name]
+
+def insert_commands(counter) -> int:
+    return sum(c[name] for c in counter.by_endpoint.values() for name in INSERT_COMMANDS)
+
+async def fire(client: httpx.AsyncClient, headers: dict, payloads: list, concurrency: int) -> tuple:
+    """(orders/s, p50 ms, p99 ms) for `payloads` posted by `concurrency` workers."""
+    queue = list(reversed(payloads))
+    samples = []
+
+    async def worker():
+        while queue:
+            payload = queue.pop()
+            start = time.perf_counter()
+            (await client.post("/api/orders", json=payload, headers=headers)).raise_for_status()
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return len(payloads) / elapsed, percentile(samples, 50) * 1000, percentile(samples, 99) * 1000
+
+async def run(backend: str, mongod_bin: Optional[str], levels: List[int], orders: int,
+              max_docs: int, max_delay_ms: float, insert_cost_ms: float) -> list:
+    order_inserts.max_docs = max_docs
+    order_inserts.max_delay = max_delay_ms / 1000
+    rows = []
+    async with running_app(backend, mongod_bin, DATASET, seed=42) as (app, counter, accounts):
+        import server
+        if insert_cost_ms:
+            server.db = SlowInserts(server.db, insert_cost_ms / 1000)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            login = await client.post("/api/auth/login", json={"username": "thanos", "password": "member123"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            payloads = await order_payloads(client, headers, orders, 3)
+            for concurrency in levels:
+                for enabled in (False, True):
+                    order_inserts.enabled = enabled
+                    counter.reset()
+                    throughput, p50, p99 = await fire(client, headers, payloads, concurrency)
+                    rows.append((concurrency, "batched" if enabled else "single", throughput, p50, p99,
+                                 insert_commands(counter)))
+            order_inserts.enabled = False
+    return rows
+
+def main(
+    levels: str = typer.Option("1,8,32,128", help="Comma-separated concurrency levels"),
+    orders: int = typer.Option(400, help="Orders per run"),
+    max_docs: int = typer.Option(100, help="WRITE_BATCH_MAX_DOCS"),
+    max_delay_ms: float = typer.Option(2.0, help="WRITE_BATCH_MAX_DELAY_MS"),
+    insert_cost_ms: float = typer.Option(2.0, help="Simulated fixed cost per insert command"),
+    backend: str = typer.Option("mongomock", help="mongomock (in-memory) or mongod (temporary server)"),
+    mongod_bin: Optional[str] = typer.Option(None, help="mongod binary (defaults to PATH lookup)"),
+):
+    rows = asyncio.run(run(
+        backend, mongod_bin, [int(level) for level in levels.split(",")], orders, max_docs, max_delay_ms,
+        insert_cost_ms
+    ))
+    print(f"{'conc':>5} {'path':>8} {'orders/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'inserts':>8}")
+    for concurrency, path, throughput, p50, p99, inserts in rows:
+        print(f"{concurrency:>5} {path:>8} {throughput:>9.1f} {p50:>8.2f} {p99:>8.2f} {inserts:>8}")
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,62 @@
+"""Compare payload size and latency of GET /api/orders and GET /api/orders/summary.
+
+Run from the backend directory:
+    python -m benchmarks.bench_order_summary
+    python -m benchmarks.bench_order_summary --backend mongod --lines 10
+"""
+from typing import Optional
+import asyncio
+import httpx
+import time
+import typer
+
+from benchmarks.load import percentile, running_app
+from datagen import generate_dataset
+
+async def measure(client: httpx.AsyncClient, url: str, headers: dict, repeat: int) -> tuple:
+    """(response bytes, p50 ms, p95 ms) for `repeat` sequential GETs."""
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+        size = len(response.content)
+    samples.sort()
+    return size, percentile(samples, 50) * 1000, percentile(samples, 95) * 1000
+
+async def run(backend: str, mongod_bin: Optional[str], orders: int, lines: int, limit: int, repeat: int) -> dict:
+    # running_app's own dataset stays empty; orders with `lines` items each are generated below
+    dataset = {"restaurants_per_country": 0, "items_per_restaurant": 0, "users_per_country": 0, "orders": 0}
+    async with running_app(backend, mongod_bin, dataset, seed=42) as (app, counter, accounts):
+        import server
+        await generate_dataset(
+            server.db, 5, 20, 10, orders, seed=42, password="bench123", lines_per_order=lines, prefix="summary"
+        )
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            login = await client.post("/api/auth/login", json={"username": "nickfury", "password": "admin123"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            return {
+                "full": await measure(client, f"/api/orders?limit={limit}", headers, repeat),
+                "summary": await measure(client, f"/api/orders/summary?limit={limit}", headers, repeat),
+            }
+
+def main(
+    orders: int = typer.Option(2000, help="Orders in the collection"),
+    lines: int = typer.Option(5, help="Line items per order"),
+    limit: int = typer.Option(100, help="Page size requested"),
+    repeat: int = typer.Option(50, help="Requests per endpoint"),
+    backend: str = typer.Option("mongomock", help="mongomock (in-memory) or mongod (temporary server)"),
+    mongod_bin: Optional[str] = typer.Option(None, help="mongod binary (defaults to PATH lookup)"),
+):
+    results = asyncio.run(run(backend, mongod_bin, orders, lines, limit, repeat))
+    print(f"{'endpoint':>8} {'bytes':>10} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, (size, p50, p95) in results.items():
+        print(f"{name:>8} {size:>10} {p50:>9.3f} {p95:>9.3f}")
+    full, summary = results["full"], results["summary"]
+    print(f"payload -{(1 - summary[0] / full[0]) * 100:.0f}%, p50 latency -{(1 - summary[1] / full[1]) * 100:.0f}%")
+
+if __name__ == "__main__":
+    typer.run(main)
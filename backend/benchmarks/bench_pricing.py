@@ -0,0 +1,69 @@
+"""Cost of server-side pricing for large orders.
+
+Times PriceTable.price_lines on N-line orders through its scalar loop and
+its vectorized path, next to the old loop that trusted client prices, and
+how long rebuilding the table takes for the whole catalog.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pricing
+    python -m benchmarks.bench_pricing --lines 2000 --restaurants 500
+"""
+import time
+import typer
+
+import pricing
+from benchmarks.load import percentile
+from catalog import CatalogSnapshot
+from datagen import generate_catalog
+from models import OrderItemCreate
+
+def timed(fn, repeat: int) -> tuple:
+    """(p50 ms, p99 ms) of `repeat` calls."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return percentile(samples, 50) * 1000, percentile(samples, 99) * 1000
+
+def main(
+    lines: int = typer.Option(500, help="Lines per order"),
+    restaurants: int = typer.Option(100, help="Restaurants per country"),
+    items: int = typer.Option(500, help="Menu items per restaurant"),
+    repeat: int = typer.Option(500, help="Orders priced per path"),
+):
+    restaurant_docs, item_docs = generate_catalog(42, restaurants, items, prefix="pricing")
+    snapshot = CatalogSnapshot(restaurant_docs, item_docs, 1)
+    table = pricing.PriceTable()
+    start = time.perf_counter()
+    table.update(snapshot)
+    print(f"price table for {len(item_docs)} menu items built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    menu = snapshot.menus[restaurant_docs[0]["id"]]
+    order_lines = [
+        OrderItemCreate(menu_item_id=menu[i % len(menu)]["id"], quantity=1 + i % 3, price=1.0)
+        for i in range(lines)
+    ]
+    menu_items = {line.menu_item_id: snapshot.menu_items[line.menu_item_id] for line in order_lines}
+
+    def client_prices():
+        return sum(line.price * line.quantity for line in order_lines)
+
+    def scalar():
+        pricing.PRICING_VECTOR_MIN_LINES = lines + 1
+        return table.price_lines(order_lines, menu_items)
+
+    def vectorized():
+        pricing.PRICING_VECTOR_MIN_LINES = 0
+        return table.price_lines(order_lines, menu_items)
+
+    assert scalar()[1] == vectorized()[1]
+    print(f"{lines}-line orders, {repeat} each")
+    print(f"{'path':>14} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, fn in (("client prices", client_prices), ("scalar", scalar), ("vectorized", vectorized)):
+        p50, p99 = timed(fn, repeat)
+        print(f"{name:>14} {p50:>8.3f} {p99:>8.3f}")
+
+if __name__ == "__main__":
+    typer.run(main)
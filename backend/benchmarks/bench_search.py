@@ -0,0 +1,60 @@
+"""Latency of the in-memory catalog search on a large synthetic catalog.
+
+Builds the index straight from generated documents (no Mongo involved),
+then reports build time, incremental update time and per-query latency
+percentiles for an unrestricted (admin) and a single-country caller.
+
+Run from the backend directory:
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --restaurants 1000 --items 100
+"""
+import time
+import typer
+
+from benchmarks.load import percentile
+from catalog import CatalogSnapshot
+from datagen import generate_catalog
+from search import CatalogSearch
+
+QUERIES = [
+    "dish", "dish 4", "di", "main course", "dessert kitchen", "bev", "ind", "seafood",
+    "kitchen india 12", "appetizer dish 7", "bread", "zzz", "d", "chinese", "thai kitchen",
+]
+
+def main(
+    restaurants: int = typer.Option(500, help="Restaurants per country"),
+    items: int = typer.Option(100, help="Menu items per restaurant"),
+    limit: int = typer.Option(20, help="Results per query and document type"),
+    repeat: int = typer.Option(200, help="Runs of the query mix per caller"),
+    changed: int = typer.Option(100, help="Menu items edited for the incremental update"),
+):
+    restaurant_docs, item_docs = generate_catalog(42, restaurants, items, prefix="search")
+    index = CatalogSearch()
+
+    snapshot = CatalogSnapshot(restaurant_docs, item_docs, 1)
+    start = time.perf_counter()
+    index.update(snapshot)
+    print(f"built index over {len(restaurant_docs)} restaurants and {len(item_docs)} menu items "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    edited = [dict(item, name=f"Special {i}") for i, item in enumerate(item_docs[:changed])]
+    snapshot = CatalogSnapshot(restaurant_docs, edited + item_docs[changed:], 2)
+    start = time.perf_counter()
+    index.update(snapshot)
+    print(f"incremental update ({changed} items changed) in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    callers = {"admin": lambda country: True, "india": lambda country: country == "INDIA"}
+    print(f"{'caller':>8} {'queries':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, allowed in callers.items():
+        samples = []
+        for _ in range(repeat):
+            for query in QUERIES:
+                start = time.perf_counter()
+                index.search(query, allowed, limit)
+                samples.append(time.perf_counter() - start)
+        samples.sort()
+        print(f"{name:>8} {len(samples):>8} {percentile(samples, 50) * 1000:>8.3f} "
+              f"{percentile(samples, 99) * 1000:>8.3f} {samples[-1] * 1000:>8.3f}")
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,78 @@
+"""Compare the validated and trusted serialization paths for order lists.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization
+"""
+from datetime import datetime, timezone
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from typing import List
+import asyncio
+import time
+import uuid
+
+from models import Order, OrderStatus, Country
+from serialization import trusted_response
+
+SIZES = [10, 100, 1000]
+ITEMS_PER_ORDER = 3
+
+def make_orders(count: int) -> List[dict]:
+    """Order documents shaped like the ones create_order writes."""
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": str(uuid.uuid4()),
+            "user_name": "bench",
+            "order_date": now,
+            "total_amount": 42.5,
+            "status": OrderStatus.PENDING.value,
+            "payment_method_id": None,
+            "country": Country.INDIA.value,
+            "items": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "menu_item_id": str(uuid.uuid4()),
+                    "menu_item_name": "Butter Chicken",
+                    "quantity": 2,
+                    "price": 350.0,
+                }
+                for _ in range(ITEMS_PER_ORDER)
+            ],
+        }
+        for _ in range(count)
+    ]
+
+async def validated_path(field, orders: List[dict]) -> bytes:
+    """What the handlers did before: build models, then let FastAPI validate and encode."""
+    content = await serialize_response(field=field, response_content=[Order(**order) for order in orders])
+    return JSONResponse(content).body
+
+def trusted_path(orders: List[dict]) -> bytes:
+    return trusted_response(orders).body
+
+async def measure(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await result
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+async def main():
+    field = create_response_field(name="Response", type_=List[Order], mode="serialization")
+    print(f"{'orders':>8} {'validated ms':>14} {'trusted ms':>12} {'speedup':>9}")
+    for size in SIZES:
+        orders = make_orders(size)
+        repeat = max(5, 2000 // size)
+        old = await measure(lambda: validated_path(field, orders), repeat)
+        new = await measure(lambda: trusted_path(orders), repeat)
+        print(f"{size:>8} {old:>14.3f} {new:>12.3f} {old / new:>8.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
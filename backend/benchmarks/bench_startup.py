@@ -0,0 +1,87 @@
+"""How long the app takes to start accepting requests, and to become ready.
+
+Starts server.app against an empty database and then again against the
+now-seeded one, with STARTUP_SEED=blocking (indexes, seeding and the
+catalog load all before serving, the old behaviour) and =background
+(serve at once, /api/ready turns 200 later). "serving" is when the startup
+hook returns; "ready" is when every readiness step is done.
+
+Run from the backend directory:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --backend mongod
+"""
+from typing import Optional
+import asyncio
+import os
+import time
+import typer
+
+from benchmarks.mongo import mongo_backend
+
+class KeepOpen:
+    """Client proxy whose close() is a no-op, so one backend outlives several app shutdowns."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+    def __getitem__(self, name: str):
+        return self._client[name]
+
+    def close(self):
+        pass
+
+async def start_once(server, mode: str, timeout: float) -> tuple:
+    """(ms until serving, ms until ready) for one startup in `mode`."""
+    from catalog import catalog
+    from readiness import readiness
+
+    server.STARTUP_SEED = mode
+    catalog.snapshot = None
+    start = time.perf_counter()
+    await server.app.router.startup()
+    serving = time.perf_counter() - start
+    try:
+        while not readiness.ready:
+            # Failed steps are retried, so only the timeout ends the wait
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"not ready: {readiness.report()}")
+            await asyncio.sleep(0.001)
+        ready = time.perf_counter() - start
+    finally:
+        await server.app.router.shutdown()
+    return serving * 1000, ready * 1000
+
+async def run(backend: str, mongod_bin: Optional[str], timeout: float) -> list:
+    os.environ.setdefault("MONGO_URL", "mongodb://127.0.0.1:1")
+    os.environ.setdefault("DB_NAME", "bench")
+    os.environ.setdefault("CATALOG_WATCH", "off")
+    if backend == "mongomock":
+        # mongomock implements neither explain nor change streams
+        os.environ["INDEX_SELF_CHECK"] = "off"
+    import server
+
+    rows = []
+    for mode in ("blocking", "background"):
+        async with mongo_backend(backend, mongod_bin) as client:
+            server.client = KeepOpen(client)
+            server.db = client[os.environ["DB_NAME"]]
+            for state in ("empty", "seeded"):
+                serving, ready = await start_once(server, mode, timeout)
+                rows.append((mode, state, serving, ready))
+    return rows
+
+def main(
+    backend: str = typer.Option("mongomock", help="mongomock (in-memory) or mongod (temporary server)"),
+    mongod_bin: Optional[str] = typer.Option(None, help="mongod binary (defaults to PATH lookup)"),
+    timeout: float = typer.Option(60.0, help="Seconds to wait for readiness"),
+):
+    rows = asyncio.run(run(backend, mongod_bin, timeout))
+    print(f"{'mode':>10} {'database':>9} {'serving ms':>11} {'ready ms':>9}")
+    for mode, state, serving, ready in rows:
+        print(f"{mode:>10} {state:>9} {serving:>11.1f} {ready:>9.1f}")
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,23 @@
+"""Synthetic catalog, users and order history for the benchmark harness."""
+from datagen import generate_dataset
+
+BENCH_PASSWORD = "bench123"
+
+async def seed_synthetic(
+    db,
+    restaurants_per_country: int,
+    items_per_restaurant: int,
+    users_per_country: int,
+    orders: int,
+    seed: int
+) -> dict:
+    """Insert synthetic documents on top of the demo seed data.
+
+    Every synthetic user shares BENCH_PASSWORD, hashed once. Returns the
+    inserted usernames by (role, country) so the load driver can log in.
+    """
+    result = await generate_dataset(
+        db, restaurants_per_country, items_per_restaurant, users_per_country, orders, seed,
+        password=BENCH_PASSWORD, prefix="bench"
+    )
+    return result["accounts"]
@@ -0,0 +1,289 @@
+"""Fixed-concurrency load driver for the FastAPI app, run in-process over ASGI."""
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+import asyncio
+import httpx
+import math
+import os
+import random
+import time
+
+from benchmarks.mongo import CommandCounter, CountingDatabase, current_endpoint, mongo_backend
+
+DEMO_ACCOUNTS = [
+    ("nickfury", "admin123"),
+    ("captainmarvel", "manager123"),
+    ("captainamerica", "manager123"),
+    ("thanos", "member123"),
+    ("thor", "member123"),
+    ("travis", "member123"),
+]
+# Members cannot check out, so checkouts go through their country's manager
+STAFF_ACCOUNTS = {
+    "INDIA": ("captainmarvel", "manager123"),
+    "AMERICA": ("captainamerica", "manager123"),
+}
+
+DEFAULT_MIX = {"login": 1, "browse": 4, "create_order": 2, "list_orders": 3, "checkout": 1}
+
+class LatencyStats:
+    """Per-endpoint latency samples and status counts.
+
+    Requests shed with a 503 answer before doing any work, so they count as
+    errors but stay out of the latency samples.
+    """
+
+    def __init__(self):
+        self.requests: Dict[str, int] = {}
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.shed: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, status_code: int):
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        if status_code >= 400:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        if status_code == 503:
+            self.shed[endpoint] = self.shed.get(endpoint, 0) + 1
+        else:
+            self.samples.setdefault(endpoint, []).append(seconds)
+
+    def clear(self):
+        self.requests.clear()
+        self.samples.clear()
+        self.errors.clear()
+        self.shed.clear()
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+def summarize(stats: LatencyStats, counter: CommandCounter, elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint, requests in sorted(stats.requests.items()):
+        samples = sorted(stats.samples.get(endpoint, []))
+        commands = counter.by_endpoint.get(endpoint, {})
+        endpoints[endpoint] = {
+            "requests": requests,
+            "errors": stats.errors.get(endpoint, 0),
+            "shed": stats.shed.get(endpoint, 0),
+            "throughput_rps": round(requests / elapsed, 2),
+            "p50_ms": round(percentile(samples, 50) * 1000, 3),
+            "p95_ms": round(percentile(samples, 95) * 1000, 3),
+            "p99_ms": round(percentile(samples, 99) * 1000, 3),
+            "mongo_commands_per_request": round(sum(commands.values()) / requests, 3),
+            "mongo_commands": dict(sorted(commands.items())),
+        }
+    total = sum(stats.requests.values())
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+class Worker:
+    """One simulated client session looping over the weighted operation mix."""
+
+    def __init__(self, client: httpx.AsyncClient, stats: LatencyStats, account: tuple,
+                 rng: random.Random, order_lines: int):
+        self.client = client
+        self.stats = stats
+        self.username, self.password = account
+        self.rng = rng
+        self.order_lines = order_lines
+        self.headers: dict = {}
+        self.staff_headers: dict = {}
+        self.country: Optional[str] = None
+        self.restaurants: List[dict] = []
+        self.menus: Dict[str, List[dict]] = {}
+        self.pending_orders: List[str] = []
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        token = current_endpoint.set(endpoint)
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        finally:
+            current_endpoint.reset(token)
+        self.stats.record(endpoint, time.perf_counter() - start, response.status_code)
+        return response
+
+    async def login(self, username: Optional[str] = None, password: Optional[str] = None) -> dict:
+        response = await self.request(
+            "POST /api/auth/login", "POST", "/api/auth/login",
+            json={"username": username or self.username, "password": password or self.password}
+        )
+        response.raise_for_status()
+        body = response.json()
+        return {"headers": {"Authorization": f"Bearer {body['access_token']}"}, "user": body["user"]}
+
+    async def setup(self):
+        session = await self.login()
+        self.headers = session["headers"]
+        self.country = session["user"]["country"]
+        if session["user"]["role"] == "MEMBER":
+            self.staff_headers = (await self.login(*STAFF_ACCOUNTS[self.country]))["headers"]
+        else:
+            self.staff_headers = self.headers
+        response = await self.request("GET /api/restaurants", "GET", "/api/restaurants", headers=self.headers)
+        self.restaurants = [r for r in response.json() if r["country"] == self.country]
+
+    async def menu(self, restaurant_id: str) -> List[dict]:
+        response = await self.request(
+            "GET /api/restaurants/{restaurant_id}/menu", "GET",
+            f"/api/restaurants/{restaurant_id}/menu", headers=self.headers
+        )
+        self.menus[restaurant_id] = response.json()
+        return self.menus[restaurant_id]
+
+    async def op_login(self):
+        # Failures (e.g. 503 from a saturated password pool) are recorded; keep the old token
+        response = await self.request(
+            "POST /api/auth/login", "POST", "/api/auth/login",
+            json={"username": self.username, "password": self.password}
+        )
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def op_browse(self):
+        await self.request("GET /api/restaurants", "GET", "/api/restaurants", headers=self.headers)
+        await self.menu(self.rng.choice(self.restaurants)["id"])
+
+    async def op_create_order(self):
+        restaurant = self.rng.choice(self.restaurants)
+        menu = self.menus.get(restaurant["id"]) or await self.menu(restaurant["id"])
+        # Unavailable items are refused with a 400; real clients cannot pick them
+        available = [item for item in menu if item["is_available"]]
+        lines = [self.rng.choice(available) for _ in range(self.order_lines)]
+        response = await self.request(
+            "POST /api/orders", "POST", "/api/orders", headers=self.headers,
+            json={"items": [
+                {"menu_item_id": item["id"], "quantity": 1, "price": item["price"]} for item in lines
+            ]}
+        )
+        if response.status_code == 200:
+            self.pending_orders.append(response.json()["id"])
+
+    async def op_list_orders(self):
+        await self.request("GET /api/orders", "GET", "/api/orders", headers=self.headers)
+
+    async def op_checkout(self):
+        if not self.pending_orders:
+            await self.op_create_order()
+        if self.pending_orders:
+            order_id = self.pending_orders.pop()
+            await self.request(
+                "POST /api/orders/{order_id}/checkout", "POST",
+                f"/api/orders/{order_id}/checkout", headers=self.staff_headers
+            )
+
+    async def run(self, mix: Dict[str, int], deadline: float):
+        operations = [getattr(self, f"op_{name}") for name in mix]
+        weights = list(mix.values())
+        while time.perf_counter() < deadline:
+            await self.rng.choices(operations, weights)[0]()
+
+@asynccontextmanager
+async def running_app(backend: str, mongod_bin: Optional[str], dataset: dict, seed: int):
+    """Start server.app against a fresh Mongo stand-in with a seeded dataset.
+
+    Yields (app, counter, accounts); the counter is reset after seeding.
+    """
+    os.environ.setdefault("MONGO_URL", "mongodb://127.0.0.1:1")
+    os.environ.setdefault("DB_NAME", "bench")
+    os.environ.setdefault("CATALOG_WATCH", "off")
+    # Load runs log in as the demo accounts straight after startup
+    os.environ.setdefault("STARTUP_SEED", "blocking")
+    # Every virtual user shares one client IP and orders as fast as it can
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    if backend == "mongomock":
+        # mongomock implements neither explain nor change streams
+        os.environ["INDEX_SELF_CHECK"] = "off"
+
+    import server
+    from catalog import bump_catalog_version, catalog
+    from benchmarks.dataset import seed_synthetic
+
+    async with mongo_backend(backend, mongod_bin) as client:
+        counter = CommandCounter()
+        server.client = client
+        server.db = CountingDatabase(client[os.environ["DB_NAME"]], counter)
+
+        await server.app.router.startup()
+        try:
+            accounts = await seed_synthetic(server.db, seed=seed, **dataset)
+            await bump_catalog_version(server.db)
+            # Reads would otherwise get the pre-dataset catalog until a background reload lands
+            await catalog.load(server.db)
+            counter.reset()
+            yield server.app, counter, accounts
+        finally:
+            await server.app.router.shutdown()
+
+async def run_load(app, counter: CommandCounter, accounts: dict, concurrency: int,
+                   duration: float, mix: Dict[str, int], order_lines: int, seed: int) -> dict:
+    """Drive `app` with `concurrency` workers for `duration` seconds and summarize."""
+    from benchmarks.dataset import BENCH_PASSWORD
+
+    pool = list(DEMO_ACCOUNTS) + [
+        (username, BENCH_PASSWORD) for usernames in accounts.values() for username in usernames
+    ]
+    stats = LatencyStats()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        workers = [
+            Worker(client, stats, pool[i % len(pool)], random.Random(seed + i), order_lines)
+            for i in range(concurrency)
+        ]
+        # Log in one at a time so setup does not trip the password pool's load shedding
+        for worker in workers:
+            await worker.setup()
+
+        # Only the timed phase is reported
+        stats.clear()
+        counter.reset()
+        start = time.perf_counter()
+        await asyncio.gather(*(worker.run(mix, start + duration) for worker in workers))
+        elapsed = time.perf_counter() - start
+
+    return summarize(stats, counter, elapsed)
+
+COMMANDS_TOLERANCE = 0.05
+# Absolute increase in an endpoint's share of failed requests (0.01 = one point)
+ERROR_RATE_TOLERANCE = 0.01
+
+def error_rate(row: dict) -> float:
+    return row["errors"] / row["requests"] if row["requests"] else 0.0
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """List regressions of `current` against `baseline` beyond `tolerance` (0.1 = 10%)."""
+    regressions = []
+    if "config" in baseline and current.get("config") != baseline["config"]:
+        regressions.append(f"config differs from the baseline's: {baseline['config']}")
+    for endpoint, base in baseline.get("endpoints", {}).items():
+        now = current.get("endpoints", {}).get(endpoint)
+        if now is None:
+            regressions.append(f"{endpoint}: missing from current run")
+            continue
+        if now["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {base['p95_ms']}ms -> {now['p95_ms']}ms")
+        if now["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{endpoint}: throughput {base['throughput_rps']} -> {now['throughput_rps']} req/s"
+            )
+        if error_rate(now) > error_rate(base) + ERROR_RATE_TOLERANCE:
+            regressions.append(
+                f"{endpoint}: errors {base['errors']}/{base['requests']} -> {now['errors']}/{now['requests']}"
+            )
+        # Averages shift slightly with the share of failed requests (e.g. a checkout
+        # of an already-cancelled order); a genuinely added command moves them far more
+        if now["mongo_commands_per_request"] > base["mongo_commands_per_request"] * (1 + COMMANDS_TOLERANCE):
+            regressions.append(
+                f"{endpoint}: Mongo commands/request "
+                f"{base['mongo_commands_per_request']} -> {now['mongo_commands_per_request']}"
+            )
+    return regressions
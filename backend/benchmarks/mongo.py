@@ -0,0 +1,112 @@
+"""Mongo stand-ins for the benchmark harness, plus per-endpoint command counting."""
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from typing import AsyncIterator, Optional
+import asyncio
+import shutil
+import socket
+import subprocess
+import tempfile
+
+# Label of the endpoint currently being driven; Mongo calls are attributed to it
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="(startup)")
+
+class CommandCounter:
+    """Counts Mongo operations per endpoint as {endpoint: Counter({"orders.find": n})}."""
+
+    def __init__(self):
+        self.by_endpoint: dict = {}
+
+    def record(self, collection: str, operation: str):
+        endpoint = current_endpoint.get()
+        self.by_endpoint.setdefault(endpoint, Counter())[f"{collection}.{operation}"] += 1
+
+    def reset(self):
+        self.by_endpoint = {}
+
+class CountingCollection:
+    """Collection proxy that records every method call before delegating it."""
+
+    def __init__(self, collection: AsyncIOMotorCollection, counter: CommandCounter):
+        self._collection = collection
+        self._counter = counter
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._collection, name)
+        if isinstance(attr, AsyncIOMotorCollection):
+            return CountingCollection(attr, self._counter)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._counter.record(self._collection.name, name)
+            return attr(*args, **kwargs)
+        return call
+
+class CountingDatabase:
+    """Database proxy handing out CountingCollections."""
+
+    def __init__(self, db, counter: CommandCounter):
+        self._db = db
+        self._counter = counter
+
+    def __getitem__(self, name: str) -> CountingCollection:
+        return CountingCollection(self._db[name], self._counter)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._db, name)
+        if isinstance(attr, AsyncIOMotorCollection):
+            return CountingCollection(attr, self._counter)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._counter.record("db", name)
+            return attr(*args, **kwargs)
+        return call
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@asynccontextmanager
+async def mongo_backend(kind: str, mongod_bin: Optional[str] = None) -> AsyncIterator:
+    """Yield a Motor client for `kind`: "mongomock" (in-memory) or "mongod" (temporary server)."""
+    if kind == "mongomock":
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+        try:
+            yield client
+        finally:
+            client.close()
+        return
+
+    binary = mongod_bin or shutil.which("mongod")
+    if not binary:
+        raise RuntimeError("mongod not found; pass --mongod-bin or use --backend mongomock")
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="bench-mongod-") as dbpath:
+        process = subprocess.Popen(
+            [binary, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        client = AsyncIOMotorClient(f"mongodb://127.0.0.1:{port}", serverSelectionTimeoutMS=500)
+        try:
+            for _ in range(100):
+                try:
+                    await client.admin.command("ping")
+                    break
+                except Exception:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("mongod did not become ready")
+            yield client
+        finally:
+            client.close()
+            process.terminate()
+            process.wait(timeout=10)
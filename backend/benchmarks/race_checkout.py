@@ -0,0 +1,47 @@
+"""Fire many simultaneous checkouts at one order; exactly one must succeed.
+
+Run from the backend directory:
+    python -m benchmarks.race_checkout
+    python -m benchmarks.race_checkout --backend mongod --attempts 100
+"""
+from collections import Counter
+from typing import Optional
+import asyncio
+import httpx
+import typer
+
+from benchmarks.load import running_app
+
+DATASET = {"restaurants_per_country": 2, "items_per_restaurant": 5, "users_per_country": 2, "orders": 0}
+
+async def race(backend: str, mongod_bin: Optional[str], attempts: int) -> Counter:
+    async with running_app(backend, mongod_bin, DATASET, seed=42) as (app, counter, accounts):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://race") as client:
+            login = await client.post("/api/auth/login", json={"username": "captainmarvel", "password": "manager123"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            restaurant = (await client.get("/api/restaurants", headers=headers)).json()[0]
+            item = (await client.get(f"/api/restaurants/{restaurant['id']}/menu", headers=headers)).json()[0]
+            order = (await client.post("/api/orders", headers=headers, json={
+                "items": [{"menu_item_id": item["id"], "quantity": 1, "price": item["price"]}]
+            })).json()
+
+            responses = await asyncio.gather(*(
+                client.post(f"/api/orders/{order['id']}/checkout", headers=headers) for _ in range(attempts)
+            ))
+    return Counter(response.status_code for response in responses)
+
+def main(
+    attempts: int = typer.Option(100, help="Concurrent checkout requests"),
+    backend: str = typer.Option("mongomock", help="mongomock (in-memory) or mongod (temporary server)"),
+    mongod_bin: Optional[str] = typer.Option(None, help="mongod binary (defaults to PATH lookup)"),
+):
+    statuses = asyncio.run(race(backend, mongod_bin, attempts))
+    typer.echo(f"status codes: {dict(sorted(statuses.items()))}")
+    if statuses[200] != 1:
+        typer.echo(f"FAIL: {statuses[200]} checkouts succeeded, expected exactly 1")
+        raise typer.Exit(code=1)
+    typer.echo("OK: exactly one checkout succeeded")
+
+if __name__ == "__main__":
+    typer.run(main)
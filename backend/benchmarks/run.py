@@ -0,0 +1,95 @@
+"""Benchmark CLI.
+
+Run from the backend directory:
+    python -m benchmarks.run load --concurrency 4 --duration 20 --out bench_results.json
+    python -m benchmarks.run compare bench_results.json benchmarks/baseline.json
+
+benchmarks/baseline.json was written by `python -m benchmarks.run load --out
+benchmarks/baseline.json` with every option at its default; the exact
+parameters are stored under its "config" key, and compare flags a run made
+with different ones. Every request in it succeeded, so any new errors show up
+as a regression. Latencies are machine-specific, so regenerate the
+baseline on the machine that runs the comparison.
+"""
+from pathlib import Path
+from typing import Optional
+import asyncio
+import json
+import typer
+
+from benchmarks.load import DEFAULT_MIX, compare as compare_results, run_load, running_app
+
+app = typer.Typer(help="Load and benchmark suite for the Food Ordering API.")
+
+def parse_mix(value: str) -> dict:
+    """Parse "login=1,browse=4" into {"login": 1, "browse": 4}."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise typer.BadParameter(f"unknown operation {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+@app.command()
+def load(
+    concurrency: int = typer.Option(
+        4, help="Simulated concurrent clients; above the password pool's size plus queue, logins are shed"
+    ),
+    duration: float = typer.Option(10.0, help="Timed phase length in seconds"),
+    mix: str = typer.Option(",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()), help="Operation weights"),
+    order_lines: int = typer.Option(3, help="Line items per created order"),
+    restaurants_per_country: int = typer.Option(50),
+    items_per_restaurant: int = typer.Option(20),
+    users_per_country: int = typer.Option(200),
+    orders: int = typer.Option(5000, help="Pre-existing orders"),
+    seed: int = typer.Option(42, help="Seed for the dataset and operation choices"),
+    backend: str = typer.Option("mongomock", help="mongomock (in-memory) or mongod (temporary server)"),
+    mongod_bin: Optional[str] = typer.Option(None, help="mongod binary (defaults to PATH lookup)"),
+    out: Path = typer.Option(Path("bench_results.json"), help="Where to write the JSON report"),
+):
+    """Seed a dataset, drive the API at fixed concurrency and write a JSON report."""
+    dataset = {
+        "restaurants_per_country": restaurants_per_country,
+        "items_per_restaurant": items_per_restaurant,
+        "users_per_country": users_per_country,
+        "orders": orders,
+    }
+
+    async def main() -> dict:
+        async with running_app(backend, mongod_bin, dataset, seed) as (server_app, counter, accounts):
+            return await run_load(
+                server_app, counter, accounts, concurrency, duration, parse_mix(mix), order_lines, seed
+            )
+
+    report = asyncio.run(main())
+    report["config"] = {
+        "backend": backend, "concurrency": concurrency, "duration_s": duration,
+        "mix": parse_mix(mix), "order_lines": order_lines, "seed": seed, **dataset,
+    }
+    out.write_text(json.dumps(report, indent=2) + "\n")
+
+    typer.echo(f"{'endpoint':<44} {'req':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'mongo/req':>10}")
+    for endpoint, row in report["endpoints"].items():
+        typer.echo(
+            f"{endpoint:<44} {row['requests']:>6} {row['throughput_rps']:>8} {row['p50_ms']:>8} "
+            f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['mongo_commands_per_request']:>10}"
+        )
+    typer.echo(f"Wrote {out}")
+
+@app.command()
+def compare(
+    current: Path,
+    baseline: Path,
+    tolerance: float = typer.Option(0.2, help="Allowed relative regression (0.2 = 20%)"),
+):
+    """Exit non-zero when `current` regresses against `baseline`."""
+    regressions = compare_results(json.loads(current.read_text()), json.loads(baseline.read_text()), tolerance)
+    for regression in regressions:
+        typer.echo(f"REGRESSION {regression}")
+    if regressions:
+        raise typer.Exit(code=1)
+    typer.echo("No regressions")
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,271 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from models import Restaurant, MenuItem
+from serialization import model_projection
+from pymongo.errors import PyMongoError
+from typing import Callable, Dict, List, Optional
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Catalog cache settings
+CATALOG_TTL_SECONDS = float(os.environ.get("CATALOG_TTL_SECONDS", 300))
+CATALOG_WATCH = os.environ.get("CATALOG_WATCH", "version")  # off | version | changestream
+CATALOG_WATCH_INTERVAL = float(os.environ.get("CATALOG_WATCH_INTERVAL", 5))
+
+CATALOG_VERSION_ID = "catalog"
+
+class CatalogSnapshot:
+    """Immutable view of every restaurant and menu item at one point in time."""
+
+    def __init__(self, restaurants: List[dict], menu_items: List[dict], version: int, epoch: str = ""):
+        self.version = version
+        # Base of the HTTP validators. bump_catalog_version moves the version on
+        # every edit; the epoch tells a recreated catalog_meta (e.g. a dropped
+        # database) apart from the one whose version numbers it repeats
+        self.validator = f"{epoch[:8]}v{version}"
+        self.restaurants: Dict[str, dict] = {r["id"]: r for r in restaurants}
+        self.all_restaurants: List[dict] = sorted(restaurants, key=lambda r: r["id"])
+        self.by_country: Dict[str, List[dict]] = {}
+        for restaurant in self.all_restaurants:
+            self.by_country.setdefault(restaurant["country"], []).append(restaurant)
+        self.menu_items: Dict[str, dict] = {item["id"]: item for item in menu_items}
+        self.menus: Dict[str, List[dict]] = {}
+        for item in menu_items:
+            self.menus.setdefault(item["restaurant_id"], []).append(item)
+        # Serialized (and compressed) response bodies by ETag, see compression.precompressed_response
+        self.encoded_bodies: Dict[str, dict] = {}
+
+    def list_restaurants(self, country: Optional[str] = None) -> List[dict]:
+        """All restaurants ordered by id, optionally limited to one country."""
+        if country is None:
+            return self.all_restaurants
+        return self.by_country.get(country, [])
+
+class CatalogCache:
+    """In-process cache of restaurants and menus.
+
+    The whole catalog is loaded in one pass and served from dicts. Once the
+    TTL expires or invalidate() is called, reads keep getting the previous
+    snapshot while a background task loads the next one; only the very
+    first read waits for a load. Documents handed out are shared between
+    requests and must not be mutated.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.failed_reloads = 0
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self._listeners: List[Callable[[CatalogSnapshot], None]] = []
+        self._watcher: Optional[asyncio.Task] = None
+        self._refresh: Optional[asyncio.Task] = None
+
+    def subscribe(self, listener: Callable[[CatalogSnapshot], None]):
+        """Call `listener` with every newly loaded snapshot.
+
+        Listeners run in a worker thread while requests keep being served, so
+        they must build their new state aside and publish it with a single
+        assignment.
+        """
+        self._listeners.append(listener)
+        if self.snapshot is not None:
+            listener(self.snapshot)
+
+    def invalidate(self):
+        """Mark the current snapshot stale; the next read starts a reload."""
+        self._expires_at = 0.0
+
+    async def load(self, db: AsyncIOMotorDatabase) -> CatalogSnapshot:
+        """Load a fresh snapshot from Mongo and notify listeners."""
+        async with self._lock:
+            return await self._load(db)
+
+    async def _load(self, db: AsyncIOMotorDatabase) -> CatalogSnapshot:
+        # Loads are serialized by self._lock, so listeners never see two at once
+        version_doc = await db.catalog_meta.find_one({"_id": CATALOG_VERSION_ID})
+        restaurants = await db.restaurants.find({}, model_projection(Restaurant)).to_list(None)
+        menu_items = await db.menu_items.find({}, model_projection(MenuItem)).to_list(None)
+
+        # Indexing a large catalog (and the listeners' own indexes) takes seconds;
+        # keep it off the event loop
+        snapshot = await asyncio.to_thread(
+            self._build, restaurants, menu_items,
+            version_doc["version"] if version_doc else 0, version_doc.get("epoch", "") if version_doc else ""
+        )
+        self.snapshot = snapshot
+        self._expires_at = time.monotonic() + self.ttl_seconds
+        self.reloads += 1
+        logger.info(
+            f"Loaded catalog v{snapshot.version}: "
+            f"{len(restaurants)} restaurants, {len(menu_items)} menu items"
+        )
+        return snapshot
+
+    def _build(self, restaurants: List[dict], menu_items: List[dict], version: int, epoch: str) -> CatalogSnapshot:
+        """Worker thread: build the snapshot and run the listeners on it."""
+        snapshot = CatalogSnapshot(restaurants, menu_items, version, epoch)
+        for listener in self._listeners:
+            listener(snapshot)
+        return snapshot
+
+    async def get(self, db: AsyncIOMotorDatabase) -> CatalogSnapshot:
+        """Return the current snapshot, starting a background reload if it is stale."""
+        if self.snapshot is not None:
+            if time.monotonic() < self._expires_at:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._start_refresh(db)
+            return self.snapshot
+
+        async with self._lock:
+            # Another request may have loaded it while we waited for the lock
+            if self.snapshot is not None:
+                self.hits += 1
+                return self.snapshot
+            self.misses += 1
+            return await self._load(db)
+
+    def _start_refresh(self, db: AsyncIOMotorDatabase):
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._refresh_stale(db))
+
+    async def _refresh_stale(self, db: AsyncIOMotorDatabase):
+        async with self._lock:
+            if time.monotonic() < self._expires_at:
+                return
+            try:
+                await self._load(db)
+            except PyMongoError as e:
+                self._reload_failed()
+                logger.warning(f"Catalog reload failed, serving the previous snapshot: {str(e)}")
+            except Exception:
+                # e.g. a listener raised; nobody awaits this task, so log it here
+                self._reload_failed()
+                logger.exception("Catalog reload failed, serving the previous snapshot")
+
+    def _reload_failed(self):
+        self.failed_reloads += 1
+        # Keep serving the stale snapshot; try again after a short pause
+        self._expires_at = time.monotonic() + CATALOG_WATCH_INTERVAL
+
+    async def get_restaurant(self, db: AsyncIOMotorDatabase, restaurant_id: str) -> Optional[dict]:
+        return (await self.get(db)).restaurants.get(restaurant_id)
+
+    async def list_restaurants(self, db: AsyncIOMotorDatabase, country: Optional[str] = None) -> List[dict]:
+        """All restaurants ordered by id, optionally limited to one country."""
+        return (await self.get(db)).list_restaurants(country)
+
+    async def get_menu(self, db: AsyncIOMotorDatabase, restaurant_id: str) -> List[dict]:
+        return (await self.get(db)).menus.get(restaurant_id, [])
+
+    async def get_menu_items(self, db: AsyncIOMotorDatabase, menu_item_ids: List[str]) -> Dict[str, dict]:
+        """Look up menu items by id, falling back to Mongo for ids not in the snapshot."""
+        snapshot = await self.get(db)
+        found = {i: snapshot.menu_items[i] for i in menu_item_ids if i in snapshot.menu_items}
+        missing = [i for i in menu_item_ids if i not in found]
+        if missing:
+            for item in await db.menu_items.find({"id": {"$in": missing}}, model_projection(MenuItem)).to_list(None):
+                found[item["id"]] = item
+        return found
+
+    async def get_restaurants(self, db: AsyncIOMotorDatabase, restaurant_ids: List[str]) -> Dict[str, dict]:
+        """Look up restaurants by id, falling back to Mongo for ids not in the snapshot."""
+        snapshot = await self.get(db)
+        found = {i: snapshot.restaurants[i] for i in restaurant_ids if i in snapshot.restaurants}
+        missing = [i for i in restaurant_ids if i not in found]
+        if missing:
+            for restaurant in await db.restaurants.find({"id": {"$in": missing}}, model_projection(Restaurant)).to_list(None):
+                found[restaurant["id"]] = restaurant
+        return found
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "version": self.snapshot.version if self.snapshot else None,
+            "restaurants": len(self.snapshot.restaurants) if self.snapshot else 0,
+            "menu_items": len(self.snapshot.menu_items) if self.snapshot else 0,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "ttl_seconds": self.ttl_seconds,
+            "watch": CATALOG_WATCH,
+        }
+
+    # ---------- cross-worker invalidation ----------
+
+    def start_watcher(self, db: AsyncIOMotorDatabase, mode: str = CATALOG_WATCH):
+        """Start a background task that invalidates the cache on catalog edits."""
+        if mode == "version":
+            self._watcher = asyncio.create_task(self._watch_version(db))
+        elif mode == "changestream":
+            self._watcher = asyncio.create_task(self._watch_changes(db))
+
+    async def stop_watcher(self):
+        if self._refresh is not None:
+            self._refresh.cancel()
+            await asyncio.gather(self._refresh, return_exceptions=True)
+            self._refresh = None
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    async def _watch_version(self, db: AsyncIOMotorDatabase):
+        """Poll the catalog version document and reload when it moves."""
+        while True:
+            await asyncio.sleep(CATALOG_WATCH_INTERVAL)
+            try:
+                version_doc = await db.catalog_meta.find_one({"_id": CATALOG_VERSION_ID})
+                version = version_doc["version"] if version_doc else 0
+                if self.snapshot is not None and version != self.snapshot.version:
+                    logger.info(f"Catalog version moved to v{version}, invalidating cache")
+                    self.invalidate()
+            except PyMongoError as e:
+                logger.warning(f"Catalog version check failed: {str(e)}")
+
+    async def _watch_changes(self, db: AsyncIOMotorDatabase):
+        """Invalidate on any change to restaurants or menu_items (requires a replica set)."""
+        pipeline = [{"$match": {"ns.coll": {"$in": ["restaurants", "menu_items"]}}}]
+        while True:
+            try:
+                async with db.watch(pipeline) as stream:
+                    async for _ in stream:
+                        self.invalidate()
+            except PyMongoError as e:
+                logger.warning(f"Catalog change stream failed, retrying: {str(e)}")
+                self.invalidate()
+                await asyncio.sleep(CATALOG_WATCH_INTERVAL)
+
+async def bump_catalog_version(db: AsyncIOMotorDatabase) -> int:
+    """Record a catalog edit so every worker's cache reloads; call after writing restaurants or menus.
+
+    The version also drives the catalog ETags, so an edit without a bump is
+    not seen by clients revalidating with If-None-Match.
+    """
+    catalog.invalidate()
+    doc = await db.catalog_meta.find_one_and_update(
+        {"_id": CATALOG_VERSION_ID},
+        {"$inc": {"version": 1}, "$setOnInsert": {"epoch": uuid.uuid4().hex}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return doc["version"]
+
+catalog = CatalogCache(CATALOG_TTL_SECONDS)
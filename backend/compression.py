@@ -0,0 +1,192 @@
+"""Negotiated gzip / brotli response compression.
+
+CompressionMiddleware compresses text and JSON responses above
+COMPRESSION_MIN_SIZE for clients that accept it. Catalog routes use
+precompressed_response() instead, which serializes and compresses each body
+once per catalog snapshot and ETag rather than once per request.
+"""
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from typing import Dict, Optional
+import gzip
+import orjson
+import os
+import zlib
+
+from http_cache import encoding_etag
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+# Precompressed bodies are encoded once per catalog version, so they can afford smaller, slower settings
+PRECOMPRESSED_GZIP_LEVEL = 9
+PRECOMPRESSED_BROTLI_QUALITY = int(os.environ.get("PRECOMPRESSED_BROTLI_QUALITY", "9"))
+# Encoded bodies kept per catalog snapshot (paged restaurant listings multiply the ETags)
+PRECOMPRESSED_MAX_BODIES = int(os.environ.get("PRECOMPRESSED_MAX_BODIES", "1024"))
+
+# Preference order when the client rates several encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+# Server-Sent Events are left alone: compressors buffer, which would delay events
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/csv", "text/plain", "text/html")
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported encoding allowed by an Accept-Encoding header, or None for identity."""
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(body: bytes, encoding: str, precompressed: bool = False) -> bytes:
+    if encoding == "br":
+        quality = PRECOMPRESSED_BROTLI_QUALITY if precompressed else COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    level = PRECOMPRESSED_GZIP_LEVEL if precompressed else COMPRESSION_GZIP_LEVEL
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+class StreamCompressor:
+    """Incremental compressor for streamed (multi-chunk) response bodies."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+def _compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return "content-encoding" not in headers and content_type in COMPRESSIBLE_TYPES
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses for clients that accept gzip or br.
+
+    Single-chunk bodies below `minimum_size` are sent as-is; streamed bodies
+    are compressed chunk by chunk. Responses that already carry a
+    Content-Encoding (see precompressed_response) pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                if _compressible(Headers(raw=message["headers"])):
+                    # Held back until the first body chunk shows whether to compress
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    passthrough = True
+                    if len(body) >= self.minimum_size:
+                        body = compress(body, encoding)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(body))
+                        if "etag" in headers:
+                            headers["ETag"] = encoding_etag(headers["ETag"], encoding)
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                compressor = StreamCompressor(encoding)
+                headers["Content-Encoding"] = encoding
+                if "etag" in headers:
+                    headers["ETag"] = encoding_etag(headers["ETag"], encoding)
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await send(start_message)
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+def precompressed_response(
+    request: Request,
+    bodies: Dict[str, dict],
+    etag: str,
+    content,
+    headers: Dict[str, str]
+) -> Response:
+    """JSON response for `content`, serialized and compressed at most once per ETag.
+
+    `bodies` is the catalog snapshot's encoded_bodies, so cached bodies are
+    dropped with the snapshot when the catalog changes. A compressed body is
+    sent with `etag` suffixed for its encoding (see http_cache.encoding_etag).
+    """
+    encoded = bodies.get(etag)
+    if encoded is None:
+        # Same options as ORJSONResponse
+        encoded = {None: orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)}
+        if len(bodies) < PRECOMPRESSED_MAX_BODIES:
+            bodies[etag] = encoded
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if len(encoded[None]) < COMPRESSION_MIN_SIZE:
+        encoding = None
+    body = encoded.get(encoding)
+    if body is None:
+        body = encoded[encoding] = compress(encoded[None], encoding, precompressed=True)
+    response = Response(body, media_type="application/json", headers=headers)
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+        response.headers["ETag"] = encoding_etag(etag, encoding)
+    return response
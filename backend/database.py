@@ -1,29 +1,115 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
 from models import UserRole, Country, OrderStatus, PaymentMethodType
-from auth import hash_password
+from auth import hash_password_async
+from catalog import bump_catalog_version
+import asyncio
 from datetime import datetime, timezone
+import os
+import socket
+import time
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+SEED_LOCK_ID = "seed_database"
+# A seeding worker that holds the lock longer than this is presumed dead
+SEED_LOCK_TIMEOUT_SECONDS = 300
+SEED_LOCK_POLL_SECONDS = 0.5
+# Recorded in the migrations collection once seed_database has finished
+SEED_MARKER = "seed"
+
+async def seeding_done(db: AsyncIOMotorDatabase) -> bool:
+    """True when the seed data and every migration are recorded as done (one query)."""
+    done = {doc["_id"] async for doc in db.migrations.find({}, {"_id": 1})}
+    return SEED_MARKER in done and all(name in done for name, _ in MIGRATIONS)
+
+async def seed_database_once(db: AsyncIOMotorDatabase):
+    """Run seed_database and pending migrations in exactly one of several
+    concurrently starting workers.
+
+    The worker that inserts the lock document seeds; the others wait until it
+    is removed. Once everything is recorded as done, workers skip the lock.
+    """
+    if await seeding_done(db):
+        logger.info("Database already seeded and migrated, skipping...")
+        return
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        acquired_at = datetime.now(timezone.utc)
+        try:
+            await db.locks.insert_one({"_id": SEED_LOCK_ID, "owner": owner, "acquired_at": acquired_at})
+        except DuplicateKeyError:
+            lock = await db.locks.find_one({"_id": SEED_LOCK_ID})
+            if lock is None:
+                continue
+            held_for = time.time() - lock["acquired_at"].replace(tzinfo=timezone.utc).timestamp()
+            if held_for > SEED_LOCK_TIMEOUT_SECONDS:
+                logger.warning(f"Taking over seed lock held by {lock['owner']} for {held_for:.0f}s")
+                await db.locks.delete_one({"_id": SEED_LOCK_ID, "acquired_at": lock["acquired_at"]})
+                continue
+            logger.info(f"Waiting for {lock['owner']} to finish seeding...")
+            await asyncio.sleep(SEED_LOCK_POLL_SECONDS)
+            continue
+        
+        try:
+            await seed_database(db)
+            await db.migrations.update_one(
+                {"_id": SEED_MARKER}, {"$setOnInsert": {"applied_at": datetime.now(timezone.utc)}}, upsert=True
+            )
+            await run_migrations(db)
+        finally:
+            await db.locks.delete_one({"_id": SEED_LOCK_ID, "owner": owner})
+        return
+
+async def backfill_order_item_counts(db: AsyncIOMotorDatabase):
+    """Add item_count to orders written before it was stored."""
+    result = await db.orders.update_many(
+        {"item_count": {"$exists": False}},
+        [{"$set": {"item_count": {"$size": {"$ifNull": ["$items", []]}}}}]
+    )
+    logger.info(f"Backfilled item_count on {result.modified_count} orders")
+
+# One-off data migrations, applied in order; each is recorded in the
+# migrations collection so it runs once per database
+MIGRATIONS = [
+    ("order_item_count", backfill_order_item_counts),
+]
+
+async def run_migrations(db: AsyncIOMotorDatabase):
+    """Apply migrations not yet recorded as done."""
+    done = {doc["_id"] async for doc in db.migrations.find({}, {"_id": 1})}
+    for name, migrate in MIGRATIONS:
+        if name in done:
+            continue
+        logger.info(f"Running migration {name}...")
+        await migrate(db)
+        await db.migrations.insert_one({"_id": name, "applied_at": datetime.now(timezone.utc)})
+
 async def seed_database(db: AsyncIOMotorDatabase):
     """Seed the database with initial data."""
     
     # Check if data already exists
-    existing_users = await db.users.count_documents({})
-    if existing_users > 0:
+    if await db.users.find_one({}, {"_id": 1}) is not None:
         logger.info("Database already seeded, skipping...")
         return
     
     logger.info("Seeding database...")
     
+    # Hash each distinct seed password once, concurrently on the worker pool
+    seed_passwords = ["admin123", "manager123", "member123"]
+    seed_hashes = dict(zip(
+        seed_passwords,
+        await asyncio.gather(*(hash_password_async(pw) for pw in seed_passwords))
+    ))
+    
     # Seed Users
     users = [
         {
             "id": str(uuid.uuid4()),
             "username": "nickfury",
-            "password_hash": hash_password("admin123"),
+            "password_hash": seed_hashes["admin123"],
             "full_name": "Nick Fury",
             "role": UserRole.ADMIN.value,
             "country": Country.AMERICA.value,
@@ -32,7 +118,7 @@ async def seed_database(db: AsyncIOMotorDatabase):
         {
             "id": str(uuid.uuid4()),
             "username": "captainmarvel",
-            "password_hash": hash_password("manager123"),
+            "password_hash": seed_hashes["manager123"],
             "full_name": "Captain Marvel",
             "role": UserRole.MANAGER.value,
             "country": Country.INDIA.value,
@@ -41,7 +127,7 @@ async def seed_database(db: AsyncIOMotorDatabase):
         {
             "id": str(uuid.uuid4()),
             "username": "captainamerica",
-            "password_hash": hash_password("manager123"),
+            "password_hash": seed_hashes["manager123"],
             "full_name": "Captain America",
             "role": UserRole.MANAGER.value,
             "country": Country.AMERICA.value,
@@ -50,7 +136,7 @@ async def seed_database(db: AsyncIOMotorDatabase):
         {
             "id": str(uuid.uuid4()),
             "username": "thanos",
-            "password_hash": hash_password("member123"),
+            "password_hash": seed_hashes["member123"],
             "full_name": "Thanos",
             "role": UserRole.MEMBER.value,
             "country": Country.INDIA.value,
@@ -59,7 +145,7 @@ async def seed_database(db: AsyncIOMotorDatabase):
         {
             "id": str(uuid.uuid4()),
             "username": "thor",
-            "password_hash": hash_password("member123"),
+            "password_hash": seed_hashes["member123"],
             "full_name": "Thor",
             "role": UserRole.MEMBER.value,
             "country": Country.INDIA.value,
@@ -68,7 +154,7 @@ async def seed_database(db: AsyncIOMotorDatabase):
         {
             "id": str(uuid.uuid4()),
             "username": "travis",
-            "password_hash": hash_password("member123"),
+            "password_hash": seed_hashes["member123"],
             "full_name": "Travis",
             "role": UserRole.MEMBER.value,
             "country": Country.AMERICA.value,
@@ -219,6 +305,7 @@ async def seed_database(db: AsyncIOMotorDatabase):
     
     await db.menu_items.insert_many(menu_items)
     logger.info(f"Seeded {len(menu_items)} menu items")
+    await bump_catalog_version(db)
     
     # Create payment methods for some users
     payment_methods = [
@@ -246,3 +333,35 @@ async def seed_database(db: AsyncIOMotorDatabase):
     logger.info(f"Seeded {len(payment_methods)} payment methods")
     
     logger.info("Database seeding completed successfully!")
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pathlib import Path
+    import typer
+
+    load_dotenv(Path(__file__).parent / '.env')
+    cli = typer.Typer(help="Database setup.")
+
+    @cli.callback()
+    def main():
+        """Run from the backend directory: python database.py seed"""
+
+    @cli.command()
+    def seed():
+        """Create indexes, seed an empty database and apply pending migrations."""
+        from indexes import ensure_indexes
+
+        async def run():
+            client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+            try:
+                db = client[os.environ['DB_NAME']]
+                await ensure_indexes(db)
+                await seed_database_once(db)
+            finally:
+                client.close()
+            typer.echo("Database is indexed, seeded and migrated")
+
+        asyncio.run(run())
+
+    cli()
@@ -0,0 +1,314 @@
+"""Synthetic large-dataset generator for load testing.
+
+Run from the backend directory (uses MONGO_URL / DB_NAME from .env):
+    python datagen.py --orders 2000000 --restaurants-per-country 2000 --users-per-country 5000
+    python datagen.py --drop --seed 7
+
+The demo accounts from seed_database are created first; every synthetic user
+shares one template password (--password), hashed once. The same seed,
+volumes and --now produce the same documents, apart from the bcrypt salt of
+that shared hash; without --now, dates are anchored to the current time.
+"""
+from datetime import datetime, timedelta, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Dict, Iterator, List, Optional
+import asyncio
+import logging
+import time
+import uuid
+
+import numpy as np
+
+from models import UserRole, Country, OrderStatus
+from auth import hash_password_async
+
+logger = logging.getLogger(__name__)
+
+COUNTRIES = [country.value for country in Country]
+CUISINES = np.array(["Indian", "American", "Italian", "Mexican", "Seafood", "Chinese", "Thai"])
+CATEGORIES = np.array(["Main Course", "Appetizer", "Dessert", "Beverages", "Breads"])
+STATUSES = np.array([status.value for status in OrderStatus])
+# Most history is completed; some is still pending or was cancelled
+STATUS_WEIGHTS = [0.15, 0.75, 0.10]
+ORDER_HISTORY_DAYS = 365
+
+# Independent random streams, so e.g. the order batches do not depend on
+# how many users were generated before them
+USERS_STREAM, CATALOG_STREAM, ORDERS_STREAM = 1, 2, 3
+
+def _rng(seed: int, *stream: int) -> np.random.Generator:
+    return np.random.default_rng([seed, *stream])
+
+def _uuids(rng: np.random.Generator, count: int) -> List[str]:
+    raw = rng.bytes(16 * count)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * count, 16)]
+
+def generate_users(seed: int, per_country: int, password_hash: str, prefix: str, now: datetime) -> List[dict]:
+    """`per_country` users in each country, one manager per ten members."""
+    rng = _rng(seed, USERS_STREAM)
+    created_at = now.isoformat()
+    users = []
+    for country in COUNTRIES:
+        ids = _uuids(rng, per_country)
+        for i, user_id in enumerate(ids):
+            users.append({
+                "id": user_id,
+                "username": f"{prefix}_{country.lower()}_{i}",
+                "password_hash": password_hash,
+                "full_name": f"{prefix.title()} User {i}",
+                "role": (UserRole.MANAGER if i % 10 == 0 else UserRole.MEMBER).value,
+                "country": country,
+                "created_at": created_at
+            })
+    return users
+
+def generate_catalog(seed: int, restaurants_per_country: int, items_per_restaurant: int, prefix: str) -> tuple:
+    """Restaurants per country and their menu items, as (restaurants, menu_items)."""
+    rng = _rng(seed, CATALOG_STREAM)
+    restaurants = []
+    menu_items = []
+    for country in COUNTRIES:
+        restaurant_ids = _uuids(rng, restaurants_per_country)
+        cuisines = rng.choice(CUISINES, size=restaurants_per_country)
+        ratings = np.round(rng.uniform(3.0, 5.0, size=restaurants_per_country), 1)
+        for i, restaurant_id in enumerate(restaurant_ids):
+            restaurants.append({
+                "id": restaurant_id,
+                "name": f"{prefix.title()} Kitchen {country.title()} {i}",
+                "location": f"{prefix.title()} City {i % 100}",
+                "country": country,
+                "cuisine_type": str(cuisines[i]),
+                "image_url": None,
+                "rating": float(ratings[i])
+            })
+
+        count = restaurants_per_country * items_per_restaurant
+        item_ids = _uuids(rng, count)
+        prices = np.round(rng.uniform(2, 400, size=count), 2)
+        categories = rng.choice(CATEGORIES, size=count)
+        available = rng.random(size=count) > 0.05
+        for j, item_id in enumerate(item_ids):
+            menu_items.append({
+                "id": item_id,
+                "restaurant_id": restaurant_ids[j // items_per_restaurant],
+                "name": f"Dish {j % items_per_restaurant}",
+                "description": f"{categories[j]} from {prefix} kitchen {j // items_per_restaurant}",
+                "price": float(prices[j]),
+                "category": str(categories[j]),
+                "image_url": None,
+                "is_available": bool(available[j])
+            })
+    return restaurants, menu_items
+
+class OrderGenerator:
+    """Produces order documents in reproducible batches with vectorized sampling."""
+
+    def __init__(self, seed: int, users: List[dict], restaurants: List[dict], menu_items: List[dict],
+                 lines_per_order: int, now: datetime):
+        self.seed = seed
+        self.lines = lines_per_order
+        self.now = now
+        self.users = users
+        self.user_country = np.array([COUNTRIES.index(u["country"]) for u in users])
+        # Users only order from their own country: menu items and prices per country index
+        country_of = {r["id"]: COUNTRIES.index(r["country"]) for r in restaurants}
+        self.items: Dict[int, List[dict]] = {index: [] for index in range(len(COUNTRIES))}
+        for item in menu_items:
+            self.items[country_of[item["restaurant_id"]]].append(item)
+        self.prices = {c: np.array([i["price"] for i in items]) for c, items in self.items.items()}
+
+    def batch(self, index: int, size: int) -> List[dict]:
+        """Orders for batch `index`; depends only on the seed and the batch index."""
+        rng = _rng(self.seed, ORDERS_STREAM, index)
+        user_idx = rng.integers(len(self.users), size=size)
+        countries = self.user_country[user_idx]
+        quantities = rng.integers(1, 5, size=(size, self.lines))
+        picks = np.empty((size, self.lines), dtype=np.int64)
+        line_prices = np.empty((size, self.lines))
+        for country, items in self.items.items():
+            mask = countries == country
+            picks[mask] = rng.integers(len(items), size=(int(mask.sum()), self.lines))
+            line_prices[mask] = self.prices[country][picks[mask]]
+        totals = np.round((line_prices * quantities).sum(axis=1), 2)
+        minutes_ago = rng.integers(0, ORDER_HISTORY_DAYS * 24 * 60, size=size)
+        statuses = rng.choice(STATUSES, size=size, p=STATUS_WEIGHTS)
+        order_ids = _uuids(rng, size)
+        item_ids = _uuids(rng, size * self.lines)
+
+        orders = []
+        for n in range(size):
+            user = self.users[user_idx[n]]
+            items = self.items[countries[n]]
+            order_items = []
+            for line in range(self.lines):
+                menu_item = items[picks[n, line]]
+                order_items.append({
+                    "id": item_ids[n * self.lines + line],
+                    "menu_item_id": menu_item["id"],
+                    "menu_item_name": menu_item["name"],
+                    "restaurant_id": menu_item["restaurant_id"],
+                    "quantity": int(quantities[n, line]),
+                    "price": menu_item["price"]
+                })
+            orders.append({
+                "id": order_ids[n],
+                "user_id": user["id"],
+                "user_name": user["username"],
+                "order_date": (self.now - timedelta(minutes=int(minutes_ago[n]))).isoformat(),
+                "total_amount": float(totals[n]),
+                "status": str(statuses[n]),
+                "payment_method_id": None,
+                "country": user["country"],
+                "items": order_items,
+                "item_count": self.lines
+            })
+        return orders
+
+def _batches(docs: List[dict], size: int) -> Iterator[List[dict]]:
+    for start in range(0, len(docs), size):
+        yield docs[start:start + size]
+
+async def _insert_batches(db: AsyncIOMotorDatabase, collection: str, batches, concurrency: int) -> int:
+    """insert_many every batch, keeping up to `concurrency` batches in flight."""
+    slots = asyncio.Semaphore(concurrency)
+    pending = set()
+    inserted = 0
+
+    async def insert(batch: List[dict]):
+        nonlocal inserted
+        try:
+            await db[collection].insert_many(batch, ordered=False)
+            inserted += len(batch)
+        finally:
+            slots.release()
+
+    for batch in batches:
+        # Generating the next batch overlaps with the inserts already in flight
+        await slots.acquire()
+        task = asyncio.create_task(insert(batch))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+    return inserted
+
+async def generate_dataset(
+    db: AsyncIOMotorDatabase,
+    restaurants_per_country: int,
+    items_per_restaurant: int,
+    users_per_country: int,
+    orders: int,
+    seed: int,
+    password: str,
+    lines_per_order: int = 3,
+    batch_size: int = 5000,
+    concurrency: int = 4,
+    prefix: str = "synthetic",
+    now: Optional[datetime] = None
+) -> dict:
+    """Insert a synthetic dataset and return per-collection counts and timings.
+
+    Order dates and created_at timestamps count back from `now` (default:
+    the current time). The result also maps (role, country) to the
+    generated usernames.
+    """
+    now = now or datetime.now(timezone.utc)
+    password_hash = await hash_password_async(password)
+    report: Dict[str, dict] = {}
+
+    async def timed(collection: str, batches) -> None:
+        start = time.perf_counter()
+        count = await _insert_batches(db, collection, batches, concurrency)
+        seconds = time.perf_counter() - start
+        report[collection] = {
+            "documents": count,
+            "seconds": round(seconds, 3),
+            "docs_per_second": round(count / seconds, 1) if seconds else 0.0,
+        }
+        logger.info(f"Inserted {count} {collection} in {seconds:.2f}s ({report[collection]['docs_per_second']} docs/s)")
+
+    users = generate_users(seed, users_per_country, password_hash, prefix, now)
+    restaurants, menu_items = generate_catalog(seed, restaurants_per_country, items_per_restaurant, prefix)
+    await timed("users", _batches(users, batch_size))
+    await timed("restaurants", _batches(restaurants, batch_size))
+    await timed("menu_items", _batches(menu_items, batch_size))
+
+    if orders and users and menu_items:
+        generator = OrderGenerator(seed, users, restaurants, menu_items, lines_per_order, now)
+        order_batches = (
+            generator.batch(index, min(batch_size, orders - start))
+            for index, start in enumerate(range(0, orders, batch_size))
+        )
+        await timed("orders", order_batches)
+
+    accounts: Dict[tuple, List[str]] = {}
+    for user in users:
+        accounts.setdefault((user["role"], user["country"]), []).append(user["username"])
+    return {"collections": report, "accounts": accounts}
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pathlib import Path
+    import os
+    import typer
+
+    load_dotenv(Path(__file__).parent / '.env')
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def main(
+        orders: int = typer.Option(1_000_000, help="Orders to generate"),
+        restaurants_per_country: int = typer.Option(1000),
+        items_per_restaurant: int = typer.Option(20),
+        users_per_country: int = typer.Option(2500),
+        lines_per_order: int = typer.Option(3),
+        seed: int = typer.Option(42, help="Same seed, volumes and --now give the same documents"),
+        now: Optional[datetime] = typer.Option(
+            None, help="UTC time the generated dates count back from (default: the current time)"
+        ),
+        password: str = typer.Option("synthetic123", help="Password shared by every synthetic user"),
+        prefix: str = typer.Option("synthetic", help="Username / name prefix for generated documents"),
+        batch_size: int = typer.Option(5000, help="Documents per insert_many"),
+        concurrency: int = typer.Option(4, help="insert_many batches in flight"),
+        drop: bool = typer.Option(False, help="Drop users, catalog, orders and rollups first"),
+        rollups: bool = typer.Option(True, help="Rebuild sales rollups afterwards"),
+    ):
+        """Seed the demo data, then insert a reproducible synthetic dataset."""
+        from database import seed_database
+        from indexes import ensure_indexes
+        from catalog import bump_catalog_version
+        from analytics import rebuild_rollups
+
+        async def run():
+            client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+            db = client[os.environ['DB_NAME']]
+            try:
+                if drop:
+                    for collection in ("users", "restaurants", "menu_items", "orders", "payment_methods", "sales_rollups"):
+                        await db[collection].drop()
+                await ensure_indexes(db)
+                await seed_database(db)
+
+                start = time.perf_counter()
+                result = await generate_dataset(
+                    db, restaurants_per_country, items_per_restaurant, users_per_country, orders, seed,
+                    password, lines_per_order, batch_size, concurrency, prefix,
+                    now.replace(tzinfo=timezone.utc) if now else None
+                )
+                elapsed = time.perf_counter() - start
+                await bump_catalog_version(db)
+                if rollups:
+                    await rebuild_rollups(db)
+            finally:
+                client.close()
+
+            total = 0
+            typer.echo(f"{'collection':<12} {'documents':>10} {'seconds':>9} {'docs/s':>10}")
+            for collection, row in result["collections"].items():
+                total += row["documents"]
+                typer.echo(f"{collection:<12} {row['documents']:>10} {row['seconds']:>9} {row['docs_per_second']:>10}")
+            typer.echo(f"{'total':<12} {total:>10} {elapsed:>9.2f} {total / elapsed:>10.1f}")
+
+        asyncio.run(run())
+
+    typer.run(main)
@@ -0,0 +1,61 @@
+from motor.motor_asyncio import AsyncIOMotorCursor
+from typing import AsyncIterator
+import csv
+import io
+import json
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# One CSV row per order line; order columns repeat on each of its lines
+CSV_COLUMNS = [
+    "order_id", "order_date", "user_id", "user_name", "country", "status",
+    "total_amount", "payment_method_id",
+    "item_id", "menu_item_id", "menu_item_name", "quantity", "price",
+]
+
+async def stream_ndjson(cursor: AsyncIOMotorCursor) -> AsyncIterator[bytes]:
+    """Yield one JSON document per line, one chunk per batch."""
+    lines = []
+    async for order in cursor:
+        lines.append(json.dumps(order, default=str, separators=(",", ":")))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+async def stream_csv(cursor: AsyncIOMotorCursor) -> AsyncIterator[bytes]:
+    """Yield a CSV header followed by order-line rows, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+
+    async for order in cursor:
+        order_columns = [
+            order["id"], order["order_date"], order["user_id"], order.get("user_name"),
+            order["country"], order["status"], order["total_amount"], order.get("payment_method_id"),
+        ]
+        for item in order.get("items") or [{}]:
+            writer.writerow(order_columns + [
+                item.get("id"), item.get("menu_item_id"), item.get("menu_item_name"),
+                item.get("quantity"), item.get("price"),
+            ])
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+EXPORT_WRITERS = {
+    "ndjson": stream_ndjson,
+    "csv": stream_csv,
+}
@@ -0,0 +1,59 @@
+from fastapi import Request, Response
+from typing import Optional
+import hashlib
+import os
+
+# Catalog responses are per-user (country scoped), so only the browser may cache them
+CATALOG_MAX_AGE = int(os.environ.get("CATALOG_MAX_AGE", 60))
+CATALOG_CACHE_CONTROL = f"private, max-age={CATALOG_MAX_AGE}, must-revalidate"
+# Appended to an ETag for each Content-Encoding of the same body
+ETAG_ENCODING_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+def make_etag(validator: str, *parts) -> str:
+    """Build a strong ETag from a catalog validator and the request's scope (country, id, page...)."""
+    scope = "|".join(str(part) for part in parts)
+    return f'"{validator}-{hashlib.sha1(scope.encode()).hexdigest()[:12]}"'
+
+def encoding_etag(etag: str, encoding: Optional[str]) -> str:
+    """The ETag of `etag`'s representation in Content-Encoding `encoding` (None for identity).
+
+    br, gzip and identity bodies differ byte for byte, so each needs its own
+    strong validator; a cache must not serve one in place of another.
+    """
+    if encoding is None or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}{ETAG_ENCODING_SUFFIXES[encoding]}"'
+
+def _strip_encoding(tag: str) -> str:
+    tag = tag.strip().removeprefix("W/")
+    for suffix in ETAG_ENCODING_SUFFIXES.values():
+        if tag.endswith(f'{suffix}"'):
+            return f'{tag[:-len(suffix) - 1]}"'
+    return tag
+
+def matched_etag(request: Request, etag: str) -> Optional[str]:
+    """The If-None-Match tag matching `etag` in any encoding, or None.
+
+    A 304 should carry the tag that matched, i.e. the encoding the client holds.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etag
+    # Weak comparison, as required for If-None-Match
+    for tag in if_none_match.split(","):
+        if _strip_encoding(tag) == etag.removeprefix("W/"):
+            return tag.strip()
+    return None
+
+def cache_headers(etag: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": CATALOG_CACHE_CONTROL,
+        "Vary": "Authorization, Accept-Encoding",
+    }
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the validator headers."""
+    return Response(status_code=304, headers=cache_headers(etag))
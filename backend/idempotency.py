@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_COLLECTION = "idempotency_keys"
+# How long a key is remembered (enforced by a TTL index on created_at)
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# How long a duplicate waits for the in-flight original before giving up
+IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", "10"))
+# In-flight claims older than this are treated as abandoned (e.g. the worker died)
+IDEMPOTENCY_LEASE_SECONDS = float(os.environ.get("IDEMPOTENCY_LEASE_SECONDS", "60"))
+IDEMPOTENCY_POLL_SECONDS = 0.05
+MAX_KEY_LENGTH = 255
+
+def fingerprint(payload: str) -> str:
+    """Hash of the request body, so a key cannot be reused for a different request."""
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class StoredResponse:
+    def __init__(self, status_code: int, body: bytes):
+        self.status_code = status_code
+        self.body = body
+
+class IdempotencyStore:
+    """Remembers responses by (user, Idempotency-Key) so retries replay them.
+
+    The first request for a key claims it with an insert (unique index on
+    user_id + key); duplicates wait for the claim to complete and then replay
+    the stored response. Waiters in this process are woken by an event; other
+    workers poll the claim document.
+    """
+
+    def __init__(self, wait_seconds: float = IDEMPOTENCY_WAIT_SECONDS):
+        self.wait_seconds = wait_seconds
+        self._in_flight: Dict[tuple, asyncio.Event] = {}
+        self.replays = 0
+        self.conflicts = 0
+
+    async def begin(self, db: AsyncIOMotorDatabase, user_id: str, key: str, request_hash: str) -> Optional[StoredResponse]:
+        """Claim `key`, or return the response already stored for it.
+
+        Returns None when the caller owns the key and must call complete() or abandon().
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters")
+
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                await db[IDEMPOTENCY_COLLECTION].insert_one({
+                    "user_id": user_id,
+                    "key": key,
+                    "request_hash": request_hash,
+                    "state": "in_flight",
+                    "created_at": datetime.now(timezone.utc)
+                })
+                self._in_flight[(user_id, key)] = asyncio.Event()
+                return None
+            except DuplicateKeyError:
+                pass
+
+            stored = await db[IDEMPOTENCY_COLLECTION].find_one({"user_id": user_id, "key": key}, {"_id": 0})
+            if stored is None:
+                # Abandoned (or expired) between our insert and read; try to claim it again
+                continue
+            if stored["request_hash"] != request_hash:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"{IDEMPOTENCY_HEADER} was already used with a different request"
+                )
+            if stored["state"] == "done":
+                self.replays += 1
+                return StoredResponse(stored["status_code"], stored["body"])
+            if self._expired(stored):
+                logger.warning(f"Reclaiming stale {IDEMPOTENCY_HEADER} claim for user {user_id}")
+                await db[IDEMPOTENCY_COLLECTION].delete_one(
+                    {"user_id": user_id, "key": key, "state": "in_flight", "created_at": stored["created_at"]}
+                )
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.conflicts += 1
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress"
+                )
+            event = self._in_flight.get((user_id, key))
+            try:
+                if event:
+                    await asyncio.wait_for(event.wait(), remaining)
+                else:
+                    await asyncio.sleep(min(IDEMPOTENCY_POLL_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    async def complete(self, db: AsyncIOMotorDatabase, user_id: str, key: str, status_code: int, body: bytes):
+        """Store the response for `key` and wake waiting duplicates."""
+        await db[IDEMPOTENCY_COLLECTION].update_one(
+            {"user_id": user_id, "key": key},
+            {"$set": {"state": "done", "status_code": status_code, "body": body}}
+        )
+        self._release(user_id, key)
+
+    async def abandon(self, db: AsyncIOMotorDatabase, user_id: str, key: str):
+        """Drop the claim after a failed request so a retry runs it again."""
+        try:
+            await db[IDEMPOTENCY_COLLECTION].delete_one({"user_id": user_id, "key": key, "state": "in_flight"})
+        finally:
+            self._release(user_id, key)
+
+    @staticmethod
+    def _expired(stored: dict) -> bool:
+        created_at = stored["created_at"]
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        age = (datetime.now(timezone.utc) - created_at).total_seconds()
+        return age > IDEMPOTENCY_LEASE_SECONDS
+
+    def _release(self, user_id: str, key: str):
+        event = self._in_flight.pop((user_id, key), None)
+        if event:
+            event.set()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "replays": self.replays,
+            "conflicts": self.conflicts,
+            "ttl_seconds": IDEMPOTENCY_TTL_SECONDS,
+        }
+
+idempotency = IdempotencyStore()
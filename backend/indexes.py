@@ -0,0 +1,140 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+import logging
+
+from idempotency import IDEMPOTENCY_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Index definitions per collection. create_indexes() is a no-op for indexes
+# that already exist with the same spec, so this is safe to run on every startup.
+INDEXES = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    ],
+    "restaurants": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("country", ASCENDING), ("id", ASCENDING)], name="country_id"),
+    ],
+    "menu_items": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("restaurant_id", ASCENDING)], name="restaurant_id"),
+    ],
+    "orders": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Keyset pagination sorts on (order_date, id) after the equality filter
+        IndexModel([("order_date", DESCENDING), ("id", DESCENDING)], name="order_date_id"),
+        IndexModel(
+            [("country", ASCENDING), ("order_date", DESCENDING), ("id", DESCENDING)],
+            name="country_order_date_id"
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("order_date", DESCENDING), ("id", DESCENDING)],
+            name="user_id_order_date_id"
+        ),
+    ],
+    "payment_methods": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("user_id", ASCENDING), ("id", ASCENDING)], name="user_id_id"),
+    ],
+    "idempotency_keys": [
+        IndexModel([("user_id", ASCENDING), ("key", ASCENDING)], name="user_id_key_unique", unique=True),
+        IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS),
+    ],
+    # Buckets are read and written by _id; drop each once it would be full again
+    "rate_limits": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    # Rollup upserts go through _id; these serve the dashboard's day-range reads
+    "sales_rollups": [
+        IndexModel([("day", ASCENDING)], name="day"),
+        IndexModel([("country", ASCENDING), ("day", ASCENDING)], name="country_day"),
+    ],
+}
+
+# Keyset filter that pagination.paginate adds for a cursor on (order_date, id) descending
+ORDER_KEYSET = {"$or": [{"order_date": {"$lt": "x"}}, {"order_date": "x", "id": {"$lt": "x"}}]}
+ORDER_SORT = {"order_date": -1, "id": -1}
+# GET /orders/export date range
+ORDER_DATES = {"$gte": "x", "$lt": "x"}
+
+# Every query shape issued by server.py as (collection, filter, sort).
+# Values are placeholders; only the shape matters to the query planner.
+QUERY_SHAPES = [
+    ("users", {"username": "x"}, None),
+    ("users", {"id": "x"}, None),
+    ("users", {}, {"id": 1}),
+    ("restaurants", {"id": "x"}, None),
+    ("restaurants", {"id": {"$in": ["x"]}}, None),
+    ("restaurants", {}, {"id": 1}),
+    ("restaurants", {"country": "x"}, {"id": 1}),
+    ("menu_items", {"id": "x"}, None),
+    ("menu_items", {"id": {"$in": ["x"]}}, None),
+    ("menu_items", {"restaurant_id": "x"}, None),
+    ("orders", {"id": "x"}, None),
+    ("orders", {"id": "x", "status": {"$in": ["x"]}, "country": "x"}, None),
+    # GET /orders and /orders/summary, per role scope, first and later pages
+    ("orders", {}, ORDER_SORT),
+    ("orders", {"country": "x"}, ORDER_SORT),
+    ("orders", {"user_id": "x"}, ORDER_SORT),
+    ("orders", {"$and": [{}, ORDER_KEYSET]}, ORDER_SORT),
+    ("orders", {"$and": [{"country": "x"}, ORDER_KEYSET]}, ORDER_SORT),
+    ("orders", {"$and": [{"user_id": "x"}, ORDER_KEYSET]}, ORDER_SORT),
+    # GET /orders/export, per role scope, with date range and status filters
+    ("orders", {"order_date": ORDER_DATES}, ORDER_SORT),
+    ("orders", {"status": "x"}, ORDER_SORT),
+    ("orders", {"order_date": ORDER_DATES, "status": "x"}, ORDER_SORT),
+    ("orders", {"country": "x", "order_date": ORDER_DATES}, ORDER_SORT),
+    ("orders", {"country": "x", "status": "x"}, ORDER_SORT),
+    ("orders", {"country": "x", "order_date": ORDER_DATES, "status": "x"}, ORDER_SORT),
+    ("orders", {"user_id": "x", "order_date": ORDER_DATES}, ORDER_SORT),
+    ("orders", {"user_id": "x", "status": "x"}, ORDER_SORT),
+    ("orders", {"user_id": "x", "order_date": ORDER_DATES, "status": "x"}, ORDER_SORT),
+    ("payment_methods", {"id": "x"}, None),
+    ("payment_methods", {"user_id": "x"}, {"id": 1}),
+    ("idempotency_keys", {"user_id": "x", "key": "x"}, None),
+    ("sales_rollups", {"day": {"$gte": "x", "$lte": "x"}}, None),
+    ("sales_rollups", {"country": "x", "day": {"$gte": "x", "$lte": "x"}}, None),
+]
+
+async def ensure_indexes(db: AsyncIOMotorDatabase):
+    """Create all declared indexes (idempotent)."""
+    for collection, indexes in INDEXES.items():
+        names = await db[collection].create_indexes(indexes)
+        logger.info(f"Ensured indexes on {collection}: {', '.join(names)}")
+
+def _plan_stages(plan) -> list:
+    """Collect every stage name in an explain plan tree."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+async def verify_indexes(db: AsyncIOMotorDatabase, strict: bool = False) -> list:
+    """Explain every query shape and report the ones that still scan a collection.
+
+    Returns the offending shapes. Raises RuntimeError when `strict` is set.
+    """
+    collscans = []
+    for collection, query, sort in QUERY_SHAPES:
+        find = {"find": collection, "filter": query}
+        if sort:
+            find["sort"] = sort
+        explain = await db.command("explain", find, verbosity="queryPlanner")
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in _plan_stages(winning_plan):
+            collscans.append((collection, query, sort))
+            logger.error(f"COLLSCAN on {collection} for filter={query} sort={sort}")
+
+    if collscans and strict:
+        raise RuntimeError(f"{len(collscans)} query shape(s) are not covered by an index")
+    if not collscans:
+        logger.info(f"All {len(QUERY_SHAPES)} query shapes are covered by indexes")
+    return collscans
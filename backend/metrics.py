@@ -0,0 +1,231 @@
+from pymongo import monitoring
+from typing import Dict, Iterable, List, Tuple
+import bisect
+import threading
+import time
+
+# Latency buckets in seconds, shared by HTTP and Mongo histograms
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        # Copied under the lock: pymongo listeners add series from driver threads
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in sorted(values):
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    def set(self, labels: tuple, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...], buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labels, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {count}")
+        return lines
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP responses by route and status", ("method", "route", "status")
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ("collection", "command")
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongo_command_failures_total", "Failed MongoDB commands", ("collection", "command")
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections", "Open connections in the MongoDB pool", ("address",)
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "mongo_pool_checked_out_connections", "Connections currently in use", ("address",)
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total", "Failed connection checkouts", ("address", "reason")
+)
+
+REGISTRY = [
+    HTTP_REQUEST_DURATION, HTTP_REQUESTS,
+    MONGO_COMMAND_DURATION, MONGO_COMMAND_FAILURES,
+    MONGO_POOL_CONNECTIONS, MONGO_POOL_CHECKED_OUT, MONGO_POOL_CHECKOUT_FAILURES,
+]
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency and status counts."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe((scope["method"], path), time.perf_counter() - start)
+            HTTP_REQUESTS.inc((scope["method"], path, str(status)))
+
+def _address(address) -> str:
+    return f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every MongoDB command by collection and command name."""
+
+    def __init__(self):
+        self._collections: Dict[tuple, str] = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.command.get("collection", "")
+        self._collections[(event.connection_id, event.request_id)] = collection or "-"
+
+    def succeeded(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_DURATION.observe((collection, event.command_name), event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_DURATION.observe((collection, event.command_name), event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.inc((collection, event.command_name))
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Tracks open and checked-out connections per server."""
+
+    def __init__(self):
+        self._open: Dict[str, int] = {}
+        self._checked_out: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _adjust(self, gauge: Gauge, counts: Dict[str, int], address, delta: int):
+        key = _address(address)
+        with self._lock:
+            counts[key] = max(counts.get(key, 0) + delta, 0)
+            gauge.set((key,), counts[key])
+
+    def connection_created(self, event):
+        self._adjust(MONGO_POOL_CONNECTIONS, self._open, event.address, 1)
+
+    def connection_closed(self, event):
+        self._adjust(MONGO_POOL_CONNECTIONS, self._open, event.address, -1)
+
+    def connection_checked_out(self, event):
+        self._adjust(MONGO_POOL_CHECKED_OUT, self._checked_out, event.address, 1)
+
+    def connection_checked_in(self, event):
+        self._adjust(MONGO_POOL_CHECKED_OUT, self._checked_out, event.address, -1)
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.inc((_address(event.address), str(event.reason)))
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+def render_stats(prefix: str, help: str, stats: dict) -> List[str]:
+    """Render the numeric values of a stats() dict as gauges named `<prefix>_<key>`."""
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines += [f"# HELP {name} {help}: {key}", f"# TYPE {name} gauge", f"{name} {value}"]
+    return lines
+
+def render_metrics(extra: Iterable[str] = ()) -> str:
+    """Prometheus text exposition of every registered metric plus `extra` lines."""
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    lines += list(extra)
+    return "\n".join(lines) + "\n"
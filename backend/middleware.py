@@ -1,11 +1,71 @@
-from fastapi import HTTPException, Header, Depends
+from fastapi import HTTPException, Header, Depends, Query
+from collections import OrderedDict
 from typing import Optional
-from auth import decode_access_token
+from auth import decode_access_token, decode_stream_ticket
 from models import UserRole, Country, User
+import hashlib
+import hmac
 import logging
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 10000))
+# Static bearer token for Prometheus scrapes of /api/metrics; unset means admin JWTs only
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+class TokenCache:
+    """Bounded LRU of verified JWT payloads.
+
+    Entries are keyed by a SHA-256 digest of the token, so raw tokens are
+    never retained, and expire at the token's own `exp` claim. Cached
+    payloads are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            payload, expires_at = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, token: str, payload: dict):
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        self._entries[self._key(token)] = (payload, expires_at)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
 async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
     """Validate JWT token and return current user."""
     if not authorization:
@@ -14,11 +74,16 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
     try:
         # Extract token from "Bearer <token>"
         token = authorization.split(" ")[1] if " " in authorization else authorization
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
+        
         payload = decode_access_token(token)
         
         if payload is None:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
         
+        token_cache.put(token, payload)
         return payload
     except IndexError:
         raise HTTPException(status_code=401, detail="Invalid authorization header format")
@@ -26,18 +91,44 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
         logger.error(f"Token validation error: {str(e)}")
         raise HTTPException(status_code=401, detail="Authentication failed")
 
+async def get_stream_user(
+    authorization: Optional[str] = Header(None),
+    token: Optional[str] = Query(None)
+) -> dict:
+    """Like get_current_user, but also accepts a stream ticket as ?token= (EventSource cannot send headers).
+
+    Only tickets from POST /api/orders/events/ticket are accepted in the query
+    string, so a full access token never ends up in URLs and access logs.
+    """
+    if authorization or not token:
+        return await get_current_user(authorization)
+    payload = decode_stream_ticket(token)
+    if payload is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    return payload
+
 def require_role(allowed_roles: list[UserRole]):
     """Dependency to check if user has required role."""
+    role_values = [role.value for role in allowed_roles]
+    allowed = frozenset(role_values)
+    detail = f"Access denied. Required roles: {role_values}"
+    
     async def role_checker(current_user: dict = Depends(get_current_user)) -> dict:
-        user_role = current_user.get("role")
-        if user_role not in [role.value for role in allowed_roles]:
-            raise HTTPException(
-                status_code=403, 
-                detail=f"Access denied. Required roles: {[role.value for role in allowed_roles]}"
-            )
+        if current_user.get("role") not in allowed:
+            raise HTTPException(status_code=403, detail=detail)
         return current_user
     return role_checker
 
+async def require_metrics_access(authorization: Optional[str] = Header(None)):
+    """Dependency for /api/metrics: the METRICS_TOKEN bearer token, or an admin's JWT."""
+    if METRICS_TOKEN and authorization and hmac.compare_digest(
+        authorization.encode(), f"Bearer {METRICS_TOKEN}".encode()
+    ):
+        return
+    current_user = await get_current_user(authorization)
+    if current_user.get("role") != UserRole.ADMIN.value:
+        raise HTTPException(status_code=403, detail="Access denied. Required roles: ['ADMIN']")
+
 def check_country_access(current_user: dict, resource_country: str) -> bool:
     """Check if user has access to resource based on country."""
     user_role = current_user.get("role")
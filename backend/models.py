@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import uuid
 from enum import Enum
@@ -78,12 +78,15 @@ class MenuItem(MenuItemBase):
 # Order Models
 class OrderItemCreate(BaseModel):
     menu_item_id: str
-    quantity: int
-    price: float
+    quantity: int = Field(..., ge=1)
+    # Ignored: orders are always charged the menu item's current price
+    price: Optional[float] = None
 
 class OrderItem(OrderItemCreate):
     id: str
+    price: float
     menu_item_name: Optional[str] = None
+    restaurant_id: Optional[str] = None
 
 class OrderCreate(BaseModel):
     items: List[OrderItemCreate]
@@ -100,6 +103,38 @@ class Order(BaseModel):
     country: Country
     items: List[OrderItem]
 
+class OrderSummary(BaseModel):
+    """Order without its line items, for list views."""
+    id: str
+    user_id: str
+    user_name: Optional[str] = None
+    order_date: datetime
+    total_amount: float
+    status: OrderStatus
+    payment_method_id: Optional[str] = None
+    country: Country
+    item_count: int
+
+class BulkOrderError(BaseModel):
+    status_code: int
+    detail: str
+
+class BulkOrderResult(BaseModel):
+    index: int
+    order: Optional[Order] = None
+    error: Optional[BulkOrderError] = None
+
+class BulkOrderResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkOrderResult]
+
+class SearchResults(BaseModel):
+    restaurants: List[Restaurant]
+    menu_items: List[MenuItem]
+    # A query word prefixed too many terms to search them all
+    truncated: bool = False
+
 # Payment Method Models
 class PaymentMethodBase(BaseModel):
     type: PaymentMethodType
@@ -115,11 +150,44 @@ class PaymentMethod(PaymentMethodBase):
     user_id: str
     created_at: datetime
 
+# Analytics Models
+class StatusSales(BaseModel):
+    orders: int
+    revenue: float
+
+class SalesTotals(BaseModel):
+    orders: int
+    revenue: float
+    status: Dict[OrderStatus, StatusSales]
+
+class CountrySales(SalesTotals):
+    country: Country
+
+class DailySales(SalesTotals):
+    day: str
+    country: Country
+
+class RestaurantSales(SalesTotals):
+    restaurant_id: str
+    restaurant_name: Optional[str] = None
+    country: Country
+
+class SalesAnalytics(BaseModel):
+    start_day: str
+    end_day: str
+    countries: List[CountrySales]
+    days: List[DailySales]
+    restaurants: List[RestaurantSales]
+
 # Response Models
 class LoginResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     user: User
 
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int
+
 class MessageResponse(BaseModel):
     message: str
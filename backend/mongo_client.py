@@ -0,0 +1,92 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+def _int_env(name: str):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+def client_options() -> dict:
+    """Motor client options from the environment; unset values keep the driver defaults."""
+    options = {
+        "maxPoolSize": _int_env("MONGO_MAX_POOL_SIZE"),
+        "minPoolSize": _int_env("MONGO_MIN_POOL_SIZE"),
+        "maxIdleTimeMS": _int_env("MONGO_MAX_IDLE_TIME_MS"),
+        "connectTimeoutMS": _int_env("MONGO_CONNECT_TIMEOUT_MS"),
+        "socketTimeoutMS": _int_env("MONGO_SOCKET_TIMEOUT_MS"),
+        "serverSelectionTimeoutMS": _int_env("MONGO_SERVER_SELECTION_TIMEOUT_MS"),
+        "waitQueueTimeoutMS": _int_env("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+    }
+    read_preference = os.environ.get("MONGO_READ_PREFERENCE")
+    if read_preference:
+        if read_preference not in READ_PREFERENCES:
+            raise ValueError(f"MONGO_READ_PREFERENCE must be one of {', '.join(READ_PREFERENCES)}")
+        options["read_preference"] = READ_PREFERENCES[read_preference]
+    return {name: value for name, value in options.items() if value is not None}
+
+class LazyMotorClient:
+    """AsyncIOMotorClient stand-in that connects on first use, per process.
+
+    Importing the app (e.g. in a supervisor before it starts workers) creates
+    no sockets or threads; each worker builds its own client and pool the
+    first time it touches the database.
+    """
+
+    def __init__(self, url: str, **options):
+        self.url = url
+        self.options = options
+        self._client = None
+        self._pid = None
+
+    @property
+    def client(self) -> AsyncIOMotorClient:
+        if self._client is None or self._pid != os.getpid():
+            self._client = AsyncIOMotorClient(self.url, **self.options)
+            self._pid = os.getpid()
+            logger.info(f"Created MongoDB client in process {self._pid}")
+        return self._client
+
+    def __getitem__(self, name: str) -> "LazyDatabase":
+        return LazyDatabase(self, name)
+
+    def __getattr__(self, name: str):
+        return getattr(self.client, name)
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+class LazyDatabase:
+    """Database handle that resolves against the current process's client."""
+
+    def __init__(self, client: LazyMotorClient, name: str):
+        self._lazy_client = client
+        self._database = None
+        self._bound_to = None
+        self.name = name
+
+    @property
+    def database(self):
+        client = self._lazy_client.client
+        if client is not self._bound_to:
+            self._database = client[self.name]
+            self._bound_to = client
+        return self._database
+
+    def __getitem__(self, collection: str):
+        return self.database[collection]
+
+    def __getattr__(self, name: str):
+        return getattr(self.database, name)
@@ -0,0 +1,165 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+from typing import AsyncIterator, Optional, Set
+import asyncio
+import itertools
+import logging
+import orjson
+import os
+
+from models import OrderSummary, UserRole
+
+logger = logging.getLogger(__name__)
+
+# "local": events published by this worker's own requests (single worker).
+# "changestream": events read from a change stream on orders, so every worker
+# sees changes made by the others (requires a replica set).
+ORDER_EVENTS_SOURCE = os.environ.get("ORDER_EVENTS_SOURCE", "local").lower()
+# Events buffered per subscriber before it is considered too slow and dropped
+ORDER_EVENTS_QUEUE_SIZE = int(os.environ.get("ORDER_EVENTS_QUEUE_SIZE", "100"))
+ORDER_EVENTS_HEARTBEAT_SECONDS = float(os.environ.get("ORDER_EVENTS_HEARTBEAT_SECONDS", "15"))
+ORDER_EVENTS_RETRY_MS = 3000
+
+EVENT_FIELDS = tuple(OrderSummary.model_fields)
+
+class Subscription:
+    """One connected client: its scope and a bounded event queue."""
+
+    def __init__(self, current_user: dict, queue_size: int):
+        self.role = current_user["role"]
+        self.country = current_user["country"]
+        self.user_id = current_user["user_id"]
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed_reason: Optional[str] = None
+
+    def can_see(self, order: dict) -> bool:
+        """Same visibility as GET /orders."""
+        if self.role == UserRole.ADMIN.value:
+            return True
+        if self.role == UserRole.MANAGER.value:
+            return order["country"] == self.country
+        return order["user_id"] == self.user_id
+
+    def close(self, reason: str):
+        """Discard pending events and leave `reason` as the last item."""
+        self.closed_reason = reason
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+class OrderEventHub:
+    """In-process fan-out of order events to SSE subscribers."""
+
+    def __init__(self, source: str = ORDER_EVENTS_SOURCE, queue_size: int = ORDER_EVENTS_QUEUE_SIZE):
+        self.source = source
+        self.queue_size = queue_size
+        self.subscribers: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+        self._watcher: Optional[asyncio.Task] = None
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, current_user: dict) -> Subscription:
+        subscription = Subscription(current_user, self.queue_size)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+
+    def order_changed(self, event_type: str, order: dict):
+        """Called by request handlers after writing an order."""
+        # With a change stream every write, ours included, arrives through the watcher
+        if self.source != "changestream":
+            self.publish(event_type, order)
+
+    def publish(self, event_type: str, order: dict):
+        summary = {field: order.get(field) for field in EVENT_FIELDS}
+        if summary["item_count"] is None and "items" in order:
+            summary["item_count"] = len(order["items"])
+        event = (next(self._ids), event_type, orjson.dumps(summary))
+        self.published += 1
+        for subscription in list(self.subscribers):
+            if not subscription.can_see(order):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Backpressure: a client that cannot keep up is cut off and
+                # reloads the list when it reconnects
+                self.dropped += 1
+                self.subscribers.discard(subscription)
+                subscription.close("slow consumer")
+
+    def close_all(self, reason: str = "server shutting down"):
+        for subscription in list(self.subscribers):
+            subscription.close(reason)
+        self.subscribers.clear()
+
+    async def stream(self, current_user: dict, heartbeat: float = ORDER_EVENTS_HEARTBEAT_SECONDS) -> AsyncIterator[bytes]:
+        """Server-Sent Events for `current_user`, with comment heartbeats while idle."""
+        # Subscribed only once the response starts, so the finally below always runs
+        subscription = self.subscribe(current_user)
+        try:
+            yield f"retry: {ORDER_EVENTS_RETRY_MS}\n\n".encode()
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": heartbeat\n\n"
+                    continue
+                if event is None:
+                    yield f"event: closed\ndata: {orjson.dumps(subscription.closed_reason).decode()}\n\n".encode()
+                    return
+                event_id, event_type, data = event
+                yield b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event_type.encode(), data)
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "source": self.source,
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+    # ---------- multi-worker source ----------
+
+    def start_watcher(self, db: AsyncIOMotorDatabase):
+        if self.source == "changestream":
+            self._watcher = asyncio.create_task(self._watch_orders(db))
+
+    async def stop_watcher(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    async def _watch_orders(self, db: AsyncIOMotorDatabase):
+        """Publish order inserts and status changes from a change stream (requires a replica set)."""
+        pipeline = [{"$match": {"$or": [
+            {"operationType": "insert"},
+            {"operationType": "update", "updateDescription.updatedFields.status": {"$exists": True}},
+        ]}}]
+        projection = {"$project": {"operationType": 1, **{f"fullDocument.{field}": 1 for field in EVENT_FIELDS}}}
+        resume_after = None
+        while True:
+            try:
+                async with db.orders.watch(
+                    pipeline + [projection], full_document="updateLookup", resume_after=resume_after
+                ) as stream:
+                    async for change in stream:
+                        resume_after = change["_id"]
+                        order = change.get("fullDocument")
+                        if order:
+                            event_type = "order.created" if change["operationType"] == "insert" else "order.status"
+                            self.publish(event_type, order)
+            except PyMongoError as e:
+                logger.warning(f"Order change stream failed, retrying: {str(e)}")
+                await asyncio.sleep(1)
+
+order_events = OrderEventHub()
@@ -0,0 +1,75 @@
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from typing import FrozenSet, NamedTuple
+import logging
+
+from models import Order, OrderStatus, UserRole
+from serialization import model_projection
+from analytics import record_status_change
+from order_events import order_events
+
+logger = logging.getLogger(__name__)
+
+class Transition(NamedTuple):
+    """A move to `target` that is only allowed from the `allowed_from` statuses."""
+    target: OrderStatus
+    allowed_from: FrozenSet[OrderStatus]
+    invalid_detail: str
+    forbidden_detail: str
+
+CHECKOUT = Transition(
+    target=OrderStatus.COMPLETED,
+    allowed_from=frozenset({OrderStatus.PENDING}),
+    invalid_detail="Order is not in pending status",
+    forbidden_detail="Cannot checkout orders from other countries"
+)
+CANCEL = Transition(
+    target=OrderStatus.CANCELLED,
+    allowed_from=frozenset({OrderStatus.PENDING, OrderStatus.COMPLETED}),
+    invalid_detail="Order is already cancelled",
+    forbidden_detail="Cannot cancel orders from other countries"
+)
+
+def transition_filter(order_id: str, transition: Transition, current_user: dict) -> dict:
+    """Filter matching the order only if the transition is allowed for this user."""
+    query = {"id": order_id, "status": {"$in": [status.value for status in transition.allowed_from]}}
+    # Managers may only move orders from their own country
+    if current_user["role"] == UserRole.MANAGER.value:
+        query["country"] = current_user["country"]
+    return query
+
+async def apply_transition(db: AsyncIOMotorDatabase, order_id: str, transition: Transition, current_user: dict) -> dict:
+    """Atomically move an order to `transition.target` and return the updated order.
+
+    The status precondition and country scope are part of the update filter, so
+    of several concurrent requests for the same order at most one matches. The
+    pre-update document is fetched so the sales rollups know the old status.
+    """
+    order = await db.orders.find_one_and_update(
+        transition_filter(order_id, transition, current_user),
+        {"$set": {"status": transition.target.value}},
+        projection=model_projection(Order),
+        return_document=ReturnDocument.BEFORE
+    )
+    if order is None:
+        await _raise_rejection(db, order_id, transition, current_user)
+
+    await record_status_change(db, order, order["status"], transition.target.value)
+    order["status"] = transition.target.value
+    order_events.order_changed("order.status", order)
+    return order
+
+async def _raise_rejection(db: AsyncIOMotorDatabase, order_id: str, transition: Transition, current_user: dict):
+    """Work out why the conditional update matched nothing (failure path only)."""
+    order = await db.orders.find_one({"id": order_id}, {"_id": 0, "status": 1, "country": 1})
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    if order["status"] not in {status.value for status in transition.allowed_from}:
+        # Also what losers of a race get: the winner already moved the order on
+        raise HTTPException(status_code=400, detail=transition.invalid_detail)
+    if current_user["role"] == UserRole.MANAGER.value and order["country"] != current_user["country"]:
+        raise HTTPException(status_code=403, detail=transition.forbidden_detail)
+    # The order changed between the update and this read; report it as a conflict
+    logger.warning(f"Order {order_id} changed while applying {transition.target.value}")
+    raise HTTPException(status_code=409, detail="Order was modified concurrently, please retry")
@@ -0,0 +1,80 @@
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import List, Optional, Tuple
+import base64
+import bisect
+import binascii
+import json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: list) -> str:
+    """Encode the sort-key values of the last document into an opaque cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Every sort key in this API is a string (ids, ISO timestamps); anything
+    # else, notably an object like {"$ne": null}, would be read as a query operator
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def _after(sort: List[Tuple[str, int]], values: list) -> dict:
+    """Build the keyset filter matching documents strictly after `values`.
+
+    For sort [(a, -1), (b, -1)] this is: a < va OR (a == va AND b < vb).
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+async def paginate(
+    collection: AsyncIOMotorCollection,
+    query: dict,
+    projection: dict,
+    sort: List[Tuple[str, int]],
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[list, Optional[str]]:
+    """Fetch one keyset page of `collection`.
+
+    `sort` must end with a unique field so the ordering is total, and should
+    be backed by an index prefixed with the equality fields of `query`.
+    Returns the documents and the cursor for the next page (None on the last page).
+    """
+    if cursor:
+        query = {"$and": [query, _after(sort, decode_cursor(cursor, len(sort)))]}
+
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor([docs[-1][field] for field, _ in sort])
+    return docs, next_cursor
+
+def paginate_sorted(docs: list, field: str, limit: int, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """Keyset-paginate an in-memory list already sorted ascending by the unique `field`."""
+    start = 0
+    if cursor:
+        after = decode_cursor(cursor, 1)[0]
+        start = bisect.bisect_right(docs, after, key=lambda doc: doc[field])
+
+    page = docs[start:start + limit]
+    next_cursor = None
+    if start + limit < len(docs):
+        next_cursor = encode_cursor([page[-1][field]])
+    return page, next_cursor
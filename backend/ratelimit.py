@@ -0,0 +1,179 @@
+"""Token-bucket rate limiting exposed as FastAPI dependencies.
+
+Each (rule, key) pair owns a bucket holding up to `capacity` tokens that
+refills continuously at capacity / period. A request takes one token; an
+empty bucket answers 429 with Retry-After set to when the next token
+arrives. Login and register are keyed by client IP (uvicorn resolves it from
+X-Forwarded-For for FORWARDED_ALLOW_IPS proxies), order creation by user id.
+A bulk order request takes one token from its own bucket, however many
+orders it carries; MAX_BULK_ORDERS bounds the batch.
+
+Buckets live in this process by default. RATE_LIMIT_BACKEND=mongo keeps
+them in the rate_limits collection instead, so every worker shares them.
+"""
+from collections import OrderedDict
+from fastapi import Depends, HTTPException, Request
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+import logging
+import math
+import os
+import time
+
+from middleware import get_current_user
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory").lower()  # memory | mongo
+# Buckets kept by the in-memory backend before the least recently used is evicted
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", "100000"))
+
+class RateRule(NamedTuple):
+    """`capacity` requests per `period` seconds, with bursts of up to `capacity`."""
+    name: str
+    capacity: int
+    period: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period
+
+def parse_rule(name: str, spec: str) -> Optional[RateRule]:
+    """RateRule from "<requests>/<seconds>" (e.g. "10/60"), or None for "off"."""
+    if spec.strip().lower() in ("", "off"):
+        return None
+    capacity, _, period = spec.partition("/")
+    return RateRule(name, int(capacity), float(period or 60))
+
+LOGIN_RATE_LIMIT = parse_rule("login", os.environ.get("RATE_LIMIT_LOGIN", "10/60"))
+REGISTER_RATE_LIMIT = parse_rule("register", os.environ.get("RATE_LIMIT_REGISTER", "5/600"))
+ORDER_RATE_LIMIT = parse_rule("orders", os.environ.get("RATE_LIMIT_ORDERS", "30/60"))
+BULK_ORDER_RATE_LIMIT = parse_rule("bulk_orders", os.environ.get("RATE_LIMIT_BULK_ORDERS", "10/60"))
+
+class MemoryBucketStore:
+    """Buckets in a bounded LRU, local to this process.
+
+    Evicting a bucket resets it to full, which only ever errs in the
+    client's favour; the least recently used keys are the ones most likely
+    to have refilled anyway.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.evicted = 0
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def take(self, key: str, rule: RateRule) -> float:
+        """Take one token; return 0 if granted, else seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (rule.capacity, now))
+        tokens = min(rule.capacity, tokens + (now - updated_at) * rule.refill_per_second)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rule.refill_per_second
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+        return retry_after
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets), "max_keys": self.max_keys, "evicted": self.evicted}
+
+class MongoBucketStore:
+    """Buckets shared by every worker, updated with one atomic upsert per request.
+
+    A TTL index drops each bucket once it would have refilled completely.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db.rate_limits
+
+    async def take(self, key: str, rule: RateRule) -> float:
+        now = time.time()
+        refilled = {"$min": [rule.capacity, {"$add": [
+            {"$ifNull": ["$tokens", rule.capacity]},
+            {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, rule.refill_per_second]},
+        ]}]}
+        bucket = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": now}},
+                {"$set": {"granted": {"$gte": ["$tokens", 1]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$granted", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "expires_at": datetime.fromtimestamp(now + rule.period, timezone.utc),
+                }},
+            ],
+            projection={"_id": 0, "tokens": 1, "granted": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if bucket["granted"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / rule.refill_per_second
+
+    def stats(self) -> dict:
+        return {}
+
+class RateLimiter:
+    """Checks requests against RateRules using a pluggable bucket store."""
+
+    def __init__(self, store, enabled: bool = RATE_LIMIT_ENABLED):
+        self.store = store
+        self.enabled = enabled
+        self.granted = 0
+        self.limited = 0
+        self.errors = 0
+
+    async def hit(self, rule: Optional[RateRule], key: str):
+        """Take a token for `key` under `rule`, raising 429 when none is left."""
+        if rule is None or not self.enabled:
+            return
+        try:
+            retry_after = await self.store.take(f"{rule.name}:{key}", rule)
+        except PyMongoError as e:
+            # Fail open: a limiter outage must not take logins and orders down with it
+            self.errors += 1
+            logger.warning(f"Rate limit check failed, allowing request: {str(e)}")
+            return
+        if retry_after <= 0:
+            self.granted += 1
+            return
+        self.limited += 1
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests, please retry later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+    def per_ip(self, rule: Optional[RateRule]):
+        """Dependency limiting `rule` per client IP."""
+        async def dependency(request: Request):
+            await self.hit(rule, request.client.host if request.client else "unknown")
+        return dependency
+
+    def per_user(self, rule: Optional[RateRule]):
+        """Dependency limiting `rule` per authenticated user."""
+        async def dependency(current_user: dict = Depends(get_current_user)):
+            await self.hit(rule, current_user["user_id"])
+        return dependency
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.store).__name__,
+            "granted": self.granted,
+            "limited": self.limited,
+            "errors": self.errors,
+            **self.store.stats(),
+        }
+
+rate_limiter = RateLimiter(MemoryBucketStore(RATE_LIMIT_MAX_KEYS))
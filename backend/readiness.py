@@ -0,0 +1,60 @@
+"""Startup progress for the /api/ready endpoint.
+
+The app starts serving as soon as the event loop is up; index creation,
+seeding and the first catalog load then run in the background and mark
+their step here when done, retrying failed steps until they succeed.
+/api/health only says the process is alive, /api/ready says whether it can
+serve real traffic.
+"""
+from typing import Dict, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+STARTUP_STEPS = ("indexes", "seed", "catalog")
+
+class Readiness:
+    """Which startup steps have finished, and the latest error while they have not."""
+
+    def __init__(self, steps=STARTUP_STEPS):
+        self.steps = steps
+        self.start()
+
+    def start(self):
+        """Forget earlier progress; called at the beginning of every startup."""
+        self.started = time.monotonic()
+        self.done: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.failures = 0
+
+    def mark(self, step: str):
+        if step not in self.done:
+            self.done[step] = round(time.monotonic() - self.started, 3)
+            logger.info(f"Startup step {step} done after {self.done[step]:.3f}s")
+        if self.ready:
+            self.error = None
+
+    def fail(self, step: str, error: Exception):
+        logger.error(f"Startup step {step} failed: {str(error)}")
+        self.failures += 1
+        self.error = f"{step}: {str(error)}"
+
+    @property
+    def ready(self) -> bool:
+        return all(step in self.done for step in self.steps)
+
+    @property
+    def ready_after(self) -> Optional[float]:
+        """Seconds from startup until the last step finished."""
+        return max(self.done.values()) if self.ready else None
+
+    def report(self) -> dict:
+        return {
+            **{step: step in self.done for step in self.steps},
+            "ready_after_seconds": self.ready_after,
+            "error": self.error,
+            "failures": self.failures,
+        }
+
+readiness = Readiness()
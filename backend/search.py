@@ -0,0 +1,314 @@
+"""In-process inverted index over restaurants and menu items.
+
+Built from the catalog snapshot at startup. Every reload then applies only
+the documents that were added, changed or removed, in the catalog's worker
+thread, to a copy of the previous index that shares its unchanged posting
+sets. The updated copy replaces the old index in a single assignment, so
+queries on the event loop never see a half-updated index. Queries never
+touch Mongo.
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+import logging
+import os
+import re
+import time
+import unicodedata
+
+from catalog import CatalogSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Query tokens shorter than this only match whole terms
+SEARCH_MIN_PREFIX = int(os.environ.get("SEARCH_MIN_PREFIX", "2"))
+# Index terms a single prefix may expand to ("ch" -> chicken, chili, chinese...)
+SEARCH_MAX_EXPANSIONS = int(os.environ.get("SEARCH_MAX_EXPANSIONS", "64"))
+
+TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase, accent-folded word tokens ("Crème Brûlée" -> ["creme", "brulee"])."""
+    if not text:
+        return []
+    if text.isascii():
+        return TOKEN_RE.findall(text.lower())
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return TOKEN_RE.findall("".join(c for c in folded if not unicodedata.combining(c)))
+
+class InvertedIndex:
+    """Term -> document postings, one map per field.
+
+    `fields` lists the indexed fields from most to least important; ranking
+    prefers matches in earlier fields and whole-term over prefix matches.
+    Changed with add() and remove(), then finish(); read-only afterwards,
+    so further changes go to a copy().
+    """
+
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+        self.postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in fields}
+        # Sorted distinct terms across all fields, for prefix lookups
+        self.vocabulary: List[str] = []
+        # Internal doc number -> (id, country, terms per field)
+        self._docs: Dict[int, Tuple[str, str, Dict[str, Set[str]]]] = {}
+        self._numbers: Dict[str, int] = {}
+        self._next_number = 0
+        self.countries: Dict[str, int] = {}
+        # Until finish(): posting sets this index may change in place (the
+        # others are shared with the index it was copied from), and terms
+        # that gained or lost a posting set
+        self._owned: Set[Tuple[str, str]] = set()
+        self._added_terms: Set[str] = set()
+        self._removed_terms: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def copy(self) -> "InvertedIndex":
+        """A copy to apply changes to, sharing posting sets until it changes them."""
+        index = InvertedIndex(self.fields)
+        index.postings = {field: dict(postings) for field, postings in self.postings.items()}
+        index.vocabulary = self.vocabulary
+        index._docs = dict(self._docs)
+        index._numbers = dict(self._numbers)
+        index._next_number = self._next_number
+        index.countries = dict(self.countries)
+        return index
+
+    def tokenize(self, values: Dict[str, Optional[str]]) -> Dict[str, Set[str]]:
+        return {field: set(tokenize(values.get(field))) for field in self.fields}
+
+    def add(self, doc_id: str, country: str, terms: Dict[str, Set[str]]):
+        """Index one document (each id at most once per index)."""
+        number = self._next_number
+        self._next_number += 1
+        for field, field_terms in terms.items():
+            for term in field_terms:
+                self._posting(field, term).add(number)
+        self._docs[number] = (doc_id, country, terms)
+        self._numbers[doc_id] = number
+        self.countries[country] = self.countries.get(country, 0) + 1
+
+    def remove(self, doc_id: str):
+        """Drop one document, if it is indexed."""
+        number = self._numbers.pop(doc_id, None)
+        if number is None:
+            return
+        _, country, terms = self._docs.pop(number)
+        for field, field_terms in terms.items():
+            for term in field_terms:
+                posting = self._posting(field, term)
+                posting.discard(number)
+                if not posting:
+                    del self.postings[field][term]
+                    self._owned.discard((field, term))
+                    self._removed_terms.add(term)
+        self.countries[country] -= 1
+        if not self.countries[country]:
+            del self.countries[country]
+
+    def _posting(self, field: str, term: str) -> Set[int]:
+        """The posting set of `term` in `field`, copied first if it is still shared."""
+        postings = self.postings[field]
+        if (field, term) not in self._owned:
+            shared = postings.get(term)
+            if shared is None:
+                self._added_terms.add(term)
+            postings[term] = set(shared) if shared else set()
+            self._owned.add((field, term))
+        return postings[term]
+
+    def _indexed(self, term: str) -> bool:
+        return any(term in postings for postings in self.postings.values())
+
+    def finish(self):
+        """Bring the prefix vocabulary up to date once every change is applied."""
+        if len(self._added_terms) + len(self._removed_terms) > len(self.vocabulary) // 8:
+            # First build, or too many changes for one by one insertion
+            self.vocabulary = sorted({term for postings in self.postings.values() for term in postings})
+        else:
+            vocabulary = list(self.vocabulary)
+            for term in self._removed_terms:
+                position = bisect_left(vocabulary, term)
+                if not self._indexed(term) and position < len(vocabulary) and vocabulary[position] == term:
+                    del vocabulary[position]
+            for term in self._added_terms:
+                position = bisect_left(vocabulary, term)
+                if self._indexed(term) and (position == len(vocabulary) or vocabulary[position] != term):
+                    vocabulary.insert(position, term)
+            self.vocabulary = vocabulary
+        self._owned = set()
+        self._added_terms = set()
+        self._removed_terms = set()
+
+    def expand(self, token: str) -> Tuple[List[str], bool]:
+        """Index terms starting with `token` (the token itself first), and whether some were cut off."""
+        if len(token) < SEARCH_MIN_PREFIX:
+            return [token], False
+        start = bisect_left(self.vocabulary, token)
+        terms = []
+        for term in self.vocabulary[start:start + SEARCH_MAX_EXPANSIONS + 1]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        truncated = len(terms) > SEARCH_MAX_EXPANSIONS
+        return terms[:SEARCH_MAX_EXPANSIONS], truncated
+
+    def _matches(self, terms: List[str], fields: Tuple[str, ...]) -> List[Set[int]]:
+        return [
+            self.postings[field][term]
+            for field in fields for term in terms
+            if term in self.postings[field]
+        ]
+
+    def search(self, tokens: List[str], allowed: Callable[[str], bool], limit: int) -> Tuple[List[str], bool]:
+        """Ids of up to `limit` documents containing every token (as a whole term or prefix).
+
+        Results come in tiers: all tokens in the first field as whole terms,
+        then as prefixes, then the same over the first two fields, and so on.
+        Each tier is scanned lazily from its rarest token and stops once
+        `limit` results are found, so broad queries stay cheap. Order within
+        a tier is unspecified.
+
+        Also returns whether prefix tiers were searched with a truncated
+        expansion, in which case some prefix matches may be missing.
+        """
+        if not tokens or limit <= 0:
+            return [], False
+        countries = {country for country in self.countries if allowed(country)}
+        if not countries:
+            return [], False
+        check_country = len(countries) < len(self.countries)
+        expanded = [self.expand(token) for token in tokens]
+        expansions = [terms for terms, _ in expanded]
+        truncated = any(cut for _, cut in expanded)
+
+        results: List[str] = []
+        seen: Set[int] = set()
+        searched_prefixes = False
+        for depth in range(1, len(self.fields) + 1):
+            fields = self.fields[:depth]
+            for prefix in (False, True):
+                searched_prefixes = searched_prefixes or prefix
+                terms = expansions if prefix else [[token] for token in tokens]
+                groups = sorted(
+                    (self._matches(token_terms, fields) for token_terms in terms),
+                    key=lambda sets: sum(len(s) for s in sets)
+                )
+                for number in self._candidates(groups):
+                    if number in seen:
+                        continue
+                    doc_id, country, _ = self._docs[number]
+                    if check_country and country not in countries:
+                        continue
+                    seen.add(number)
+                    results.append(doc_id)
+                    if len(results) == limit:
+                        return results, truncated and searched_prefixes
+        return results, truncated
+
+    @staticmethod
+    def _candidates(groups: List[List[Set[int]]]) -> Iterator[int]:
+        """Documents in at least one set of every group, scanning the smallest group."""
+        if not groups or not groups[0]:
+            return
+        rarest, rest = groups[0], groups[1:]
+        for postings in rarest:
+            for number in postings:
+                if all(any(number in s for s in group) for group in rest):
+                    yield number
+
+class CatalogSearch:
+    """Search over restaurants (name, cuisine) and menu items (name, category, description)."""
+
+    RESTAURANT_FIELDS = ("name", "cuisine_type")
+    ITEM_FIELDS = ("name", "category", "description")
+
+    def __init__(self):
+        # (restaurants, menu items), replaced as a pair by update()
+        self.indexes = (InvertedIndex(self.RESTAURANT_FIELDS), InvertedIndex(self.ITEM_FIELDS))
+        # The snapshot the indexes reflect, to find what a reload changed
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self.version: Optional[int] = None
+        self.updates = 0
+        self.queries = 0
+
+    def update(self, snapshot: CatalogSnapshot):
+        """Catalog listener: apply what changed since the last snapshot to a copy of the index.
+
+        The first snapshot is indexed in full. Runs in the catalog's worker
+        thread (loads are serialized, so never twice at once) while queries
+        keep using the previous index.
+        """
+        start = time.perf_counter()
+        previous_restaurants, previous_items = self.indexes
+        old_restaurants = self._snapshot.restaurants if self._snapshot else {}
+        old_items = self._snapshot.menu_items if self._snapshot else {}
+        restaurants = previous_restaurants.copy()
+        menu_items = previous_items.copy()
+        changed = 0
+
+        for restaurant_id in old_restaurants.keys() - snapshot.restaurants.keys():
+            restaurants.remove(restaurant_id)
+            changed += 1
+        for restaurant_id, restaurant in snapshot.restaurants.items():
+            if old_restaurants.get(restaurant_id) != restaurant:
+                restaurants.remove(restaurant_id)
+                restaurants.add(restaurant_id, restaurant["country"], restaurants.tokenize(restaurant))
+                changed += 1
+
+        for item_id in old_items.keys() - snapshot.menu_items.keys():
+            menu_items.remove(item_id)
+            changed += 1
+        for item_id, item in snapshot.menu_items.items():
+            restaurant = snapshot.restaurants.get(item["restaurant_id"])
+            # An item's country comes from its restaurant, so a moved restaurant re-indexes its menu
+            country = restaurant["country"] if restaurant else None
+            old_item = old_items.get(item_id)
+            old_restaurant = old_restaurants.get(old_item["restaurant_id"]) if old_item else None
+            old_country = old_restaurant["country"] if old_restaurant else None
+            if old_item == item and old_country == country:
+                continue
+            menu_items.remove(item_id)
+            # Orphaned items stay out: their country (and so who may see them) is unknown
+            if country is not None:
+                menu_items.add(item_id, country, menu_items.tokenize(item))
+            changed += 1
+
+        restaurants.finish()
+        menu_items.finish()
+
+        self.indexes = (restaurants, menu_items)
+        self._snapshot = snapshot
+        self.version = snapshot.version
+        self.updates += 1
+        logger.info(
+            f"Search index at catalog v{snapshot.version}: {changed} documents re-indexed "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+
+    def search(self, query: str, allowed: Callable[[str], bool], limit: int) -> Tuple[List[str], List[str], bool]:
+        """(restaurant ids, menu item ids, truncated) matching `query` in countries where `allowed` is true.
+
+        `truncated` is true when a query word is the prefix of more than
+        SEARCH_MAX_EXPANSIONS terms and only the first of them were searched.
+        """
+        self.queries += 1
+        tokens = list(dict.fromkeys(tokenize(query)))
+        restaurants, menu_items = self.indexes
+        restaurant_ids, restaurants_truncated = restaurants.search(tokens, allowed, limit)
+        item_ids, items_truncated = menu_items.search(tokens, allowed, limit)
+        return restaurant_ids, item_ids, restaurants_truncated or items_truncated
+
+    def stats(self) -> dict:
+        restaurants, menu_items = self.indexes
+        return {
+            "version": self.version,
+            "restaurants": len(restaurants),
+            "menu_items": len(menu_items),
+            "terms": len(restaurants.vocabulary) + len(menu_items.vocabulary),
+            "updates": self.updates,
+            "queries": self.queries,
+        }
+
+search_index = CatalogSearch()
@@ -0,0 +1,19 @@
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from typing import Any, Dict, Optional, Type
+
+def model_projection(model: Type[BaseModel]) -> dict:
+    """Mongo projection returning exactly the fields of `model` (and no _id)."""
+    projection = {field: 1 for field in model.model_fields}
+    projection["_id"] = 0
+    return projection
+
+def trusted_response(content: Any, headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    """Serialize documents read from our own DB straight to JSON.
+
+    Documents written by this API already match their response models, so
+    skipping Pydantic validation is safe as long as they were read with
+    model_projection(). Routes keep their `response_model` for the OpenAPI
+    schema; FastAPI does not re-validate a returned Response.
+    """
+    return ORJSONResponse(content, headers=headers)
@@ -0,0 +1,35 @@
+"""Production entry point: one uvicorn worker process per core.
+
+Run from the backend directory:
+    python serve.py
+    WEB_CONCURRENCY=8 PORT=8001 python serve.py
+
+Each worker imports server.py on its own and creates its MongoDB client on
+first use, so no connection pool is shared across processes. On SIGTERM /
+SIGINT workers stop accepting connections and drain in-flight requests for
+up to GRACEFUL_SHUTDOWN_SECONDS before the app's shutdown handlers run.
+"""
+from dotenv import load_dotenv
+from pathlib import Path
+import os
+import uvicorn
+
+load_dotenv(Path(__file__).parent / '.env')
+
+def main():
+    workers = int(os.environ.get("WEB_CONCURRENCY") or os.cpu_count() or 1)
+    uvicorn.run(
+        "server:app",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8001")),
+        workers=workers,
+        timeout_graceful_shutdown=int(os.environ.get("GRACEFUL_SHUTDOWN_SECONDS", "30")),
+        timeout_keep_alive=int(os.environ.get("KEEP_ALIVE_SECONDS", "5")),
+        proxy_headers=True,
+        forwarded_allow_ips=os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        access_log=os.environ.get("ACCESS_LOG", "false").lower() == "true",
+        app_dir=str(Path(__file__).parent),
+    )
+
+if __name__ == "__main__":
+    main()
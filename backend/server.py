@@ -1,33 +1,74 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Request, Response, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
+import asyncio
 import os
 import logging
 from pathlib import Path
-from typing import List, Optional
-from datetime import datetime, timezone
+from typing import List, Literal, Optional
+from datetime import date, datetime, timedelta, timezone
 import uuid
 
 # Import local modules
 from models import (
-    UserCreate, UserLogin, User, LoginResponse, MessageResponse,
-    Restaurant, MenuItem, Order, OrderCreate, OrderItem, OrderStatus,
-    PaymentMethod, PaymentMethodCreate, UserRole, Country
+    UserCreate, UserLogin, User, LoginResponse, StreamTicket, MessageResponse,
+    Restaurant, MenuItem, Order, OrderCreate, OrderItem, OrderStatus, OrderSummary,
+    PaymentMethod, PaymentMethodCreate, UserRole, Country, SalesAnalytics,
+    BulkOrderResponse, SearchResults
 )
-from auth import hash_password, verify_password, create_access_token
-from middleware import get_current_user, require_role, check_country_access
-from database import seed_database
+from auth import (
+    hash_password_async, verify_password_async, create_access_token, create_stream_ticket,
+    STREAM_TICKET_EXPIRE_SECONDS,
+    password_pool, PasswordPoolBusy, PASSWORD_POOL_RETRY_AFTER
+)
+from middleware import (
+    get_current_user, get_stream_user, require_role, require_metrics_access, check_country_access, token_cache
+)
+from database import seed_database_once, seeding_done
+from mongo_client import LazyMotorClient, client_options
+from indexes import ensure_indexes, verify_indexes
+from readiness import readiness
+from catalog import catalog
+from search import search_index
+from pricing import price_table
+from ratelimit import (
+    rate_limiter, MongoBucketStore, RATE_LIMIT_BACKEND,
+    LOGIN_RATE_LIMIT, REGISTER_RATE_LIMIT, ORDER_RATE_LIMIT, BULK_ORDER_RATE_LIMIT
+)
+from analytics import record_order, record_orders, sales_summary
+from order_states import apply_transition, CHECKOUT, CANCEL
+from idempotency import idempotency, fingerprint, IDEMPOTENCY_HEADER
+from order_events import order_events
+from write_batcher import order_inserts
+from exports import EXPORT_BATCH_SIZE, EXPORT_MEDIA_TYPES, EXPORT_WRITERS
+from serialization import model_projection, trusted_response
+from metrics import (
+    MetricsMiddleware, MongoCommandListener, MongoPoolListener, render_metrics, render_stats
+)
+from http_cache import make_etag, matched_etag, cache_headers, not_modified
+from compression import CompressionMiddleware, precompressed_response
+from pagination import paginate, paginate_sorted, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection (created lazily in each worker process, see mongo_client.py)
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = LazyMotorClient(
+    mongo_url, event_listeners=[MongoCommandListener(), MongoPoolListener()], **client_options()
+)
 db = client[os.environ['DB_NAME']]
 
+# STARTUP_SEED: "background" (serve at once, /api/ready turns 200 when done),
+# "blocking" (seed before serving) or "off" (run `python database.py seed` instead)
+STARTUP_SEED = os.environ.get('STARTUP_SEED', 'background').lower()
+READY_PING_TIMEOUT = float(os.environ.get('READY_PING_TIMEOUT', '2'))
+# Background startup retries a failed step after this many seconds, doubling up to the maximum
+BOOTSTRAP_RETRY_SECONDS = float(os.environ.get('BOOTSTRAP_RETRY_SECONDS', '1'))
+BOOTSTRAP_RETRY_MAX_SECONDS = float(os.environ.get('BOOTSTRAP_RETRY_MAX_SECONDS', '60'))
+
 # Create the main app without a prefix
 app = FastAPI(title="Food Ordering API")
 
@@ -41,9 +82,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.exception_handler(PasswordPoolBusy)
+async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusy):
+    """Shed load when the password hashing pool is saturated."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(PASSWORD_POOL_RETRY_AFTER)}
+    )
+
+def require_indexes():
+    """Dependency: 503 until the unique indexes exist.
+
+    Background startup serves requests before ensure_indexes() has run;
+    writes that rely on a unique index (usernames, idempotency keys) wait
+    for it rather than risk duplicates.
+    """
+    if "indexes" not in readiness.done:
+        raise HTTPException(status_code=503, detail="Starting up, please retry", headers={"Retry-After": "1"})
+
 # ==================== AUTH ENDPOINTS ====================
 
-@api_router.post("/auth/register", response_model=User)
+@api_router.post(
+    "/auth/register", response_model=User,
+    dependencies=[Depends(rate_limiter.per_ip(REGISTER_RATE_LIMIT)), Depends(require_indexes)]
+)
 async def register(user_data: UserCreate):
     """Register a new user."""
     # Check if username exists
@@ -54,19 +117,23 @@ async def register(user_data: UserCreate):
     # Create user
     user_dict = user_data.model_dump(exclude={"password"})
     user_dict["id"] = str(uuid.uuid4())
-    user_dict["password_hash"] = hash_password(user_data.password)
+    user_dict["password_hash"] = await hash_password_async(user_data.password)
     user_dict["created_at"] = datetime.now(timezone.utc).isoformat()
     
     await db.users.insert_one(user_dict)
     
     return User(**{k: v for k, v in user_dict.items() if k != "password_hash"})
 
-@api_router.post("/auth/login", response_model=LoginResponse)
+# Limited before the user lookup and bcrypt verify, the most expensive work we do
+@api_router.post(
+    "/auth/login", response_model=LoginResponse,
+    dependencies=[Depends(rate_limiter.per_ip(LOGIN_RATE_LIMIT))]
+)
 async def login(credentials: UserLogin):
     """Login user and return JWT token."""
     user = await db.users.find_one({"username": credentials.username})
     
-    if not user or not verify_password(credentials.password, user["password_hash"]):
+    if not user or not await verify_password_async(credentials.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid username or password")
     
     # Create access token
@@ -97,29 +164,57 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
 # ==================== USER ENDPOINTS ====================
 
 @api_router.get("/users", response_model=List[User])
-async def get_users(current_user: dict = Depends(require_role([UserRole.ADMIN]))):
-    """Get all users (Admin only)."""
-    users = await db.users.find({}, {"_id": 0, "password_hash": 0}).to_list(1000)
-    return [User(**user) for user in users]
+async def get_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(require_role([UserRole.ADMIN]))
+):
+    """Get all users (Admin only), one page at a time."""
+    users, next_cursor = await paginate(
+        db.users, {}, model_projection(User), [("id", 1)], limit, cursor
+    )
+    return trusted_response(users, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
 # ==================== RESTAURANT ENDPOINTS ====================
 
 @api_router.get("/restaurants", response_model=List[Restaurant])
-async def get_restaurants(current_user: dict = Depends(get_current_user)):
-    """Get all restaurants (filtered by country for non-admin)."""
-    query = {}
+async def get_restaurants(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get all restaurants (filtered by country for non-admin), one page at a time."""
+    country = None
     
     # Apply country filter for non-admin users
     if current_user["role"] != UserRole.ADMIN.value:
-        query["country"] = current_user["country"]
+        country = current_user["country"]
+    
+    snapshot = await catalog.get(db)
+    restaurants, next_cursor = paginate_sorted(
+        snapshot.list_restaurants(country), "id", limit, cursor
+    )
     
-    restaurants = await db.restaurants.find(query, {"_id": 0}).to_list(1000)
-    return [Restaurant(**restaurant) for restaurant in restaurants]
+    etag = make_etag(snapshot.validator, "restaurants", country or "*", limit, cursor)
+    headers = cache_headers(etag)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    matched = matched_etag(request, etag)
+    if matched:
+        return Response(status_code=304, headers={**headers, "ETag": matched})
+    
+    return precompressed_response(request, snapshot.encoded_bodies, etag, restaurants, headers)
 
 @api_router.get("/restaurants/{restaurant_id}", response_model=Restaurant)
-async def get_restaurant(restaurant_id: str, current_user: dict = Depends(get_current_user)):
+async def get_restaurant(
+    restaurant_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
     """Get a specific restaurant."""
-    restaurant = await db.restaurants.find_one({"id": restaurant_id}, {"_id": 0})
+    snapshot = await catalog.get(db)
+    restaurant = snapshot.restaurants.get(restaurant_id)
     
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
@@ -128,37 +223,93 @@ async def get_restaurant(restaurant_id: str, current_user: dict = Depends(get_cu
     if not check_country_access(current_user, restaurant["country"]):
         raise HTTPException(status_code=403, detail="Access denied to this restaurant")
     
-    return Restaurant(**restaurant)
+    etag = make_etag(snapshot.validator, "restaurant", restaurant_id)
+    matched = matched_etag(request, etag)
+    if matched:
+        return not_modified(matched)
+    
+    return precompressed_response(request, snapshot.encoded_bodies, etag, restaurant, cache_headers(etag))
 
 @api_router.get("/restaurants/{restaurant_id}/menu", response_model=List[MenuItem])
-async def get_restaurant_menu(restaurant_id: str, current_user: dict = Depends(get_current_user)):
+async def get_restaurant_menu(
+    restaurant_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
     """Get menu items for a restaurant."""
+    snapshot = await catalog.get(db)
+    
     # First verify restaurant access
-    restaurant = await db.restaurants.find_one({"id": restaurant_id}, {"_id": 0})
+    restaurant = snapshot.restaurants.get(restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
     
     if not check_country_access(current_user, restaurant["country"]):
         raise HTTPException(status_code=403, detail="Access denied to this restaurant")
     
-    menu_items = await db.menu_items.find(
-        {"restaurant_id": restaurant_id}, 
-        {"_id": 0}
-    ).to_list(1000)
+    etag = make_etag(snapshot.validator, "menu", restaurant_id)
+    matched = matched_etag(request, etag)
+    if matched:
+        return not_modified(matched)
     
-    return [MenuItem(**item) for item in menu_items]
+    return precompressed_response(
+        request, snapshot.encoded_bodies, etag, snapshot.menus.get(restaurant_id, []), cache_headers(etag)
+    )
+
+# ==================== SEARCH ENDPOINTS ====================
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+# Built when startup loads the catalog, then rebuilt in the background on every reload
+catalog.subscribe(search_index.update)
+
+@api_router.get("/search", response_model=SearchResults)
+async def search_catalog(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT),
+    current_user: dict = Depends(get_current_user)
+):
+    """Search restaurants and menu items the user can access (prefix match on every word)."""
+    snapshot = await catalog.get(db)
+    restaurant_ids, item_ids, truncated = search_index.search(
+        q, lambda country: check_country_access(current_user, country), limit
+    )
+    return trusted_response({
+        "restaurants": [snapshot.restaurants[i] for i in restaurant_ids if i in snapshot.restaurants],
+        "menu_items": [snapshot.menu_items[i] for i in item_ids if i in snapshot.menu_items],
+        "truncated": truncated,
+    })
 
 # ==================== ORDER ENDPOINTS ====================
 
-@api_router.post("/orders", response_model=Order)
-async def create_order(order_data: OrderCreate, current_user: dict = Depends(get_current_user)):
-    """Create a new order (All roles can create orders)."""
-    # Validate menu items and calculate total
-    total_amount = 0
+MAX_BULK_ORDERS = int(os.environ.get("MAX_BULK_ORDERS", "500"))
+
+# Menu prices in cents, rebuilt with every catalog snapshot
+catalog.subscribe(price_table.update)
+
+async def resolve_order_catalog(orders: List[OrderCreate]) -> tuple:
+    """Fetch every menu item and restaurant referenced by `orders` in one pass.
+
+    Served from the catalog cache; ids missing from it fall back to one $in
+    query per collection.
+    """
+    menu_item_ids = list({item.menu_item_id for order_data in orders for item in order_data.items})
+    menu_items = await catalog.get_menu_items(db, menu_item_ids)
+    restaurant_ids = list({menu_item["restaurant_id"] for menu_item in menu_items.values()})
+    restaurants = await catalog.get_restaurants(db, restaurant_ids)
+    return menu_items, restaurants
+
+def build_order(order_data: OrderCreate, current_user: dict, menu_items: dict, restaurants: dict) -> dict:
+    """Validate `order_data` against the resolved catalog and return the order document.
+
+    Lines are charged the menu price, whatever price the client sent.
+    """
+    # Validate menu items
     order_items = []
     
     for item in order_data.items:
-        menu_item = await db.menu_items.find_one({"id": item.menu_item_id}, {"_id": 0})
+        menu_item = menu_items.get(item.menu_item_id)
         if not menu_item:
             raise HTTPException(status_code=404, detail=f"Menu item {item.menu_item_id} not found")
         
@@ -166,7 +317,9 @@ async def create_order(order_data: OrderCreate, current_user: dict = Depends(get
             raise HTTPException(status_code=400, detail=f"{menu_item['name']} is not available")
         
         # Check restaurant country access
-        restaurant = await db.restaurants.find_one({"id": menu_item["restaurant_id"]}, {"_id": 0})
+        restaurant = restaurants.get(menu_item["restaurant_id"])
+        if not restaurant:
+            raise HTTPException(status_code=404, detail="Restaurant not found")
         if not check_country_access(current_user, restaurant["country"]):
             raise HTTPException(status_code=403, detail="Cannot order from restaurants outside your country")
         
@@ -174,14 +327,16 @@ async def create_order(order_data: OrderCreate, current_user: dict = Depends(get
             "id": str(uuid.uuid4()),
             "menu_item_id": item.menu_item_id,
             "menu_item_name": menu_item["name"],
-            "quantity": item.quantity,
-            "price": item.price
+            "restaurant_id": menu_item["restaurant_id"],
+            "quantity": item.quantity
         }
         order_items.append(order_item)
-        total_amount += item.price * item.quantity
     
-    # Create order
-    order = {
+    unit_prices, total_amount = price_table.price_lines(order_data.items, menu_items)
+    for order_item, price in zip(order_items, unit_prices):
+        order_item["price"] = price
+    
+    return {
         "id": str(uuid.uuid4()),
         "user_id": current_user["user_id"],
         "user_name": current_user["username"],
@@ -190,35 +345,213 @@ async def create_order(order_data: OrderCreate, current_user: dict = Depends(get
         "status": OrderStatus.PENDING.value,
         "payment_method_id": order_data.payment_method_id,
         "country": current_user["country"],
-        "items": order_items
+        "items": order_items,
+        # Denormalized so summary listings can skip the items array
+        "item_count": len(order_items)
     }
-    
-    await db.orders.insert_one(order)
-    
-    return Order(**{k: v for k, v in order.items() if k != "_id"})
 
-@api_router.get("/orders", response_model=List[Order])
-async def get_orders(current_user: dict = Depends(get_current_user)):
-    """Get all orders (filtered by country for non-admin)."""
-    query = {}
-    
+@api_router.post(
+    "/orders", response_model=Order,
+    dependencies=[Depends(rate_limiter.per_user(ORDER_RATE_LIMIT))]
+)
+async def create_order(
+    order_data: OrderCreate,
+    current_user: dict = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
+):
+    """Create a new order (All roles can create orders).
+
+    With an Idempotency-Key header, retries of the same request replay the
+    first response instead of creating another order.
+    """
+    if idempotency_key is not None:
+        require_indexes()
+        stored = await idempotency.begin(
+            db, current_user["user_id"], idempotency_key, fingerprint(order_data.model_dump_json())
+        )
+        if stored:
+            return Response(
+                content=stored.body,
+                status_code=stored.status_code,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"}
+            )
+    
+    try:
+        menu_items, restaurants = await resolve_order_catalog([order_data])
+        order = build_order(order_data, current_user, menu_items, restaurants)
+        
+        await order_inserts.insert_one(db.orders, order)
+        order.pop("_id", None)
+        await record_order(db, order)
+        order_events.order_changed("order.created", order)
+    except BaseException:
+        if idempotency_key is not None:
+            await idempotency.abandon(db, current_user["user_id"], idempotency_key)
+        raise
+    
+    response = trusted_response(order)
+    if idempotency_key is not None:
+        await idempotency.complete(db, current_user["user_id"], idempotency_key, response.status_code, response.body)
+    return response
+
+@api_router.post(
+    "/orders/bulk", response_model=BulkOrderResponse,
+    dependencies=[Depends(rate_limiter.per_user(BULK_ORDER_RATE_LIMIT))]
+)
+async def create_orders_bulk(orders: List[OrderCreate], current_user: dict = Depends(get_current_user)):
+    """Create many orders in one request (All roles).
+
+    Each order is validated like POST /orders; valid ones are written with a
+    single unordered insert_many. Results are reported per order, in request order.
+    """
+    if not orders:
+        raise HTTPException(status_code=400, detail="No orders submitted")
+    if len(orders) > MAX_BULK_ORDERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ORDERS} orders per request")
+    
+    menu_items, restaurants = await resolve_order_catalog(orders)
+    
+    results = []
+    documents = []
+    for index, order_data in enumerate(orders):
+        try:
+            order = build_order(order_data, current_user, menu_items, restaurants)
+        except HTTPException as e:
+            results.append({"index": index, "order": None, "error": {"status_code": e.status_code, "detail": e.detail}})
+            continue
+        results.append({"index": index, "order": order, "error": None})
+        documents.append(order)
+    
+    failed_writes = set()
+    if documents:
+        try:
+            await db.orders.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed_writes = {error["index"] for error in e.details.get("writeErrors", [])}
+            logger.error(f"Bulk order insert: {len(failed_writes)} of {len(documents)} writes failed")
+    
+    inserted = []
+    position = 0
+    for result in results:
+        if result["order"] is None:
+            continue
+        order = result["order"]
+        order.pop("_id", None)
+        if position in failed_writes:
+            result["order"] = None
+            result["error"] = {"status_code": 500, "detail": "Failed to store order"}
+        else:
+            inserted.append(order)
+        position += 1
+    
+    if inserted:
+        await record_orders(db, inserted)
+        for order in inserted:
+            order_events.order_changed("order.created", order)
+    
+    return trusted_response({
+        "created": len(inserted),
+        "failed": len(results) - len(inserted),
+        "results": results
+    })
+
+def order_scope_query(current_user: dict) -> dict:
+    """Mongo filter limiting orders to what the current user may see."""
     # Admin sees all orders
     if current_user["role"] == UserRole.ADMIN.value:
-        pass
+        return {}
     # Manager sees orders from their country
-    elif current_user["role"] == UserRole.MANAGER.value:
-        query["country"] = current_user["country"]
+    if current_user["role"] == UserRole.MANAGER.value:
+        return {"country": current_user["country"]}
     # Member sees only their own orders
-    else:
-        query["user_id"] = current_user["user_id"]
+    return {"user_id": current_user["user_id"]}
+
+def to_utc_iso(value: datetime) -> str:
+    """Format a datetime like stored order dates (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+@api_router.get("/orders", response_model=List[Order])
+async def get_orders(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get all orders (filtered by country for non-admin), newest first, one page at a time."""
+    query = order_scope_query(current_user)
+    
+    orders, next_cursor = await paginate(
+        db.orders, query, model_projection(Order), [("order_date", -1), ("id", -1)], limit, cursor
+    )
+    return trusted_response(orders, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+@api_router.get("/orders/summary", response_model=List[OrderSummary])
+async def get_order_summaries(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Like GET /orders, but without line items (use GET /orders/{order_id} for those)."""
+    query = order_scope_query(current_user)
     
-    orders = await db.orders.find(query, {"_id": 0}).sort("order_date", -1).to_list(1000)
-    return [Order(**order) for order in orders]
+    orders, next_cursor = await paginate(
+        db.orders, query, model_projection(OrderSummary), [("order_date", -1), ("id", -1)], limit, cursor
+    )
+    return trusted_response(orders, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+@api_router.post("/orders/events/ticket", response_model=StreamTicket)
+async def create_order_event_ticket(current_user: dict = Depends(get_current_user)):
+    """Short-lived ticket to pass as ?token= to GET /orders/events."""
+    return StreamTicket(ticket=create_stream_ticket(current_user), expires_in=STREAM_TICKET_EXPIRE_SECONDS)
+
+@api_router.get("/orders/events")
+async def order_event_stream(current_user: dict = Depends(get_stream_user)):
+    """Server-Sent Events for order creation and status changes the user may see.
+
+    Accepts a stream ticket as ?token= since browsers' EventSource cannot send headers.
+    """
+    return StreamingResponse(
+        order_events.stream(current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/orders/export")
+async def export_orders(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[OrderStatus] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream orders as NDJSON or CSV (filtered like GET /orders), newest first."""
+    query = order_scope_query(current_user)
+    
+    # order_date is stored as a UTC ISO-8601 string, so range bounds compare lexically
+    date_range = {}
+    if start:
+        date_range["$gte"] = to_utc_iso(start)
+    if end:
+        date_range["$lt"] = to_utc_iso(end)
+    if date_range:
+        query["order_date"] = date_range
+    if status:
+        query["status"] = status.value
+    
+    cursor = db.orders.find(query, {"_id": 0}).sort([("order_date", -1), ("id", -1)]).batch_size(EXPORT_BATCH_SIZE)
+    
+    return StreamingResponse(
+        EXPORT_WRITERS[format](cursor),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'}
+    )
 
 @api_router.get("/orders/{order_id}", response_model=Order)
 async def get_order(order_id: str, current_user: dict = Depends(get_current_user)):
     """Get a specific order."""
-    order = await db.orders.find_one({"id": order_id}, {"_id": 0})
+    order = await db.orders.find_one({"id": order_id}, model_projection(Order))
     
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
@@ -230,7 +563,7 @@ async def get_order(order_id: str, current_user: dict = Depends(get_current_user
     if current_user["role"] == UserRole.MANAGER.value and order["country"] != current_user["country"]:
         raise HTTPException(status_code=403, detail="Access denied to this order")
     
-    return Order(**order)
+    return trusted_response(order)
 
 @api_router.post("/orders/{order_id}/checkout", response_model=Order)
 async def checkout_order(
@@ -238,26 +571,8 @@ async def checkout_order(
     current_user: dict = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
 ):
     """Checkout and pay for order (Admin and Manager only)."""
-    order = await db.orders.find_one({"id": order_id}, {"_id": 0})
-    
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    
-    if order["status"] != OrderStatus.PENDING.value:
-        raise HTTPException(status_code=400, detail="Order is not in pending status")
-    
-    # Check country access for manager
-    if current_user["role"] == UserRole.MANAGER.value and order["country"] != current_user["country"]:
-        raise HTTPException(status_code=403, detail="Cannot checkout orders from other countries")
-    
-    # Update order status
-    await db.orders.update_one(
-        {"id": order_id},
-        {"$set": {"status": OrderStatus.COMPLETED.value}}
-    )
-    
-    order["status"] = OrderStatus.COMPLETED.value
-    return Order(**order)
+    order = await apply_transition(db, order_id, CHECKOUT, current_user)
+    return trusted_response(order)
 
 @api_router.put("/orders/{order_id}/cancel", response_model=Order)
 async def cancel_order(
@@ -265,38 +580,28 @@ async def cancel_order(
     current_user: dict = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
 ):
     """Cancel an order (Admin and Manager only)."""
-    order = await db.orders.find_one({"id": order_id}, {"_id": 0})
-    
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    
-    if order["status"] == OrderStatus.CANCELLED.value:
-        raise HTTPException(status_code=400, detail="Order is already cancelled")
-    
-    # Check country access for manager
-    if current_user["role"] == UserRole.MANAGER.value and order["country"] != current_user["country"]:
-        raise HTTPException(status_code=403, detail="Cannot cancel orders from other countries")
-    
-    # Update order status
-    await db.orders.update_one(
-        {"id": order_id},
-        {"$set": {"status": OrderStatus.CANCELLED.value}}
-    )
-    
-    order["status"] = OrderStatus.CANCELLED.value
-    return Order(**order)
+    order = await apply_transition(db, order_id, CANCEL, current_user)
+    return trusted_response(order)
 
 # ==================== PAYMENT METHOD ENDPOINTS ====================
 
 @api_router.get("/payment-methods", response_model=List[PaymentMethod])
-async def get_payment_methods(current_user: dict = Depends(get_current_user)):
-    """Get payment methods for current user."""
-    payment_methods = await db.payment_methods.find(
-        {"user_id": current_user["user_id"]}, 
-        {"_id": 0}
-    ).to_list(1000)
+async def get_payment_methods(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get payment methods for current user, one page at a time."""
+    payment_methods, next_cursor = await paginate(
+        db.payment_methods,
+        {"user_id": current_user["user_id"]},
+        model_projection(PaymentMethod),
+        [("id", 1)],
+        limit,
+        cursor
+    )
     
-    return [PaymentMethod(**pm) for pm in payment_methods]
+    return trusted_response(payment_methods, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
 @api_router.post("/payment-methods", response_model=PaymentMethod)
 async def create_payment_method(
@@ -359,6 +664,63 @@ async def delete_payment_method(
     
     return MessageResponse(message="Payment method deleted successfully")
 
+# ==================== ANALYTICS ENDPOINTS ====================
+
+ANALYTICS_DEFAULT_DAYS = 30
+
+@api_router.get("/analytics/sales", response_model=SalesAnalytics)
+async def sales_analytics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: dict = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
+):
+    """Revenue, order counts and status breakdown per country, day and restaurant.
+
+    Served from the sales_rollups collection; defaults to the last 30 days (UTC).
+    Managers only see their own country.
+    """
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    
+    country = current_user["country"] if current_user["role"] == UserRole.MANAGER.value else None
+    snapshot = await catalog.get(db)
+    summary = await sales_summary(db, start.isoformat(), end.isoformat(), country, snapshot.restaurants)
+    return trusted_response(summary)
+
+# ==================== METRICS ENDPOINTS ====================
+
+@api_router.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_metrics_access)])
+async def prometheus_metrics():
+    """Prometheus text exposition of request, Mongo, pool and cache metrics (METRICS_TOKEN or Admin)."""
+    return render_metrics(
+        render_stats("password_pool", "Password hashing pool", password_pool.stats())
+        + render_stats("catalog_cache", "Catalog cache", catalog.stats())
+        + render_stats("token_cache", "Verified-token cache", token_cache.stats())
+        + render_stats("idempotency", "Idempotency-Key store", idempotency.stats())
+        + render_stats("order_events", "Order event streams", order_events.stats())
+        + render_stats("search_index", "Catalog search index", search_index.stats())
+        + render_stats("rate_limit", "Rate limiter", rate_limiter.stats())
+        + render_stats("write_batch", "Order insert batcher", order_inserts.stats())
+        + render_stats("price_table", "Menu price table", price_table.stats())
+    )
+
+@api_router.get("/metrics/password-pool")
+async def password_pool_metrics(current_user: dict = Depends(require_role([UserRole.ADMIN]))):
+    """Password hashing pool size and queue depth (Admin only)."""
+    return password_pool.stats()
+
+@api_router.get("/metrics/catalog-cache")
+async def catalog_cache_metrics(current_user: dict = Depends(require_role([UserRole.ADMIN]))):
+    """Catalog cache hit/miss counters (Admin only)."""
+    return catalog.stats()
+
+@api_router.get("/metrics/token-cache")
+async def token_cache_metrics(current_user: dict = Depends(require_role([UserRole.ADMIN]))):
+    """Verified-token cache hit/miss counters (Admin only)."""
+    return token_cache.stats()
+
 # ==================== ROOT ENDPOINTS ====================
 
 @api_router.get("/")
@@ -367,8 +729,29 @@ async def root():
 
 @api_router.get("/health")
 async def health_check():
+    """Liveness: the process is up. Never touches the database."""
     return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
 
+@api_router.get("/ready")
+async def readiness_check():
+    """Readiness: Mongo answers and indexes, seed data and catalog are in place."""
+    report = readiness.report()
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), READY_PING_TIMEOUT)
+        report["mongo"] = True
+    except Exception as e:
+        report["mongo"] = False
+        report["error"] = report["error"] or f"mongo: {str(e) or type(e).__name__}"
+    if report["mongo"] and not report["seed"] and STARTUP_SEED == "off" and await seeding_done(db):
+        # Seeded out of band by the CLI since startup
+        readiness.mark("seed")
+        report = {**readiness.report(), "mongo": True}
+    ready = report["mongo"] and readiness.ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "starting", **report}
+    )
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -378,16 +761,88 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Idempotent-Replayed", "Retry-After"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so recorded latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
+
+bootstrap_task: Optional[asyncio.Task] = None
+
+async def bootstrap():
+    """Indexes, seed data and the first catalog load, each marked in readiness when done.
+
+    Steps already marked are skipped, so a retry resumes at the one that failed.
+    """
+    step = "indexes"
+    try:
+        if step not in readiness.done:
+            await ensure_indexes(db)
+            # INDEX_SELF_CHECK: "off", "warn" (log COLLSCANs) or "strict" (never become ready)
+            index_check = os.environ.get('INDEX_SELF_CHECK', 'warn').lower()
+            if index_check != 'off':
+                await verify_indexes(db, strict=index_check == 'strict')
+            readiness.mark("indexes")
+
+        step = "seed"
+        if step in readiness.done:
+            pass
+        elif STARTUP_SEED != "off":
+            await seed_database_once(db)
+            readiness.mark("seed")
+        elif await seeding_done(db):
+            readiness.mark("seed")
+        else:
+            logger.warning("STARTUP_SEED=off and the database is not seeded; run: python database.py seed")
+
+        step = "catalog"
+        if step not in readiness.done:
+            await catalog.load(db)
+            readiness.mark("catalog")
+    except Exception as e:
+        readiness.fail(step, e)
+        raise
+
+async def bootstrap_in_background():
+    """Run bootstrap() until it succeeds, e.g. once Mongo is reachable again."""
+    delay = BOOTSTRAP_RETRY_SECONDS
+    while True:
+        try:
+            await bootstrap()
+            return
+        except Exception:
+            # Recorded in readiness and reported by /api/ready meanwhile
+            logger.info(f"Retrying startup in {delay:g}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BOOTSTRAP_RETRY_MAX_SECONDS)
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
+    global bootstrap_task
     logger.info("Starting up application...")
-    await seed_database(db)
+    readiness.start()
+    if STARTUP_SEED == "blocking":
+        await bootstrap()
+    else:
+        bootstrap_task = asyncio.create_task(bootstrap_in_background())
+    if RATE_LIMIT_BACKEND == "mongo":
+        rate_limiter.store = MongoBucketStore(db)
+    catalog.start_watcher(db)
+    order_events.start_watcher(db)
     logger.info("Application startup complete!")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     logger.info("Shutting down application...")
+    if bootstrap_task is not None and not bootstrap_task.done():
+        bootstrap_task.cancel()
+        await asyncio.gather(bootstrap_task, return_exceptions=True)
+    await catalog.stop_watcher()
+    order_events.close_all()
+    await order_events.stop_watcher()
+    await order_inserts.drain()
     client.close()
+    password_pool.shutdown()
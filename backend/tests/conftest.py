@@ -0,0 +1,78 @@
+"""Shared pytest fixtures: the app running in-process against mongomock.
+
+Run from the backend directory: python -m pytest -q
+"""
+from pathlib import Path
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("MONGO_URL", "mongodb://127.0.0.1:1")
+os.environ.setdefault("DB_NAME", "tests")
+# mongomock implements neither explain nor change streams
+os.environ["INDEX_SELF_CHECK"] = "off"
+os.environ["CATALOG_WATCH"] = "off"
+os.environ.setdefault("STARTUP_SEED", "blocking")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from benchmarks.mongo import CommandCounter, CountingDatabase
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def counter() -> CommandCounter:
+    return CommandCounter()
+
+@pytest.fixture
+async def app(counter):
+    """server.app started against a fresh, seeded mongomock database."""
+    from mongomock_motor import AsyncMongoMockClient
+    from catalog import catalog
+    from ratelimit import MemoryBucketStore, RATE_LIMIT_MAX_KEYS, rate_limiter
+    import server
+
+    client = AsyncMongoMockClient()
+    server.client = client
+    server.db = CountingDatabase(client[os.environ["DB_NAME"]], counter)
+    # Module-level caches outlive a test; start each one from an empty database
+    catalog.snapshot = None
+    rate_limiter.store = MemoryBucketStore(RATE_LIMIT_MAX_KEYS)
+
+    await server.app.router.startup()
+    try:
+        yield server.app
+    finally:
+        await server.app.router.shutdown()
+
+@pytest.fixture
+async def api(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+async def login(api: httpx.AsyncClient, username: str, password: str) -> dict:
+    """Authorization headers for a seeded account."""
+    response = await api.post("/api/auth/login", json={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def menu_item_ids(api: httpx.AsyncClient, headers: dict) -> list:
+    """Available menu item ids across the caller's restaurants."""
+    ids = []
+    for restaurant in (await api.get("/api/restaurants", headers=headers)).json():
+        menu = (await api.get(f"/api/restaurants/{restaurant['id']}/menu", headers=headers)).json()
+        ids += [item["id"] for item in menu if item["is_available"]]
+    return ids
+
+async def place_order(api: httpx.AsyncClient, headers: dict, lines: int = 1) -> dict:
+    """Create an order of `lines` lines from the caller's menus and return it."""
+    ids = await menu_item_ids(api, headers)
+    payload = {"items": [{"menu_item_id": ids[i % len(ids)], "quantity": 1 + i % 3} for i in range(lines)]}
+    response = await api.post("/api/orders", json=payload, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,108 @@
+import os
+import shutil
+
+import httpx
+import pytest
+
+from analytics import ALL_RESTAURANTS, ROLLUP_COLLECTION, rebuild_rollups
+from tests.conftest import login, place_order
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def mongod_app(counter):
+    """server.app started against a temporary mongod, for what mongomock cannot run."""
+    from benchmarks.mongo import CountingDatabase, mongo_backend
+    from catalog import catalog
+    import server
+
+    if not shutil.which("mongod"):
+        pytest.skip("mongod not on PATH; rebuild_rollups needs a real server")
+    async with mongo_backend("mongod") as client:
+        server.client = client
+        server.db = CountingDatabase(client[os.environ["DB_NAME"]], counter)
+        catalog.snapshot = None
+        await server.app.router.startup()
+        try:
+            yield server.app
+        finally:
+            await server.app.router.shutdown()
+
+async def rollups(db) -> dict:
+    """Non-empty rollup documents as {_id: (orders, revenue)}."""
+    return {
+        doc["_id"]: (doc["orders"], round(doc["revenue"], 2))
+        async for doc in db[ROLLUP_COLLECTION].find({"orders": {"$ne": 0}})
+    }
+
+async def recount(db) -> dict:
+    """The rollups worked out directly from the orders collection."""
+    expected = {}
+
+    def add(key: str, revenue: float):
+        orders, total = expected.get(key, (0, 0.0))
+        expected[key] = (orders + 1, total + revenue)
+
+    async for order in db.orders.find({}, {"_id": 0}):
+        prefix = f"{order['country']}|{order['order_date'][:10]}"
+        add(f"{prefix}|{ALL_RESTAURANTS}|{order['status']}", order["total_amount"])
+        per_restaurant = {}
+        for item in order["items"]:
+            per_restaurant[item["restaurant_id"]] = (
+                per_restaurant.get(item["restaurant_id"], 0) + item["price"] * item["quantity"]
+            )
+        for restaurant_id, revenue in per_restaurant.items():
+            add(f"{prefix}|{restaurant_id}|{order['status']}", revenue)
+    return {key: (orders, round(revenue, 2)) for key, (orders, revenue) in expected.items()}
+
+async def place_and_move_orders(api: httpx.AsyncClient):
+    """Creates (single and bulk) in both countries, then checkouts and cancels."""
+    admin = await login(api, "nickfury", "admin123")
+    managers = {
+        "INDIA": await login(api, "captainmarvel", "manager123"),
+        "AMERICA": await login(api, "captainamerica", "manager123"),
+    }
+
+    placed = []
+    for username in ("thanos", "travis"):
+        member = await login(api, username, "member123")
+        placed += [await place_order(api, member, lines=lines) for lines in (1, 2, 3)]
+        repeats = [{"items": order["items"]} for order in placed[-2:]]
+        bulk = await api.post("/api/orders/bulk", json=repeats, headers=member)
+        assert bulk.status_code == 200, bulk.text
+        placed += [result["order"] for result in bulk.json()["results"]]
+
+    for order in placed[::2]:
+        response = await api.post(f"/api/orders/{order['id']}/checkout", headers=managers[order["country"]])
+        assert response.status_code == 200, response.text
+    # A completed and a pending order per country
+    for order in placed[:2] + placed[5:7]:
+        response = await api.put(f"/api/orders/{order['id']}/cancel", headers=admin)
+        assert response.status_code == 200, response.text
+
+async def test_incremental_rollups_match_orders(app, api):
+    import server
+
+    await place_and_move_orders(api)
+
+    expected = await recount(server.db)
+    assert {key.rsplit("|", 1)[1] for key in expected} == {"PENDING", "COMPLETED", "CANCELLED"}
+    assert await rollups(server.db) == expected
+
+    # GET /analytics/sales totals come from the same rollups
+    response = await api.get("/api/analytics/sales", headers=await login(api, "nickfury", "admin123"))
+    assert response.status_code == 200
+    totals = {row["country"]: (row["orders"], row["revenue"]) for row in response.json()["countries"]}
+    for country in ("INDIA", "AMERICA"):
+        whole = [value for key, value in expected.items() if key.startswith(f"{country}|") and f"|{ALL_RESTAURANTS}|" in key]
+        assert totals[country] == (sum(orders for orders, _ in whole), round(sum(revenue for _, revenue in whole), 2))
+
+async def test_incremental_rollups_match_rebuild(mongod_app):
+    import server
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=mongod_app), base_url="http://test") as api:
+        await place_and_move_orders(api)
+
+    incremental = await rollups(server.db)
+    assert await rebuild_rollups(server.db) > 0
+    assert await rollups(server.db) == incremental
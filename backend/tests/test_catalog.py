@@ -0,0 +1,71 @@
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+import pytest
+
+from catalog import CatalogCache, bump_catalog_version
+from pagination import encode_cursor
+from tests.conftest import login
+
+pytestmark = pytest.mark.anyio
+
+def restaurant(restaurant_id: str) -> dict:
+    return {"id": restaurant_id, "name": restaurant_id, "cuisine": "Test", "country": "India", "rating": 4.0}
+
+async def test_stale_snapshot_is_served_while_reloading():
+    db = AsyncMongoMockClient()["catalog"]
+    await db.restaurants.insert_one(restaurant("r1"))
+    cache = CatalogCache(ttl_seconds=60)
+    first = await cache.get(db)
+
+    await db.restaurants.insert_one(restaurant("r2"))
+    await bump_catalog_version(db)
+    cache.invalidate()
+
+    # The read does not wait for the reload
+    assert await cache.get(db) is first
+    assert cache.stats()["stale_hits"] == 1
+    await cache._refresh
+
+    fresh = await cache.get(db)
+    assert sorted(fresh.restaurants) == ["r1", "r2"]
+    assert (cache.reloads, cache.misses) == (2, 1)
+
+async def test_concurrent_stale_reads_start_one_reload():
+    db = AsyncMongoMockClient()["catalog"]
+    await db.restaurants.insert_one(restaurant("r1"))
+    cache = CatalogCache(ttl_seconds=60)
+    await cache.get(db)
+    cache.invalidate()
+
+    await asyncio.gather(*(cache.get(db) for _ in range(20)))
+    await cache._refresh
+    assert cache.reloads == 2
+
+async def test_restaurant_cursor_of_wrong_type_is_rejected(api):
+    headers = await login(api, "nickfury", "admin123")
+    for values in ([1], [None], [{"a": 1}], [["r1"]]):
+        response = await api.get("/api/restaurants", params={"cursor": encode_cursor(values)}, headers=headers)
+        assert response.status_code == 400, values
+
+async def test_failing_listener_does_not_retrigger_reloads(caplog):
+    db = AsyncMongoMockClient()["catalog"]
+    await db.restaurants.insert_one(restaurant("r1"))
+    cache = CatalogCache(ttl_seconds=60)
+    first = await cache.get(db)
+
+    def broken_listener(snapshot):
+        if snapshot is not first:
+            raise ValueError("listener bug")
+
+    cache.subscribe(broken_listener)
+    cache.invalidate()
+    assert await cache.get(db) is first
+    await cache._refresh
+
+    assert cache.stats()["failed_reloads"] == 1
+    assert "listener bug" in caplog.text
+    # Re-armed: later reads are hits until the retry pause is over
+    assert await cache.get(db) is first
+    assert cache._refresh.done() and cache.stats()["failed_reloads"] == 1
+    assert cache.stats()["stale_hits"] == 1
@@ -0,0 +1,20 @@
+import pytest
+
+from tests.conftest import login, menu_item_ids
+
+pytestmark = pytest.mark.anyio
+
+async def test_mongo_commands_per_order_do_not_grow_with_lines(api, counter):
+    headers = await login(api, "travis", "member123")
+    ids = await menu_item_ids(api, headers)
+
+    commands = {}
+    for lines in (1, 10, 100):
+        payload = {"items": [{"menu_item_id": ids[i % len(ids)], "quantity": 1} for i in range(lines)]}
+        counter.reset()
+        response = await api.post("/api/orders", json=payload, headers=headers)
+        assert response.status_code == 200, response.text
+        assert len(response.json()["items"]) == lines
+        commands[lines] = sum(sum(c.values()) for c in counter.by_endpoint.values())
+
+    assert commands[1] == commands[10] == commands[100], commands
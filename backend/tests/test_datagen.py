@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+from datagen import OrderGenerator, generate_catalog, generate_users
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def dataset(seed: int, now: datetime) -> tuple:
+    users = generate_users(seed, 20, "hash", "test", now)
+    restaurants, menu_items = generate_catalog(seed, 5, 10, "test")
+    orders = OrderGenerator(seed, users, restaurants, menu_items, 3, now).batch(0, 200)
+    return users, restaurants, menu_items, orders
+
+def test_same_seed_and_now_give_the_same_documents():
+    assert dataset(7, NOW) == dataset(7, NOW)
+
+def test_dates_count_back_from_now():
+    users, _, _, orders = dataset(7, NOW)
+    assert {user["created_at"] for user in users} == {NOW.isoformat()}
+    assert all(order["order_date"] <= NOW.isoformat() for order in orders)
+    assert dataset(7, datetime(2026, 1, 1, tzinfo=timezone.utc))[3] != orders
+
+def test_seed_changes_the_documents():
+    assert dataset(7, NOW)[3] != dataset(8, NOW)[3]
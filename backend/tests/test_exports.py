@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+import pytest
+
+from exports import CSV_COLUMNS
+from tests.conftest import login, place_order
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def orders(api):
+    """Orders by an American member, an Indian member and an Indian manager."""
+    placed = {}
+    for username, password in (("travis", "member123"), ("thanos", "member123"), ("captainmarvel", "manager123")):
+        headers = await login(api, username, password)
+        placed[username] = [await place_order(api, headers, lines) for lines in (1, 3)]
+    return placed
+
+async def export(api, username: str, password: str, format: str):
+    headers = await login(api, username, password)
+    response = await api.get("/api/orders/export", params={"format": format}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+async def test_ndjson_is_one_order_per_line_newest_first(api, orders):
+    response = await export(api, "nickfury", "admin123", "ndjson")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+
+    placed = [order for user_orders in orders.values() for order in user_orders]
+    assert sorted(order["id"] for order in exported) == sorted(order["id"] for order in placed)
+    assert [order["order_date"] for order in exported] == sorted((o["order_date"] for o in exported), reverse=True)
+    assert all("_id" not in order and order["items"] for order in exported)
+
+async def test_csv_has_one_row_per_order_line(api, orders):
+    response = await export(api, "travis", "member123", "csv")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+
+    assert rows[0] == CSV_COLUMNS
+    assert len(rows) - 1 == sum(len(order["items"]) for order in orders["travis"])
+    assert all(len(row) == len(CSV_COLUMNS) for row in rows)
+    assert {row[0] for row in rows[1:]} == {order["id"] for order in orders["travis"]}
+
+async def test_exports_are_scoped_like_order_listing(api, orders):
+    member = await export(api, "thanos", "member123", "ndjson")
+    assert {json.loads(line)["id"] for line in member.text.splitlines()} == {o["id"] for o in orders["thanos"]}
+
+    # An Indian manager sees every Indian order and no American ones
+    manager = await export(api, "captainmarvel", "manager123", "ndjson")
+    expected = {o["id"] for o in orders["thanos"] + orders["captainmarvel"]}
+    assert {json.loads(line)["id"] for line in manager.text.splitlines()} == expected
@@ -0,0 +1,51 @@
+import pytest
+
+from catalog import CatalogSnapshot, bump_catalog_version, catalog
+from tests.conftest import login
+
+pytestmark = pytest.mark.anyio
+
+def test_validator_follows_version_and_epoch():
+    restaurants = [{"id": "r1", "country": "India"}]
+    assert CatalogSnapshot(restaurants, [], 3, "aaaa1111bbbb").validator == "aaaa1111v3"
+    assert CatalogSnapshot(restaurants, [], 4, "aaaa1111bbbb").validator == "aaaa1111v4"
+    assert CatalogSnapshot(restaurants, [], 3, "cccc2222dddd").validator == "cccc2222v3"
+
+async def test_etag_changes_only_when_catalog_version_moves(api):
+    import server
+
+    headers = await login(api, "nickfury", "admin123")
+    first = await api.get("/api/restaurants", headers=headers)
+    etag = first.headers["etag"]
+
+    revalidated = await api.get("/api/restaurants", headers={**headers, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+    # Reloading the same version keeps the validator
+    await catalog.load(server.db)
+    assert (await api.get("/api/restaurants", headers=headers)).headers["etag"] == etag
+
+    await bump_catalog_version(server.db)
+    await catalog.load(server.db)
+    changed = await api.get("/api/restaurants", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+async def test_etag_is_specific_to_content_encoding(api):
+    headers = await login(api, "nickfury", "admin123")
+    identity = await api.get("/api/restaurants", headers={**headers, "Accept-Encoding": "identity"})
+    gzipped = await api.get("/api/restaurants", headers={**headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+
+    etag = identity.headers["etag"]
+    assert gzipped.headers["etag"] == f'{etag[:-1]}-gz"'
+
+    # Either variant revalidates, and the 304 echoes the one the client holds
+    for held, accept in ((gzipped.headers["etag"], "gzip"), (etag, "gzip"), (gzipped.headers["etag"], "identity")):
+        revalidated = await api.get(
+            "/api/restaurants", headers={**headers, "Accept-Encoding": accept, "If-None-Match": held}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == held
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from idempotency import IDEMPOTENCY_HEADER, idempotency
+from tests.conftest import login, menu_item_ids
+
+pytestmark = pytest.mark.anyio
+
+async def order_payload(api, headers: dict, quantity: int = 1) -> dict:
+    item_id = (await menu_item_ids(api, headers))[0]
+    return {"items": [{"menu_item_id": item_id, "quantity": quantity}]}
+
+async def order_count(api, headers: dict) -> int:
+    return len((await api.get("/api/orders", headers=headers)).json())
+
+async def test_replay_returns_stored_response(api):
+    headers = await login(api, "travis", "member123")
+    payload = await order_payload(api, headers)
+    keyed = {**headers, IDEMPOTENCY_HEADER: "replay-1"}
+
+    first = await api.post("/api/orders", json=payload, headers=keyed)
+    assert first.status_code == 200
+    assert "idempotent-replayed" not in first.headers
+
+    again = await api.post("/api/orders", json=payload, headers=keyed)
+    assert again.status_code == 200
+    assert again.headers["idempotent-replayed"] == "true"
+    assert again.json() == first.json()
+    assert await order_count(api, headers) == 1
+
+async def test_same_key_with_different_body_is_rejected(api):
+    headers = await login(api, "travis", "member123")
+    keyed = {**headers, IDEMPOTENCY_HEADER: "reused"}
+
+    assert (await api.post("/api/orders", json=await order_payload(api, headers), headers=keyed)).status_code == 200
+    response = await api.post("/api/orders", json=await order_payload(api, headers, quantity=2), headers=keyed)
+    assert response.status_code == 422
+    assert await order_count(api, headers) == 1
+
+async def test_concurrent_requests_with_one_key_create_one_order(api):
+    headers = await login(api, "travis", "member123")
+    payload = await order_payload(api, headers)
+    keyed = {**headers, IDEMPOTENCY_HEADER: "concurrent"}
+
+    responses = await asyncio.gather(*(api.post("/api/orders", json=payload, headers=keyed) for _ in range(5)))
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sum(response.headers.get("idempotent-replayed") == "true" for response in responses) == 4
+    assert await order_count(api, headers) == 1
+    assert idempotency.stats()["in_flight"] == 0
+
+async def test_failed_create_releases_key(api):
+    headers = await login(api, "travis", "member123")
+    keyed = {**headers, IDEMPOTENCY_HEADER: "retry-after-failure"}
+
+    failed = await api.post(
+        "/api/orders", json={"items": [{"menu_item_id": "no-such-item", "quantity": 1}]}, headers=keyed
+    )
+    assert failed.status_code == 404
+
+    # Had the claim been kept, a different body under the same key would get 422
+    retried = await api.post("/api/orders", json=await order_payload(api, headers), headers=keyed)
+    assert retried.status_code == 200
+    assert "idempotent-replayed" not in retried.headers
+    assert await order_count(api, headers) == 1
@@ -0,0 +1,19 @@
+import pytest
+
+from tests.conftest import login
+
+@pytest.mark.anyio
+async def test_prometheus_metrics_require_admin_or_scrape_token(api, monkeypatch):
+    import middleware
+
+    assert (await api.get("/api/metrics")).status_code == 401
+    member = await login(api, "travis", "member123")
+    assert (await api.get("/api/metrics", headers=member)).status_code == 403
+    admin = await login(api, "nickfury", "admin123")
+    response = await api.get("/api/metrics", headers=admin)
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+
+    monkeypatch.setattr(middleware, "METRICS_TOKEN", "scrape-secret")
+    assert (await api.get("/api/metrics", headers={"Authorization": "Bearer scrape-secret"})).status_code == 200
+    assert (await api.get("/api/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
@@ -0,0 +1,119 @@
+import asyncio
+import json
+from urllib.parse import urlencode
+
+import pytest
+
+import auth
+from tests.conftest import login, place_order
+
+pytestmark = pytest.mark.anyio
+
+class EventStream:
+    """GET /api/orders/events called directly on the ASGI app.
+
+    httpx's ASGITransport buffers whole bodies, which never ends for SSE.
+    """
+
+    def __init__(self, app, token: str):
+        self.app = app
+        self.query = urlencode({"token": token}).encode()
+        self.status = None
+        self.request_sent = False
+        self.started = asyncio.Event()
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.task = None
+
+    async def __aenter__(self) -> "EventStream":
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "server": ("test", 80), "client": ("127.0.0.1", 1), "root_path": "",
+            "path": "/api/orders/events", "raw_path": b"/api/orders/events",
+            "query_string": self.query, "headers": [(b"host", b"test")],
+        }
+        self.task = asyncio.create_task(self.app(scope, self._receive, self._send))
+        await asyncio.wait_for(self.started.wait(), 5)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+    async def _receive(self):
+        if not self.request_sent:
+            self.request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.started.set()
+        elif message["type"] == "http.response.body" and message.get("body"):
+            await self.chunks.put(message["body"])
+
+    async def next_event(self) -> tuple:
+        """(event type, data) of the next event, skipping retry and heartbeat frames."""
+        while True:
+            chunk = (await asyncio.wait_for(self.chunks.get(), 5)).decode()
+            fields = dict(line.split(": ", 1) for line in chunk.splitlines() if line and line[0] != ":")
+            if "event" in fields:
+                return fields["event"], json.loads(fields["data"])
+
+async def stream_ticket(api, headers: dict) -> str:
+    response = await api.post("/api/orders/events/ticket", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["expires_in"] == auth.STREAM_TICKET_EXPIRE_SECONDS
+    return response.json()["ticket"]
+
+async def test_access_token_is_rejected_in_query_string(api):
+    headers = await login(api, "thanos", "member123")
+    access_token = headers["Authorization"].removeprefix("Bearer ")
+
+    response = await api.get("/api/orders/events", params={"token": access_token})
+    assert response.status_code == 401
+
+async def test_ticket_is_not_an_access_token(api):
+    ticket = await stream_ticket(api, await login(api, "thanos", "member123"))
+
+    response = await api.get("/api/orders/summary", headers={"Authorization": f"Bearer {ticket}"})
+    assert response.status_code == 401
+
+async def test_expired_ticket_is_rejected(api, monkeypatch):
+    monkeypatch.setattr(auth, "STREAM_TICKET_EXPIRE_SECONDS", -1)
+    ticket = auth.create_stream_ticket({"user_id": "u1", "username": "thanos", "role": "MEMBER", "country": "INDIA"})
+
+    response = await api.get("/api/orders/events", params={"token": ticket})
+    assert response.status_code == 401
+
+async def test_ticket_requires_authentication(api):
+    assert (await api.post("/api/orders/events/ticket")).status_code == 401
+
+async def test_member_stream_only_carries_own_orders(app, api):
+    travis = await login(api, "travis", "member123")
+    thanos = await login(api, "thanos", "member123")
+
+    async with EventStream(app, await stream_ticket(api, thanos)) as stream:
+        assert stream.status == 200
+        await place_order(api, travis)
+        own = await place_order(api, thanos, lines=2)
+
+        event, data = await stream.next_event()
+        assert event == "order.created"
+        assert data["id"] == own["id"]
+        assert data["item_count"] == 2
+        assert stream.chunks.empty()
+
+async def test_manager_stream_is_scoped_to_country(app, api):
+    travis = await login(api, "travis", "member123")
+    thanos = await login(api, "thanos", "member123")
+    manager = await login(api, "captainmarvel", "manager123")
+
+    async with EventStream(app, await stream_ticket(api, manager)) as stream:
+        await place_order(api, travis)
+        india = await place_order(api, thanos)
+
+        event, data = await stream.next_event()
+        assert (event, data["id"], data["country"]) == ("order.created", india["id"], "INDIA")
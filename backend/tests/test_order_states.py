@@ -0,0 +1,89 @@
+from collections import Counter
+import asyncio
+
+import pytest
+
+from tests.conftest import login, place_order
+
+pytestmark = pytest.mark.anyio
+
+ATTEMPTS = 100
+
+class ReadBeforeWriteOrders:
+    """Orders collection that holds each caller's first operation until every caller has made one.
+
+    Reads are held after they complete and writes before they start, so a
+    check-then-write transition (find_one, then update_one) gets all of its
+    reads in before any write: the interleaving that lets several requests
+    see the order as PENDING. Counts writes that changed a status.
+    """
+
+    def __init__(self, collection, callers: int):
+        self._collection = collection
+        self._callers = callers
+        self._arrived = 0
+        self._all_arrived = asyncio.Event()
+        self.status_changes = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self._collection, name)
+
+    async def _gate(self):
+        if self._arrived < self._callers:
+            self._arrived += 1
+            if self._arrived == self._callers:
+                self._all_arrived.set()
+            await self._all_arrived.wait()
+
+    async def find_one(self, *args, **kwargs):
+        document = await self._collection.find_one(*args, **kwargs)
+        await self._gate()
+        return document
+
+    async def find_one_and_update(self, *args, **kwargs):
+        await self._gate()
+        before = await self._collection.find_one_and_update(*args, **kwargs)
+        self.status_changes += before is not None
+        return before
+
+    async def update_one(self, *args, **kwargs):
+        await self._gate()
+        result = await self._collection.update_one(*args, **kwargs)
+        self.status_changes += result.modified_count
+        return result
+
+class GatedDatabase:
+    def __init__(self, db, orders: ReadBeforeWriteOrders):
+        self._db = db
+        self.orders = orders
+
+    def __getattr__(self, name: str):
+        return getattr(self._db, name)
+
+    def __getitem__(self, name: str):
+        return self.orders if name == "orders" else self._db[name]
+
+async def test_simultaneous_checkouts_of_one_order_succeed_once(api, monkeypatch):
+    import server
+
+    headers = await login(api, "captainmarvel", "manager123")
+    order = await place_order(api, headers)
+
+    orders = ReadBeforeWriteOrders(server.db.orders, ATTEMPTS)
+    monkeypatch.setattr(server, "db", GatedDatabase(server.db, orders))
+    responses = await asyncio.gather(*(
+        api.post(f"/api/orders/{order['id']}/checkout", headers=headers) for _ in range(ATTEMPTS)
+    ))
+
+    assert Counter(response.status_code for response in responses) == {200: 1, 400: ATTEMPTS - 1}
+    assert orders.status_changes == 1
+    stored = await api.get(f"/api/orders/{order['id']}", headers=headers)
+    assert stored.json()["status"] == "COMPLETED"
+
+async def test_repeated_cancel_is_rejected(api):
+    headers = await login(api, "nickfury", "admin123")
+    order = await place_order(api, headers)
+    assert (await api.put(f"/api/orders/{order['id']}/cancel", headers=headers)).status_code == 200
+    again = await api.put(f"/api/orders/{order['id']}/cancel", headers=headers)
+    assert again.status_code == 400
+    assert again.json()["detail"] == "Order is already cancelled"
@@ -0,0 +1,29 @@
+from fastapi import HTTPException
+import pytest
+
+from pagination import decode_cursor, encode_cursor
+from tests.conftest import login
+
+@pytest.mark.parametrize("values", [
+    [{"$ne": None}, "x"],
+    ["2024-01-01T00:00:00+00:00", {"$gt": ""}],
+    [None, "x"],
+    [1, "x"],
+    ["x"],
+    "x",
+])
+def test_decode_cursor_rejects_anything_but_strings(values):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(encode_cursor(values), 2)
+    assert error.value.status_code == 400
+
+def test_decode_cursor_round_trips():
+    values = ["2024-01-01T00:00:00+00:00", "order-id"]
+    assert decode_cursor(encode_cursor(values), 2) == values
+
+@pytest.mark.anyio
+async def test_operator_in_orders_cursor_is_rejected(api):
+    headers = await login(api, "nickfury", "admin123")
+    cursor = encode_cursor([{"$ne": None}, "x"])
+    response = await api.get("/api/orders", params={"cursor": cursor}, headers=headers)
+    assert response.status_code == 400
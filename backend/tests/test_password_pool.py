@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+import pytest
+
+from auth import PasswordHashPool, PasswordPoolBusy
+
+pytestmark = pytest.mark.anyio
+
+async def wait_for_idle(pool: PasswordHashPool):
+    for _ in range(500):
+        if not pool.in_flight:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("pool never released its slot")
+
+async def test_cancelled_caller_keeps_slot_until_job_finishes():
+    pool = PasswordHashPool(size=1, queue_size=0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "hashed"
+
+    caller = asyncio.create_task(pool.run(slow))
+    await asyncio.to_thread(started.wait, 5)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    # bcrypt is still running, so the pool is still full
+    assert pool.in_flight == 1
+    with pytest.raises(PasswordPoolBusy):
+        await pool.run(slow)
+
+    release.set()
+    await wait_for_idle(pool)
+    assert (pool.completed, pool.failed, pool.rejected) == (1, 0, 1)
+    pool.shutdown()
+
+async def test_failures_are_counted_separately():
+    pool = PasswordHashPool(size=1, queue_size=0)
+
+    def broken():
+        raise ValueError("bad hash")
+
+    with pytest.raises(ValueError):
+        await pool.run(broken)
+    await wait_for_idle(pool)
+    assert (pool.completed, pool.failed) == (0, 1)
+    assert await pool.run(str.upper, "ok") == "OK"
+    await wait_for_idle(pool)
+    assert pool.stats()["completed"] == 1
+    pool.shutdown()
@@ -0,0 +1,73 @@
+import pytest
+
+from catalog import CatalogSnapshot, bump_catalog_version, catalog
+from models import OrderItemCreate
+from pricing import PRICING_VECTOR_MIN_LINES, PriceTable
+from tests.conftest import login, menu_item_ids
+
+def menu(prices: dict) -> CatalogSnapshot:
+    restaurants = [{"id": "r1", "country": "INDIA"}]
+    items = [{"id": item_id, "restaurant_id": "r1", "price": price} for item_id, price in prices.items()]
+    return CatalogSnapshot(restaurants, items, 1)
+
+def lines(item_ids: list, count: int) -> list:
+    return [
+        OrderItemCreate(menu_item_id=item_ids[i % len(item_ids)], quantity=1 + i % 3, price=0.01)
+        for i in range(count)
+    ]
+
+@pytest.mark.parametrize("count", [3, PRICING_VECTOR_MIN_LINES + 5])
+def test_lines_are_priced_from_the_table(count):
+    prices = {"a": 12.5, "b": 0.99, "c": 7.0}
+    table = PriceTable()
+    table.update(menu(prices))
+    order_lines = lines(list(prices), count)
+    # Stale documents: the table's prices win for items it knows
+    documents = {item_id: {"id": item_id, "price": 999.0} for item_id in prices}
+
+    unit, total = table.price_lines(order_lines, documents)
+
+    assert unit == [prices[line.menu_item_id] for line in order_lines]
+    assert total == pytest.approx(sum(prices[line.menu_item_id] * line.quantity for line in order_lines))
+
+@pytest.mark.parametrize("count", [3, PRICING_VECTOR_MIN_LINES + 5])
+def test_items_newer_than_the_table_are_priced_from_their_document(count):
+    table = PriceTable()
+    table.update(menu({"a": 1.0}))
+    documents = {"a": {"id": "a", "price": 999.0}, "new": {"id": "new", "price": 4.25}}
+
+    unit, _ = table.price_lines(lines(["a", "new"], count), documents)
+
+    assert unit[:2] == [1.0, 4.25]
+
+@pytest.mark.anyio
+async def test_order_ignores_client_sent_prices(api):
+    import server
+
+    headers = await login(api, "thanos", "member123")
+    ids = (await menu_item_ids(api, headers))[:3]
+    snapshot = await catalog.get(server.db)
+    payload = {"items": [{"menu_item_id": item_id, "quantity": 2, "price": 0.01} for item_id in ids]}
+
+    single = await api.post("/api/orders", json=payload, headers=headers)
+    bulk = await api.post("/api/orders/bulk", json=[payload], headers=headers)
+
+    assert single.status_code == 200 and bulk.status_code == 200
+    for order in (single.json(), bulk.json()["results"][0]["order"]):
+        assert [line["price"] for line in order["items"]] == [snapshot.menu_items[i]["price"] for i in ids]
+        assert order["total_amount"] == round(sum(snapshot.menu_items[i]["price"] * 2 for i in ids), 2)
+
+@pytest.mark.anyio
+async def test_price_change_applies_after_catalog_reload(api):
+    import server
+
+    headers = await login(api, "thanos", "member123")
+    item_id = (await menu_item_ids(api, headers))[0]
+    await server.db.menu_items.update_one({"id": item_id}, {"$set": {"price": 99.5}})
+    await bump_catalog_version(server.db)
+    await catalog.load(server.db)
+
+    payload = {"items": [{"menu_item_id": item_id, "quantity": 1, "price": 1.0}]}
+    order = (await api.post("/api/orders", json=payload, headers=headers)).json()
+    assert order["items"][0]["price"] == 99.5
+    assert order["total_amount"] == 99.5
@@ -0,0 +1,66 @@
+import pytest
+
+from indexes import QUERY_SHAPES
+from tests.conftest import login, place_order
+
+pytestmark = pytest.mark.anyio
+
+def shape(value):
+    """Replace every value in a filter with the "x" placeholder QUERY_SHAPES uses."""
+    if isinstance(value, dict):
+        return {key: shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [shape(item) for item in value]
+        return ["x"] if all(item == "x" for item in items) else items
+    return "x"
+
+class RecordingCollection:
+    def __init__(self, collection, filters: list):
+        self._collection = collection
+        self._filters = filters
+
+    def __getattr__(self, name: str):
+        return getattr(self._collection, name)
+
+    def find(self, query, *args, **kwargs):
+        self._filters.append(shape(query))
+        return self._collection.find(query, *args, **kwargs)
+
+class RecordingDatabase:
+    """Records the filter of every orders.find issued through it."""
+
+    def __init__(self, db, filters: list):
+        self._db = db
+        self._filters = filters
+
+    def __getattr__(self, name: str):
+        collection = getattr(self._db, name)
+        return RecordingCollection(collection, self._filters) if name == "orders" else collection
+
+async def test_order_listing_and_export_queries_are_declared(api, monkeypatch):
+    import server
+
+    for username in ("travis", "thanos"):
+        headers = await login(api, username, "member123")
+        for _ in range(2):
+            await place_order(api, headers)
+
+    filters = []
+    monkeypatch.setattr(server, "db", RecordingDatabase(server.db, filters))
+    accounts = (("nickfury", "admin123"), ("captainmarvel", "manager123"), ("travis", "member123"))
+    for username, password in accounts:
+        headers = await login(api, username, password)
+        for path in ("/api/orders", "/api/orders/summary"):
+            first = await api.get(path, params={"limit": 1}, headers=headers)
+            second = await api.get(path, params={"limit": 1, "cursor": first.headers["x-next-cursor"]}, headers=headers)
+            assert second.status_code == 200
+        for params in (
+            {"start": "2020-01-01T00:00:00Z", "end": "2100-01-01T00:00:00Z"},
+            {"status": "PENDING"},
+            {"start": "2020-01-01T00:00:00Z", "end": "2100-01-01T00:00:00Z", "status": "PENDING"},
+        ):
+            assert (await api.get("/api/orders/export", params=params, headers=headers)).status_code == 200
+
+    declared = [query for collection, query, _ in QUERY_SHAPES if collection == "orders"]
+    missing = [query for query in filters if query not in declared]
+    assert not missing, missing
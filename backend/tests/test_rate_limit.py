@@ -0,0 +1,44 @@
+import pytest
+
+from ratelimit import BULK_ORDER_RATE_LIMIT, ORDER_RATE_LIMIT, rate_limiter
+from server import MAX_BULK_ORDERS
+from tests.conftest import login, menu_item_ids
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    return rate_limiter
+
+async def bulk(api, headers: dict, count: int):
+    item_id = (await menu_item_ids(api, headers))[0]
+    orders = [{"items": [{"menu_item_id": item_id, "quantity": 1}]} for _ in range(count)]
+    return await api.post("/api/orders/bulk", json=orders, headers=headers)
+
+async def test_bulk_batch_larger_than_order_limit_succeeds(api, limited):
+    headers = await login(api, "travis", "member123")
+    count = ORDER_RATE_LIMIT.capacity + 20
+    assert count <= MAX_BULK_ORDERS
+
+    response = await bulk(api, headers, count)
+    assert response.status_code == 200
+    assert response.json()["created"] == count
+
+    # POST /orders keeps its own, untouched bucket
+    item_id = (await menu_item_ids(api, headers))[0]
+    order = {"items": [{"menu_item_id": item_id, "quantity": 1}]}
+    assert (await api.post("/api/orders", json=order, headers=headers)).status_code == 200
+
+async def test_bulk_requests_are_limited_per_request(api, limited):
+    headers = await login(api, "travis", "member123")
+
+    for _ in range(BULK_ORDER_RATE_LIMIT.capacity):
+        assert (await bulk(api, headers, 2)).status_code == 200
+    refused = await bulk(api, headers, 2)
+    assert refused.status_code == 429
+    assert int(refused.headers["retry-after"]) >= 1
+
+    # Buckets are per user
+    other = await login(api, "thanos", "member123")
+    assert (await bulk(api, other, 2)).status_code == 200
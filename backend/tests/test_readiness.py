@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from catalog import catalog
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def background(monkeypatch):
+    import server
+
+    monkeypatch.setattr(server, "STARTUP_SEED", "background")
+    # Long enough for /api/ready polls to see the error between a failure and its retry
+    monkeypatch.setattr(server, "BOOTSTRAP_RETRY_SECONDS", 0.05)
+
+@pytest.fixture
+def flaky_catalog(monkeypatch) -> list:
+    """catalog.load fails twice, as if Mongo were briefly unreachable."""
+    load = catalog.load
+    calls = []
+
+    async def flaky_load(db):
+        calls.append(db)
+        if len(calls) <= 2:
+            raise ServerSelectionTimeoutError("mongo unreachable")
+        return await load(db)
+
+    monkeypatch.setattr(catalog, "load", flaky_load)
+    return calls
+
+@pytest.fixture
+def held_indexes(monkeypatch) -> asyncio.Event:
+    """ensure_indexes waits until the returned event is set."""
+    import server
+
+    release = asyncio.Event()
+    ensure_indexes = server.ensure_indexes
+
+    async def held(db):
+        await release.wait()
+        await ensure_indexes(db)
+
+    monkeypatch.setattr(server, "ensure_indexes", held)
+    return release
+
+async def wait_until_ready(api, timeout: float = 5) -> list:
+    """Poll /api/ready until it returns 200; every response along the way."""
+    responses = []
+    async with asyncio.timeout(timeout):
+        while not responses or responses[-1].status_code != 200:
+            responses.append(await api.get("/api/ready"))
+            await asyncio.sleep(0.005)
+    return responses
+
+async def test_ready_moves_from_503_to_200_once_a_failed_step_succeeds(background, flaky_catalog, api):
+    responses = await wait_until_ready(api)
+
+    assert responses[0].status_code == 503
+    assert responses[0].json()["status"] == "starting"
+    assert any((r.json()["error"] or "").startswith("catalog: mongo unreachable") for r in responses[:-1])
+    assert (await api.get("/api/health")).status_code == 200
+
+    ready = responses[-1].json()
+    assert ready["status"] == "ready"
+    assert ready["indexes"] and ready["seed"] and ready["catalog"] and ready["mongo"]
+    assert ready["error"] is None
+    assert ready["failures"] == 2
+    assert len(flaky_catalog) == 3
+
+async def test_unique_index_writes_wait_for_indexes(background, held_indexes, api):
+    user = {"username": "newuser", "password": "secret123", "full_name": "New User", "role": "MEMBER", "country": "INDIA"}
+
+    early = await api.post("/api/auth/register", json=user)
+    assert early.status_code == 503
+    assert early.headers["retry-after"] == "1"
+    assert (await api.get("/api/ready")).status_code == 503
+
+    held_indexes.set()
+    await wait_until_ready(api)
+    assert (await api.post("/api/auth/register", json=user)).status_code == 200
@@ -0,0 +1,134 @@
+import pytest
+
+import search
+from catalog import CatalogSnapshot
+from search import CatalogSearch, InvertedIndex, tokenize
+from tests.conftest import login
+
+def restaurant(id: str, name: str, cuisine: str, country: str = "INDIA") -> dict:
+    return {"id": id, "name": name, "cuisine_type": cuisine, "country": country}
+
+def item(id: str, restaurant_id: str, name: str, category: str = "Main", description: str = "") -> dict:
+    return {"id": id, "restaurant_id": restaurant_id, "name": name, "category": category, "description": description}
+
+RESTAURANTS = [
+    restaurant("r-cuisine", "Golden Fork", "Thai"),
+    restaurant("r-prefix", "Thailand Express", "Fusion"),
+    restaurant("r-name", "Thai Palace", "Asian"),
+    restaurant("r-usa", "Thai Town", "Thai", country="AMERICA"),
+]
+ITEMS = [
+    item("i-description", "r-name", "Noodle Bowl", description="With green curry"),
+    item("i-category", "r-name", "House Special", category="Curry"),
+    item("i-name", "r-name", "Green Curry"),
+    item("i-orphan", "r-missing", "Curry Soup"),
+]
+
+def build(restaurants=RESTAURANTS, items=ITEMS, version: int = 1) -> CatalogSearch:
+    index = CatalogSearch()
+    index.update(CatalogSnapshot(restaurants, items, version))
+    return index
+
+def everywhere(country: str) -> bool:
+    return True
+
+def contents(index: InvertedIndex) -> tuple:
+    """What an index holds, independent of internal doc numbers."""
+    ids = {number: doc[0] for number, doc in index._docs.items()}
+    postings = {
+        field: {term: {ids[number] for number in numbers} for term, numbers in terms.items()}
+        for field, terms in index.postings.items()
+    }
+    return postings, index.vocabulary, index.countries
+
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Crème Brûlée, GRILLED") == ["creme", "brulee", "grilled"]
+
+def test_name_before_cuisine_and_whole_term_before_prefix():
+    restaurants, _, _ = build().search("thai", everywhere, 10)
+    # Whole term in the name, then prefix in the name, then the cuisine field
+    assert set(restaurants[:2]) == {"r-name", "r-usa"}
+    assert restaurants[2:] == ["r-prefix", "r-cuisine"]
+
+def test_item_fields_rank_name_category_description():
+    _, items, _ = build().search("curry", everywhere, 10)
+    assert items == ["i-name", "i-category", "i-description"]
+
+def test_every_token_must_match():
+    _, items, _ = build().search("green curry", everywhere, 10)
+    assert items == ["i-name", "i-description"]
+    assert build().search("curry pizza", everywhere, 10) == ([], [], False)
+
+def test_country_filter_and_limit():
+    restaurants, _, _ = build().search("thai", lambda country: country == "AMERICA", 10)
+    assert restaurants == ["r-usa"]
+    restaurants, _, _ = build().search("thai", everywhere, 1)
+    assert len(restaurants) == 1
+
+def test_update_swaps_in_a_new_index():
+    index = build()
+    old_restaurants, old_items = index.indexes
+    renamed = [restaurant("r-name", "Lotus Palace", "Asian")] + RESTAURANTS[:2]
+
+    index.update(CatalogSnapshot(renamed, ITEMS[1:], 2))
+
+    # A query still holding the old index keeps its consistent view
+    assert "r-name" in old_restaurants.search(["thai"], everywhere, 10)[0]
+    assert "i-description" in old_items.search(["noodle"], everywhere, 10)[0]
+    assert contents(old_restaurants) == contents(build().indexes[0])
+    assert index.search("lotus", everywhere, 10) == (["r-name"], [], False)
+    assert "r-name" not in index.search("thai", everywhere, 10)[0]
+    assert index.search("noodle", everywhere, 10) == ([], [], False)
+    assert index.stats()["restaurants"] == 3 and index.stats()["version"] == 2
+
+def test_update_applies_changes_like_a_full_build():
+    # Enough other terms that small changes are applied to the vocabulary one by one
+    filler = [item(f"i-filler-{n}", "r-cuisine", f"Dish{n} Plate{n}") for n in range(20)]
+    index = build(items=ITEMS + filler)
+    steps = [
+        # Renamed item, new restaurant and item, removed restaurant
+        (
+            [RESTAURANTS[0], RESTAURANTS[2], RESTAURANTS[3], restaurant("r-new", "Curry House", "Indian")],
+            [item("i-name", "r-name", "Red Curry")] + ITEMS[1:] + [item("i-new", "r-new", "Curry Puff")],
+        ),
+        # Restaurant moved country (its menu follows), an item orphaned, the orphan's restaurant back
+        (
+            [RESTAURANTS[0], restaurant("r-name", "Thai Palace", "Asian", country="AMERICA"), RESTAURANTS[3]],
+            ITEMS[:3] + [item("i-new", "r-new", "Curry Puff"), item("i-orphan", "r-usa", "Curry Soup")],
+        ),
+        ([], []),
+        (RESTAURANTS, ITEMS),
+    ]
+    for version, (restaurants, items) in enumerate(steps, start=2):
+        items = items + filler if restaurants else items
+        index.update(CatalogSnapshot(restaurants, items, version))
+        rebuilt = build(restaurants, items, version)
+        assert [contents(i) for i in index.indexes] == [contents(i) for i in rebuilt.indexes], version
+
+    _, items, _ = index.search("curry", lambda country: country == "AMERICA", 10)
+    assert items == []
+
+def test_truncated_prefix_expansion_is_reported(monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_MAX_EXPANSIONS", 2)
+    items = [item(f"i-{name}", "r-name", name) for name in ("Samosa", "Saag", "Salad", "Sambar")]
+    index = build(items=items)
+
+    _, found, truncated = index.search("sa", everywhere, 10)
+    assert truncated and len(found) == 2
+    # Whole-term matches come before any prefix tier
+    assert index.search("saag", everywhere, 10) == ([], ["i-Saag"], False)
+    assert index.search("sal", everywhere, 10)[2] is False
+
+@pytest.mark.anyio
+async def test_search_endpoint_scopes_to_caller_country(api):
+    admin = await login(api, "nickfury", "admin123")
+    member = await login(api, "thanos", "member123")
+
+    # "pa" prefixes Tandoor Palace (India) and Pizza Paradise (America)
+    everything = (await api.get("/api/search", params={"q": "pa"}, headers=admin)).json()
+    assert {r["name"] for r in everything["restaurants"]} == {"Tandoor Palace", "Pizza Paradise"}
+    assert everything["truncated"] is False
+
+    scoped = await api.get("/api/search", params={"q": "pa"}, headers=member)
+    assert scoped.status_code == 200
+    assert [r["name"] for r in scoped.json()["restaurants"]] == ["Tandoor Palace"]
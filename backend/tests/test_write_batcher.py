@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+
+from write_batcher import InsertBatcher
+
+pytestmark = pytest.mark.anyio
+
+class FailingCollection:
+    """insert_many that fails with the given BulkWriteError details."""
+
+    def __init__(self, details: dict):
+        self.details = details
+        self.batches = []
+
+    async def insert_many(self, documents, ordered=True):
+        self.batches.append(list(documents))
+        raise BulkWriteError(self.details)
+
+async def insert_all(batcher: InsertBatcher, collection, documents) -> list:
+    return await asyncio.gather(
+        *(batcher.insert_one(collection, document) for document in documents), return_exceptions=True
+    )
+
+async def test_each_caller_gets_its_own_write_error():
+    collection = FailingCollection({"writeErrors": [
+        {"index": 1, "code": 11000, "errmsg": "E11000 duplicate key error"},
+        {"index": 2, "code": 121, "errmsg": "Document failed validation"},
+    ]})
+    batcher = InsertBatcher(enabled=True)
+
+    results = await insert_all(batcher, collection, [{"n": n} for n in range(4)])
+
+    assert len(collection.batches) == 1
+    assert results[0] is None and results[3] is None
+    assert isinstance(results[1], DuplicateKeyError)
+    assert results[1].code == 11000
+    assert isinstance(results[2], WriteError) and not isinstance(results[2], DuplicateKeyError)
+    assert results[2].code == 121
+    assert batcher.stats()["failed"] == 2
+
+async def test_error_without_write_errors_fails_the_whole_batch():
+    collection = FailingCollection({"writeErrors": [], "writeConcernErrors": [{"code": 64, "errmsg": "timeout"}]})
+    batcher = InsertBatcher(enabled=True)
+
+    results = await insert_all(batcher, collection, [{"n": n} for n in range(3)])
+
+    assert all(isinstance(result, BulkWriteError) for result in results)
+    assert batcher.stats()["failed"] == 3
+
+async def test_duplicate_key_from_unique_index():
+    from mongomock_motor import AsyncMongoMockClient
+
+    collection = AsyncMongoMockClient()["tests"]["batched"]
+    await collection.create_index("key", unique=True)
+    await collection.insert_one({"key": "taken"})
+    batcher = InsertBatcher(enabled=True)
+
+    results = await insert_all(batcher, collection, [{"key": "a"}, {"key": "taken"}, {"key": "b"}])
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], DuplicateKeyError)
+    assert sorted(doc["key"] for doc in await collection.find().to_list(None)) == ["a", "b", "taken"]
+    assert batcher.stats()["batches"] == 1
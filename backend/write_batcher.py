@@ -0,0 +1,133 @@
+"""Group commit for concurrent inserts into one collection.
+
+Callers await insert_one() as usual, but their documents are queued and
+written together with one unordered insert_many. While a batch is being
+written, the next one collects documents until it holds
+WRITE_BATCH_MAX_DOCS or has waited WRITE_BATCH_MAX_DELAY_MS; when nothing
+is in flight, queued documents are flushed right away. Each caller's await
+then resolves, or raises the same WriteError / DuplicateKeyError insert_one
+would have, for its own document only. Opt-in with WRITE_BATCH_ENABLED=true;
+otherwise insert_one() is a plain collection.insert_one().
+"""
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+from typing import List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_ENABLED = os.environ.get("WRITE_BATCH_ENABLED", "false").lower() == "true"
+WRITE_BATCH_MAX_DOCS = int(os.environ.get("WRITE_BATCH_MAX_DOCS", "100"))
+WRITE_BATCH_MAX_DELAY_MS = float(os.environ.get("WRITE_BATCH_MAX_DELAY_MS", "2"))
+
+DUPLICATE_KEY = 11000
+
+class InsertBatcher:
+    """Coalesces concurrent insert_one() calls into unordered insert_many batches."""
+
+    def __init__(self, enabled: bool = WRITE_BATCH_ENABLED, max_docs: int = WRITE_BATCH_MAX_DOCS,
+                 max_delay_ms: float = WRITE_BATCH_MAX_DELAY_MS):
+        self.enabled = enabled
+        self.max_docs = max_docs
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._full: Optional[asyncio.Event] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.documents = 0
+        self.largest_batch = 0
+        self.failed = 0
+
+    async def insert_one(self, collection: AsyncIOMotorCollection, document: dict):
+        """Insert `document` (adding its _id, like insert_one), possibly alongside others."""
+        if not self.enabled:
+            await collection.insert_one(document)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((document, future))
+        if self._collector is None or self._collector.done():
+            # Created here rather than in __init__ so it belongs to the running loop
+            self._full = asyncio.Event()
+            self._collector = asyncio.create_task(self._collect(collection))
+        if len(self._pending) >= self.max_docs:
+            self._full.set()
+        # Shielded: a cancelled caller must not cancel the batch its document is already in
+        await asyncio.shield(future)
+
+    async def _collect(self, collection: AsyncIOMotorCollection):
+        """Cut batches from the queue until it is empty; each batch is flushed in its own task."""
+        while self._pending:
+            # With no write in flight, waiting would only add latency (a lone caller
+            # is never delayed); otherwise linger so the batch can grow
+            if len(self._pending) < self.max_docs and self._flushes:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self._pending = self._pending[:self.max_docs], self._pending[self.max_docs:]
+            if len(self._pending) < self.max_docs:
+                self._full.clear()
+            task = asyncio.create_task(self._flush(collection, batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+            # Let callers that are already runnable queue up behind this batch
+            await asyncio.sleep(0)
+
+    async def _flush(self, collection: AsyncIOMotorCollection, batch: List[Tuple[dict, asyncio.Future]]):
+        self.batches += 1
+        self.documents += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        errors = {}
+        try:
+            await collection.insert_many([document for document, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+            if not errors:
+                # e.g. a write concern error: no document's outcome is known
+                self._fail(batch, e)
+                return
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        self.failed += len(errors)
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            error = errors.get(index)
+            if error is None:
+                future.set_result(None)
+            else:
+                # The exception insert_one would have raised for this document
+                error_class = DuplicateKeyError if error.get("code") == DUPLICATE_KEY else WriteError
+                future.set_exception(error_class(error.get("errmsg"), error.get("code"), error))
+
+    def _fail(self, batch: List[Tuple[dict, asyncio.Future]], error: Exception):
+        logger.error(f"Batched insert of {len(batch)} documents failed: {str(error)}")
+        self.failed += len(batch)
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def drain(self):
+        """Wait for every queued document to be written (call before closing the client)."""
+        if self._collector is not None:
+            await self._collector
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "documents": self.documents,
+            "mean_batch_size": round(self.documents / self.batches, 2) if self.batches else None,
+            "largest_batch": self.largest_batch,
+            "failed": self.failed,
+        }
+
+order_inserts = InsertBatcher()
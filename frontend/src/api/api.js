@@ -8,6 +8,29 @@ const getAuthHeaders = () => {
   return token ? { Authorization: `Bearer ${token}` } : {};
 };
 
+// List endpoints are cursor-paginated; the next page's cursor comes back in this header
+const NEXT_CURSOR_HEADER = 'x-next-cursor';
+
+const getPage = async (url, { cursor, limit } = {}) => {
+  const params = {};
+  if (cursor) params.cursor = cursor;
+  if (limit) params.limit = limit;
+  const response = await axios.get(url, { headers: getAuthHeaders(), params });
+  return { data: response.data, nextCursor: response.headers[NEXT_CURSOR_HEADER] || null };
+};
+
+// Follows cursors until every page has been loaded
+const getAllPages = async (url) => {
+  const data = [];
+  let cursor = null;
+  do {
+    const page = await getPage(url, { cursor });
+    data.push(...page.data);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return { data };
+};
+
 // Auth API
 export const authAPI = {
   login: (username, password) =>
@@ -19,8 +42,7 @@ export const authAPI = {
 
 // Restaurant API
 export const restaurantAPI = {
-  getAll: () =>
-    axios.get(`${API_BASE}/restaurants`, { headers: getAuthHeaders() }),
+  getAll: () => getAllPages(`${API_BASE}/restaurants`),
   
   getById: (id) =>
     axios.get(`${API_BASE}/restaurants/${id}`, { headers: getAuthHeaders() }),
@@ -29,17 +51,65 @@ export const restaurantAPI = {
     axios.get(`${API_BASE}/restaurants/${id}/menu`, { headers: getAuthHeaders() }),
 };
 
+// Search API
+export const searchAPI = {
+  search: (q, limit = 20) =>
+    axios.get(`${API_BASE}/search`, { headers: getAuthHeaders(), params: { q, limit } }),
+};
+
 // Order API
 export const orderAPI = {
-  create: (orderData) =>
-    axios.post(`${API_BASE}/orders`, orderData, { headers: getAuthHeaders() }),
+  // Reuse the same idempotencyKey when retrying so the order is created only once
+  create: (orderData, idempotencyKey) =>
+    axios.post(`${API_BASE}/orders`, orderData, {
+      headers: idempotencyKey
+        ? { ...getAuthHeaders(), 'Idempotency-Key': idempotencyKey }
+        : getAuthHeaders(),
+    }),
+  
+  getPage: (cursor, limit) => getPage(`${API_BASE}/orders`, { cursor, limit }),
+
+  // Orders without line items (item_count only); fetch one with getById for its items
+  getSummaryPage: (cursor, limit) => getPage(`${API_BASE}/orders/summary`, { cursor, limit }),
   
-  getAll: () =>
-    axios.get(`${API_BASE}/orders`, { headers: getAuthHeaders() }),
+  getAll: () => getAllPages(`${API_BASE}/orders`),
   
   getById: (id) =>
     axios.get(`${API_BASE}/orders/${id}`, { headers: getAuthHeaders() }),
   
+  // Server-Sent Events for orders the user can see; returns a function that closes the stream.
+  // EventSource cannot send headers, so a short-lived stream ticket goes in the query string
+  // (never the access token). Tickets expire after a minute, so once the browser gives up
+  // reconnecting with an expired one, a fresh ticket is fetched and the stream reopened.
+  subscribe: (onEvent) => {
+    let source = null;
+    let stopped = false;
+    const handle = (event) => onEvent(event.type, JSON.parse(event.data));
+    const open = async () => {
+      let ticket;
+      try {
+        const response = await axios.post(`${API_BASE}/orders/events/ticket`, {}, { headers: getAuthHeaders() });
+        ticket = response.data.ticket;
+      } catch (err) {
+        if (!stopped) setTimeout(open, 3000);
+        return;
+      }
+      if (stopped) return;
+      source = new EventSource(`${API_BASE}/orders/events?token=${encodeURIComponent(ticket)}`);
+      source.addEventListener('order.created', handle);
+      source.addEventListener('order.status', handle);
+      source.addEventListener('closed', handle);
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED && !stopped) open();
+      };
+    };
+    open();
+    return () => {
+      stopped = true;
+      if (source) source.close();
+    };
+  },
+  
   checkout: (id) =>
     axios.post(`${API_BASE}/orders/${id}/checkout`, {}, { headers: getAuthHeaders() }),
   
@@ -49,8 +119,7 @@ export const orderAPI = {
 
 // Payment Method API
 export const paymentAPI = {
-  getAll: () =>
-    axios.get(`${API_BASE}/payment-methods`, { headers: getAuthHeaders() }),
+  getAll: () => getAllPages(`${API_BASE}/payment-methods`),
   
   create: (paymentData) =>
     axios.post(`${API_BASE}/payment-methods`, paymentData, { headers: getAuthHeaders() }),
@@ -64,6 +133,11 @@ export const paymentAPI = {
 
 // User API
 export const userAPI = {
-  getAll: () =>
-    axios.get(`${API_BASE}/users`, { headers: getAuthHeaders() }),
+  getAll: () => getAllPages(`${API_BASE}/users`),
+};
+
+// Analytics API
+export const analyticsAPI = {
+  getSales: (params) =>
+    axios.get(`${API_BASE}/analytics/sales`, { headers: getAuthHeaders(), params }),
 };
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useState, useRef, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useCart } from '../contexts/CartContext';
 import { useAuth } from '../contexts/AuthContext';
@@ -14,6 +14,13 @@ export const CartPage = () => {
   const navigate = useNavigate();
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
+  // Kept across retries after network failures so the server can deduplicate them
+  const idempotencyKey = useRef(null);
+
+  // A changed cart is a different order and needs a new key
+  useEffect(() => {
+    idempotencyKey.current = null;
+  }, [cartItems]);
 
   const canCheckout = hasRole(['ADMIN', 'MANAGER']);
 
@@ -33,10 +40,16 @@ export const CartPage = () => {
         payment_method_id: null
       };
 
-      const response = await orderAPI.create(orderData);
+      idempotencyKey.current = idempotencyKey.current || crypto.randomUUID();
+      await orderAPI.create(orderData, idempotencyKey.current);
+      idempotencyKey.current = null;
       clearCart();
       navigate(`/orders`);
     } catch (err) {
+      // The server answered, so the next attempt is a new request
+      if (err.response) {
+        idempotencyKey.current = null;
+      }
       setError(err.response?.data?.detail || 'Failed to create order');
       console.error(err);
     } finally {
@@ -1,5 +1,6 @@
-import React from 'react';
+import React, { useState, useEffect } from 'react';
 import { useAuth } from '../contexts/AuthContext';
+import { analyticsAPI } from '../api/api';
 import { useNavigate } from 'react-router-dom';
 import { Card, CardHeader, CardTitle, CardDescription, CardContent } from '../components/ui/card';
 import { Button } from '../components/ui/button';
@@ -9,6 +10,15 @@ import { UtensilsCrossed, ShoppingCart, Package, CreditCard, Users } from 'lucid
 export const DashboardPage = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
+  const [sales, setSales] = useState(null);
+  const canViewSales = user.role === 'ADMIN' || user.role === 'MANAGER';
+
+  useEffect(() => {
+    if (!canViewSales) return;
+    analyticsAPI.getSales()
+      .then((response) => setSales(response.data))
+      .catch((error) => console.error('Failed to fetch sales analytics:', error));
+  }, [canViewSales]);
 
   const getFeatures = () => {
     const baseFeatures = [
@@ -107,6 +117,35 @@ export const DashboardPage = () => {
         </Card>
       </div>
 
+      {sales && (
+        <div data-testid="sales-analytics">
+          <h2 className="text-xl font-semibold mb-4">Sales (last 30 days)</h2>
+          <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
+            {sales.countries.map((row) => (
+              <Card key={row.country}>
+                <CardHeader className="pb-3">
+                  <CardDescription>{row.country}</CardDescription>
+                  <CardTitle className="text-2xl">{row.revenue.toFixed(2)}</CardTitle>
+                </CardHeader>
+                <CardContent>
+                  <p className="text-sm text-gray-500 mb-2">{row.orders} orders</p>
+                  <div className="flex flex-wrap gap-2">
+                    {Object.entries(row.status).map(([status, breakdown]) => (
+                      <Badge key={status} variant="secondary">
+                        {status}: {breakdown.orders}
+                      </Badge>
+                    ))}
+                  </div>
+                </CardContent>
+              </Card>
+            ))}
+            {sales.countries.length === 0 && (
+              <p className="text-sm text-gray-500">No orders in this period.</p>
+            )}
+          </div>
+        </div>
+      )}
+
       <div>
         <h2 className="text-xl font-semibold mb-4">Quick Actions</h2>
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
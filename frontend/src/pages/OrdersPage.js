@@ -8,9 +8,14 @@ import { Package, CheckCircle, XCircle, Clock } from 'lucide-react';
 
 export const OrdersPage = () => {
   const [orders, setOrders] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [actionLoading, setActionLoading] = useState({});
+  // Line items per order id, fetched when an order is expanded
+  const [orderItems, setOrderItems] = useState({});
+  const [expanded, setExpanded] = useState({});
   const { hasRole } = useAuth();
 
   const canManageOrders = hasRole(['ADMIN', 'MANAGER']);
@@ -19,10 +24,28 @@ export const OrdersPage = () => {
     fetchOrders();
   }, []);
 
+  // Live updates: patch or prepend single rows instead of reloading the list
+  useEffect(() => {
+    return orderAPI.subscribe((type, order) => {
+      if (type === 'closed') {
+        // The server dropped this stream (e.g. we fell behind); events may be missing
+        fetchOrders();
+        return;
+      }
+      setOrders((current) => {
+        if (current.some((row) => row.id === order.id)) {
+          return current.map((row) => (row.id === order.id ? { ...row, ...order } : row));
+        }
+        return type === 'order.created' ? [order, ...current] : current;
+      });
+    });
+  }, []);
+
   const fetchOrders = async () => {
     try {
-      const response = await orderAPI.getAll();
-      setOrders(response.data);
+      const page = await orderAPI.getSummaryPage();
+      setOrders(page.data);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError('Failed to load orders');
       console.error(err);
@@ -31,11 +54,48 @@ export const OrdersPage = () => {
     }
   };
 
+  const loadMoreOrders = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await orderAPI.getSummaryPage(nextCursor);
+      setOrders((current) => [...current, ...page.data]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      alert('Failed to load more orders');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Replace one row in place so already-loaded pages are kept
+  const replaceOrder = (updated) => {
+    setOrders((current) => current.map((order) => (
+      order.id === updated.id ? { ...order, ...updated } : order
+    )));
+    if (updated.items) {
+      setOrderItems((current) => ({ ...current, [updated.id]: updated.items }));
+    }
+  };
+
+  const toggleItems = async (orderId) => {
+    const open = !expanded[orderId];
+    setExpanded({ ...expanded, [orderId]: open });
+    if (open && !orderItems[orderId]) {
+      try {
+        const response = await orderAPI.getById(orderId);
+        setOrderItems((current) => ({ ...current, [orderId]: response.data.items }));
+      } catch (err) {
+        console.error('Failed to load order items:', err);
+      }
+    }
+  };
+
   const handleCheckout = async (orderId) => {
     setActionLoading({ ...actionLoading, [orderId]: 'checkout' });
     try {
-      await orderAPI.checkout(orderId);
-      await fetchOrders();
+      const response = await orderAPI.checkout(orderId);
+      replaceOrder(response.data);
     } catch (err) {
       alert(err.response?.data?.detail || 'Failed to checkout order');
     } finally {
@@ -48,8 +108,8 @@ export const OrdersPage = () => {
     
     setActionLoading({ ...actionLoading, [orderId]: 'cancel' });
     try {
-      await orderAPI.cancel(orderId);
-      await fetchOrders();
+      const response = await orderAPI.cancel(orderId);
+      replaceOrder(response.data);
     } catch (err) {
       alert(err.response?.data?.detail || 'Failed to cancel order');
     } finally {
@@ -135,20 +195,32 @@ export const OrdersPage = () => {
               <CardContent>
                 <div className="space-y-3">
                   <div className="border rounded-lg p-4 bg-gray-50">
-                    <h4 className="font-medium mb-2">Order Items</h4>
-                    <div className="space-y-2">
-                      {order.items.map((item) => (
-                        <div key={item.id} className="flex justify-between text-sm">
-                          <span>
-                            {item.menu_item_name} x {item.quantity}
-                          </span>
-                          <span className="font-medium">
-                            {order.country === 'INDIA' ? '₹' : '$'}
-                            {(item.price * item.quantity).toFixed(2)}
-                          </span>
-                        </div>
-                      ))}
-                    </div>
+                    <button
+                      type="button"
+                      onClick={() => toggleItems(order.id)}
+                      className="font-medium w-full text-left"
+                      data-testid={`toggle-items-${order.id}`}
+                    >
+                      {expanded[order.id] ? '▾' : '▸'} Order Items ({order.item_count ?? order.items?.length})
+                    </button>
+                    {expanded[order.id] && (
+                      <div className="space-y-2 mt-2">
+                        {!orderItems[order.id] && (
+                          <p className="text-sm text-gray-500">Loading items...</p>
+                        )}
+                        {(orderItems[order.id] || []).map((item) => (
+                          <div key={item.id} className="flex justify-between text-sm">
+                            <span>
+                              {item.menu_item_name} x {item.quantity}
+                            </span>
+                            <span className="font-medium">
+                              {order.country === 'INDIA' ? '₹' : '$'}
+                              {(item.price * item.quantity).toFixed(2)}
+                            </span>
+                          </div>
+                        ))}
+                      </div>
+                    )}
                   </div>
 
                   <div className="flex items-center justify-between pt-3 border-t">
@@ -190,6 +262,19 @@ export const OrdersPage = () => {
               </CardContent>
             </Card>
           ))}
+
+          {nextCursor && (
+            <div className="flex justify-center pt-2">
+              <Button
+                onClick={loadMoreOrders}
+                disabled={loadingMore}
+                variant="outline"
+                data-testid="load-more-orders"
+              >
+                {loadingMore ? 'Loading...' : 'Load more orders'}
+              </Button>
+            </div>
+          )}
         </div>
       )}
     </div>
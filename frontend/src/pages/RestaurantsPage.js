@@ -1,21 +1,48 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { restaurantAPI } from '../api/api';
+import { restaurantAPI, searchAPI } from '../api/api';
 import { Card, CardHeader, CardTitle, CardDescription, CardContent } from '../components/ui/card';
 import { Badge } from '../components/ui/badge';
 import { Button } from '../components/ui/button';
-import { MapPin, Star, ChefHat } from 'lucide-react';
+import { Input } from '../components/ui/input';
+import { MapPin, Star, ChefHat, Search } from 'lucide-react';
 
 export const RestaurantsPage = () => {
   const [restaurants, setRestaurants] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
+  const [query, setQuery] = useState('');
+  const [results, setResults] = useState(null);
   const navigate = useNavigate();
 
   useEffect(() => {
     fetchRestaurants();
   }, []);
 
+  // Debounced server-side search; an empty query shows every restaurant again
+  useEffect(() => {
+    if (!query.trim()) {
+      setResults(null);
+      return undefined;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const response = await searchAPI.search(query.trim());
+        if (!cancelled) setResults(response.data);
+      } catch (err) {
+        console.error(err);
+      }
+    }, 200);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [query]);
+
+  const restaurantsById = Object.fromEntries(restaurants.map((r) => [r.id, r]));
+  const shownRestaurants = results ? results.restaurants : restaurants;
+
   const fetchRestaurants = async () => {
     try {
       const response = await restaurantAPI.getAll();
@@ -54,8 +81,50 @@ export const RestaurantsPage = () => {
         <p className="text-gray-500 mt-1">Browse and order from our partner restaurants</p>
       </div>
 
+      <div className="relative max-w-md">
+        <Search className="h-4 w-4 text-gray-400 absolute left-3 top-1/2 -translate-y-1/2" />
+        <Input
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+          placeholder="Search restaurants, cuisines and dishes"
+          className="pl-9"
+          data-testid="catalog-search-input"
+        />
+      </div>
+
+      {results && results.menu_items.length > 0 && (
+        <Card data-testid="dish-search-results">
+          <CardHeader>
+            <CardTitle className="text-lg">Dishes</CardTitle>
+          </CardHeader>
+          <CardContent className="divide-y">
+            {results.menu_items.map((item) => {
+              const restaurant = restaurantsById[item.restaurant_id];
+              return (
+                <div
+                  key={item.id}
+                  className="flex items-center justify-between py-2 cursor-pointer hover:bg-gray-50"
+                  onClick={() => navigate(`/restaurants/${item.restaurant_id}`)}
+                  data-testid={`dish-result-${item.id}`}
+                >
+                  <div>
+                    <p className="font-medium">{item.name}</p>
+                    <p className="text-sm text-gray-500">
+                      {item.category} · {restaurant ? restaurant.name : 'Restaurant'}
+                    </p>
+                  </div>
+                  <span className="text-sm font-semibold">
+                    {restaurant && restaurant.country === 'INDIA' ? '₹' : '$'}{item.price}
+                  </span>
+                </div>
+              );
+            })}
+          </CardContent>
+        </Card>
+      )}
+
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-        {restaurants.map((restaurant) => (
+        {shownRestaurants.map((restaurant) => (
           <Card 
             key={restaurant.id} 
             className="hover:shadow-xl transition-all cursor-pointer overflow-hidden"
@@ -100,7 +169,14 @@ export const RestaurantsPage = () => {
         ))}
       </div>
 
-      {restaurants.length === 0 && (
+      {results && results.restaurants.length === 0 && results.menu_items.length === 0 && (
+        <div className="text-center py-12">
+          <Search className="h-12 w-12 text-gray-400 mx-auto mb-4" />
+          <p className="text-gray-500">No restaurants or dishes match "{query}"</p>
+        </div>
+      )}
+
+      {!results && restaurants.length === 0 && (
         <div className="text-center py-12">
           <ChefHat className="h-12 w-12 text-gray-400 mx-auto mb-4" />
           <p className="text-gray-500">No restaurants available in your region</p>